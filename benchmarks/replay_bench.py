@@ -0,0 +1,139 @@
+"""
+로컬 SRT 흉내 서버(fakesrt)를 띄우고 SRThunter 를 돌려 지연 시간과 자원 사용량을 잰다.
+네트워크 없이 Chrome/chromedriver 만 있으면 된다. (CHROME_PATH, CHROMEDRIVER_PATH)
+
+    python benchmarks/replay_bench.py --duration 120 --scenario scenario.json --out result.json
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srt_reservation.cli import parse_args
+from srt_reservation.fakesrt import FakeSRTServer, load_scenario
+from srt_reservation.procstat import ProcessSampler, browser_pid, to_mb
+from srt_reservation.SRThunter import SRThunter
+
+
+def hunter_args(base_url, scenario, extra):
+    dt = (datetime.now() + timedelta(days=7)).strftime("%Y%m%d")
+    argv = ["--user", "0000000000", "--psw", "bench", "--dpt", scenario["dpt"], "--arr", scenario["arr"],
+            "--dt", dt, "--tm", "00", "--num", str(scenario["num_trains"]), "--base_url", base_url,
+            "--metrics_sec", "0", "--state_file", "None", "--timetable", "None"]
+    return parse_args(argv + extra)
+
+
+class ResourceMonitor(threading.Thread):
+    """Python 프로세스와 브라우저 프로세스 트리를 주기적으로 샘플링"""
+
+    def __init__(self, hunter, interval=1.0):
+        super().__init__(daemon=True)
+        self.hunter = hunter
+        self.interval = interval
+        self.bot = ProcessSampler(os.getpid(), include_root=True)
+        self.browser = None
+        self.samples = []
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            driver = self.hunter.driver
+            pid = browser_pid(driver) if driver is not None else None
+            if pid is not None and (self.browser is None or self.browser.pid != pid):
+                self.browser = ProcessSampler(pid)
+            bot = self.bot.sample()
+            browser = self.browser.sample() if self.browser is not None else None
+            self.samples.append({"t": time.monotonic(), "bot": bot, "browser": browser})
+
+    def stop(self):
+        self.stopped.set()
+
+
+def summarize_resources(samples):
+    def series(key, field):
+        return [s[key][field] for s in samples if s[key] is not None]
+
+    out = {}
+    for key in ("bot", "browser"):
+        rss = series(key, "rss")
+        cpu = series(key, "cpu_pct")
+        if not rss:
+            continue
+        out[key] = {"rss_mb_avg": to_mb(sum(rss) / len(rss)), "rss_mb_max": to_mb(max(rss)),
+                    "cpu_pct_avg": round(sum(cpu) / len(cpu), 1), "cpu_pct_max": max(cpu)}
+    return out
+
+
+def latencies(stats):
+    opened = stats["first_open_served"]
+    requested = stats["book_requested"]
+    paid = stats["paid_at"]
+    out = {"refresh_to_detect_ms": {}, "detect_to_paid_ms": {}}
+    for row, t_open in opened.items():
+        if row in requested:
+            out["refresh_to_detect_ms"][row] = round((requested[row] - t_open) * 1000, 1)
+        if row in requested and row in paid:
+            out["detect_to_paid_ms"][row] = round((paid[row] - requested[row]) * 1000, 1)
+    return out
+
+
+def run_bench(scenario, duration, extra_args):
+    server = FakeSRTServer(scenario).start()
+    hunter = SRThunter(hunter_args(server.base_url, scenario, extra_args))
+    monitor = ResourceMonitor(hunter)
+
+    worker = threading.Thread(target=hunter.run, daemon=True)
+    started = time.monotonic()
+    monitor.start()
+    worker.start()
+    worker.join(duration)
+    hunter.stop()
+    worker.join(30)
+    elapsed = time.monotonic() - started
+    monitor.stop()
+
+    stats = server.state.stats()
+    summary = hunter.metrics.summary()
+    result = {
+        "elapsed_sec": round(elapsed, 1),
+        "success": hunter.success,
+        "cycles": hunter.metrics.cnt_cycle,
+        "cycles_per_min": round(hunter.metrics.cnt_cycle / elapsed * 60, 2),
+        "phases_ms": summary["phases_ms"],
+        "server": {k: stats[k] for k in ("searches", "logins", "book_tries", "sold_out", "paid", "waitlisted")},
+        "resources": summarize_resources(monitor.samples),
+        "session": hunter.session.stats(),
+    }
+    result.update(latencies(stats))
+    # detect-to-booked 는 예약하기 클릭부터 성공 페이지 확인까지 (metrics 의 book 단계)
+    result["detect_to_booked_ms"] = summary["phases_ms"].get("book", {})
+    # 봇이 잰 값. 좌석이 보인 표를 읽은 시점부터 결제 완료까지
+    result["detect_to_paid_hunter_ms"] = summary["phases_ms"].get("detect_to_paid", {})
+    # greedy 로 여러 좌석을 잡을 때 연속 예약 사이 간격
+    result["booking_gap_ms"] = summary["phases_ms"].get("booking_gap", {})
+
+    try:
+        hunter.session.quit()
+    finally:
+        server.stop()
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Offline replay benchmark')
+    parser.add_argument("--scenario", type=str, default=None, help="scenario json (default: fakesrt.DEFAULT_SCENARIO)")
+    parser.add_argument("--duration", type=int, default=120, help="max seconds to run")
+    parser.add_argument("--out", type=str, default=None, help="write result json")
+    args, extra = parser.parse_known_args()
+
+    result = run_bench(load_scenario(args.scenario), args.duration, extra)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
@@ -0,0 +1,223 @@
+"""
+fakesrt 서버를 상대로 SRThunter 를 오래(기본 1시간) 돌리면서 자원 사용량과 사이클 시간이 늘어나는지 본다.
+Python 프로세스와 브라우저 트리(chromedriver + Chrome)의 RSS/FD/스레드/프로세스 수, 구간별 사이클 시간을
+--interval 마다 기록하고, 시간에 대한 추세(시간당 증가량)와 처음/마지막 구간 차이를 기준값과 비교한다.
+기준을 넘으면 regressions 에 적고 exit 1 로 종료한다. (CHROME_PATH, CHROMEDRIVER_PATH)
+
+    python benchmarks/soak_bench.py --duration 3600 --interval 10 --out soak.json -- --lean True
+
+기본 시나리오는 좌석이 열리지 않아 끝까지 새로고침만 한다. --scenario 로 바꿀 수 있다.
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from srt_reservation.cli import parse_args
+from srt_reservation.fakesrt import FakeSRTServer, load_scenario
+from srt_reservation.metrics import percentile
+from srt_reservation.procstat import browser_pid, sample_pid, sample_tree, to_mb
+from srt_reservation.SRThunter import SRThunter
+
+# 기준값 기본. 처음 구간(워밍업 이후) 대비 마지막 구간의 증가량
+DEFAULT_THRESHOLDS = {
+    "bot_rss_mb": 50,
+    "bot_fds": 20,
+    "bot_threads": 10,
+    "browser_rss_mb": 300,
+    "browser_fds": 100,
+    "browser_threads": 50,
+    "browser_procs": 2,
+    "cycle_p50_ms": None,  # 절대값 대신 --max_cycle_drift_pct 로 비교
+}
+EDGE_FRACTION = 0.1  # 처음/마지막 구간으로 쓸 샘플 비율
+
+
+def hunter_args(base_url, scenario, extra):
+    dt = (datetime.now() + timedelta(days=7)).strftime("%Y%m%d")
+    argv = ["--user", "0000000000", "--psw", "soak", "--dpt", scenario["dpt"], "--arr", scenario["arr"],
+            "--dt", dt, "--tm", "00", "--num", str(scenario["num_trains"]), "--base_url", base_url,
+            "--metrics_sec", "0", "--state_file", "None", "--timetable", "None", "--recorder_dir", "None"]
+    return parse_args(argv + extra)
+
+
+class SoakSampler(threading.Thread):
+    """봇 프로세스, 브라우저 트리, 직전 샘플 이후 사이클 시간을 interval 마다 기록"""
+
+    def __init__(self, hunter, interval):
+        super().__init__(daemon=True)
+        self.hunter = hunter
+        self.interval = interval
+        self.samples = []
+        self.started = time.monotonic()
+        self.last_cycles = 0
+        self.browser_pids = set()
+        self.stopped = threading.Event()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            try:
+                self.samples.append(self.sample())
+            except Exception as e:
+                print(f"soak 샘플 실패: {e}")
+
+    def sample(self):
+        out = {"t": round(time.monotonic() - self.started, 1)}
+        bot = sample_pid(os.getpid())
+        out.update({"bot_rss_mb": to_mb(bot["rss"]), "bot_fds": bot["fds"], "bot_threads": bot["threads"]})
+
+        driver = self.hunter.driver
+        pid = browser_pid(driver) if driver is not None else None
+        if pid is not None:
+            self.browser_pids.add(pid)
+            browser = sample_tree(pid)
+            out.update({"browser_rss_mb": to_mb(browser["rss"]), "browser_fds": browser["fds"],
+                        "browser_threads": browser["threads"], "browser_procs": browser["pids"]})
+
+        # 직전 샘플 이후 끝난 사이클의 시간 (Metrics 의 최근 샘플 중 새로 들어온 것)
+        metrics = self.hunter.metrics
+        cycles = metrics.cnt_cycle
+        new = cycles - self.last_cycles
+        self.last_cycles = cycles
+        recent = list(metrics.samples["cycle"])[-new:] if new > 0 else []
+        out["cycles"] = new
+        if recent:
+            ordered = sorted(recent)
+            out["cycle_p50_ms"] = round(percentile(ordered, 50) * 1000, 1)
+            out["cycle_p95_ms"] = round(percentile(ordered, 95) * 1000, 1)
+        return out
+
+    def stop(self):
+        self.stopped.set()
+
+
+def slope_per_hour(points):
+    # 최소제곱 기울기 (값/시간)
+    n = len(points)
+    if n < 2:
+        return 0.0
+    mean_t = sum(t for t, _ in points) / n
+    mean_v = sum(v for _, v in points) / n
+    var = sum((t - mean_t) ** 2 for t, _ in points)
+    if var == 0:
+        return 0.0
+    return sum((t - mean_t) * (v - mean_v) for t, v in points) / var * 3600
+
+
+def trend(samples, key, warmup_sec):
+    points = [(s["t"], s[key]) for s in samples if key in s and s["t"] >= warmup_sec]
+    if len(points) < 2:
+        return None
+    edge = max(1, int(len(points) * EDGE_FRACTION))
+    first = sum(v for _, v in points[:edge]) / edge
+    last = sum(v for _, v in points[-edge:]) / edge
+    values = [v for _, v in points]
+    return {"first": round(first, 1), "last": round(last, 1), "growth": round(last - first, 1),
+            "max": round(max(values), 1), "per_hour": round(slope_per_hour(points), 2), "n": len(points)}
+
+
+def build_report(samples, warmup_sec, thresholds, max_cycle_drift_pct):
+    trends = {}
+    regressions = []
+    for key, limit in thresholds.items():
+        tr = trend(samples, key, warmup_sec)
+        if tr is None:
+            continue
+        trends[key] = tr
+        if limit is not None and tr["growth"] > limit:
+            regressions.append(f"{key} 증가 {tr['growth']} > {limit} (시간당 {tr['per_hour']})")
+
+    tr = trends.get("cycle_p50_ms")
+    if tr is not None and tr["first"] > 0 and max_cycle_drift_pct:
+        drift_pct = round((tr["last"] - tr["first"]) / tr["first"] * 100, 1)
+        tr["drift_pct"] = drift_pct
+        if drift_pct > max_cycle_drift_pct:
+            regressions.append(f"cycle_p50_ms {tr['first']} -> {tr['last']} ({drift_pct}% > {max_cycle_drift_pct}%)")
+    return trends, regressions
+
+
+def run_soak(scenario, duration, interval, warmup_sec, thresholds, max_cycle_drift_pct, extra):
+    server = FakeSRTServer(scenario).start()
+    hunter = SRThunter(hunter_args(server.base_url, scenario, extra))
+    sampler = SoakSampler(hunter, interval)
+
+    worker = threading.Thread(target=hunter.run, daemon=True)
+    started = time.monotonic()
+    sampler.start()
+    worker.start()
+    worker.join(duration)
+    hunter.stop()
+    worker.join(60)
+    sampler.stop()
+    elapsed = time.monotonic() - started
+
+    stats = server.state.stats()
+    trends, regressions = build_report(sampler.samples, warmup_sec, thresholds, max_cycle_drift_pct)
+    result = {
+        "elapsed_sec": round(elapsed, 1),
+        "cycles": hunter.metrics.cnt_cycle,
+        "cycles_per_min": round(hunter.metrics.cnt_cycle / elapsed * 60, 2),
+        "warmup_sec": warmup_sec,
+        "thresholds": dict(thresholds, cycle_drift_pct=max_cycle_drift_pct),
+        "trends": trends,
+        "regressions": regressions,
+        "browser_restarts": max(0, len(sampler.browser_pids) - 1),
+        "session": hunter.session.stats(),
+        "server": {k: stats[k] for k in ("searches", "logins", "book_tries", "sold_out", "paid")},
+        "samples": sampler.samples,
+    }
+
+    try:
+        hunter.close()
+    finally:
+        server.stop()
+    return result
+
+
+def to_string(result):
+    lines = [f"soak {result['elapsed_sec']}s, cycles={result['cycles']} ({result['cycles_per_min']}/min), "
+             f"browser restarts={result['browser_restarts']}"]
+    for key, tr in result["trends"].items():
+        lines.append(f"  {key:16s} {tr['first']:>10} -> {tr['last']:>10}  growth={tr['growth']:<8} "
+                     f"per_hour={tr['per_hour']:<8} max={tr['max']}")
+    lines.append("regressions: " + ("; ".join(result["regressions"]) if result["regressions"] else "-"))
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Soak test for memory growth and cycle-time drift')
+    parser.add_argument("--scenario", type=str, default=None, help="scenario json (default: no seat ever opens)")
+    parser.add_argument("--duration", type=int, default=3600, help="seconds to run")
+    parser.add_argument("--interval", type=float, default=10, help="seconds between samples")
+    parser.add_argument("--warmup_sec", type=int, default=120, help="ignore samples before this for trends")
+    parser.add_argument("--max_bot_growth_mb", type=float, default=DEFAULT_THRESHOLDS["bot_rss_mb"])
+    parser.add_argument("--max_browser_growth_mb", type=float, default=DEFAULT_THRESHOLDS["browser_rss_mb"])
+    parser.add_argument("--max_fd_growth", type=int, default=DEFAULT_THRESHOLDS["browser_fds"], help="browser tree fds")
+    parser.add_argument("--max_thread_growth", type=int, default=DEFAULT_THRESHOLDS["browser_threads"], help="browser tree threads")
+    parser.add_argument("--max_proc_growth", type=int, default=DEFAULT_THRESHOLDS["browser_procs"])
+    parser.add_argument("--max_cycle_drift_pct", type=float, default=50, help="cycle p50 growth, first vs last (0 to disable)")
+    parser.add_argument("--out", type=str, default=None, help="write result json (with samples)")
+    args, extra = parser.parse_known_args()
+    extra = [a for a in extra if a != "--"]
+
+    scenario = load_scenario(args.scenario)
+    if args.scenario is None:
+        scenario["events"] = []
+
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    thresholds.update({"bot_rss_mb": args.max_bot_growth_mb, "browser_rss_mb": args.max_browser_growth_mb,
+                       "browser_fds": args.max_fd_growth, "browser_threads": args.max_thread_growth,
+                       "browser_procs": args.max_proc_growth})
+
+    result = run_soak(scenario, args.duration, args.interval, args.warmup_sec, thresholds,
+                      args.max_cycle_drift_pct, extra)
+    print(to_string(result))
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(json.dumps(result, ensure_ascii=False, indent=2))
+    sys.exit(1 if result["regressions"] else 0)
@@ -0,0 +1,89 @@
+"""
+quickstart.py 프로세스 시작부터 첫 조회 결과 표를 받을 때까지의 시간을 잰다.
+fakesrt 서버를 띄우고 quickstart.py 를 별도 프로세스로 여러 번 실행한다. (CHROME_PATH, CHROMEDRIVER_PATH)
+--cold 이면 첫 실행 전에 드라이버 캐시를 지운다.
+
+    python benchmarks/startup_bench.py --runs 5 --cold --out startup.json -- --lean True
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from datetime import datetime, timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from srt_reservation.fakesrt import FakeSRTServer, load_scenario
+from srt_reservation.procstat import kill_pids, process_tree
+from srt_reservation.startup import DEFAULT_DRIVER_CACHE
+
+
+def quickstart_argv(base_url, scenario, driver_cache, extra):
+    dt = (datetime.now() + timedelta(days=7)).strftime("%Y%m%d")
+    return [sys.executable, os.path.join(ROOT, "quickstart.py"),
+            "--user", "0000000000", "--psw", "bench", "--dpt", scenario["dpt"], "--arr", scenario["arr"],
+            "--dt", dt, "--tm", "00", "--num", str(scenario["num_trains"]), "--base_url", base_url,
+            "--metrics_sec", "0", "--state_file", "None", "--timetable", "None", "--driver_cache", driver_cache] + extra
+
+
+def run_once(scenario, driver_cache, timeout, extra):
+    # 실행마다 새 서버 (첫 로그인/첫 조회 시각을 따로 재기 위해)
+    server = FakeSRTServer(scenario).start()
+    started = time.time()
+    proc = subprocess.Popen(quickstart_argv(server.base_url, scenario, driver_cache, extra),
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.time() - started < timeout:
+            if server.state.first_search_at is not None or proc.poll() is not None:
+                break
+            time.sleep(0.01)
+        stats = server.state.stats()
+    finally:
+        # quickstart 와 그 아래 chromedriver/Chrome 까지 정리
+        kill_pids(process_tree(proc.pid))
+        proc.wait()
+        server.stop()
+
+    def since_start(t):
+        return round((t - started) * 1000, 1) if t is not None else None
+
+    return {"login_ms": since_start(stats["first_login_at"]),
+            "first_results_ms": since_start(stats["first_search_at"]),
+            "exit_code": proc.returncode if stats["first_search_at"] is None else None}
+
+
+def run_bench(scenario, runs, cold, driver_cache, timeout, extra):
+    if cold and os.path.exists(driver_cache):
+        os.remove(driver_cache)
+    samples = [run_once(scenario, driver_cache, timeout, extra) for _ in range(runs)]
+    done = [s["first_results_ms"] for s in samples if s["first_results_ms"] is not None]
+    return {
+        "runs": samples,
+        "first_results_ms": {"first": samples[0]["first_results_ms"],
+                             "min": min(done) if done else None,
+                             "avg": round(sum(done) / len(done), 1) if done else None,
+                             "max": max(done) if done else None},
+        "failed": runs - len(done),
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Startup-time benchmark')
+    parser.add_argument("--scenario", type=str, default=None, help="scenario json (default: fakesrt.DEFAULT_SCENARIO)")
+    parser.add_argument("--runs", type=int, default=5, help="number of process starts")
+    parser.add_argument("--cold", action="store_true", help="remove driver cache before the first run")
+    parser.add_argument("--driver_cache", type=str, default=DEFAULT_DRIVER_CACHE)
+    parser.add_argument("--timeout", type=int, default=120, help="max seconds per run")
+    parser.add_argument("--out", type=str, default=None, help="write result json")
+    args, extra = parser.parse_known_args()
+    extra = [a for a in extra if a != "--"]
+
+    result = run_bench(load_scenario(args.scenario), args.runs, args.cold, args.driver_cache, args.timeout, extra)
+    text = json.dumps(result, ensure_ascii=False, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text)
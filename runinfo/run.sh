@@ -1,20 +1,19 @@
 #!/bin/bash
 
-# trap "kill -9 $(pgrep -lfa python | grep -e quickstart.py | awk '{print $1}'); kill -9 $(pgrep -lfa bash | grep -e ./run.sh -e srt_reservation | awk '{print $1}'); exit 1" SIGINT
+# ${1}.sh 안에서 quickstart.py 를 --supervise True 로 실행한다.
+# 브라우저 메모리/멈춤 감시와 재시작은 supervisor 가 프로세스 안에서 처리하고,
+# 여기서는 프로세스가 비정상 종료(예: 봇 메모리 초과, exit 3)했을 때만 다시 띄운다.
+# 예약 기록은 --state_file 에 남아 있으므로 재시작해도 이어서 진행한다.
 
 result=1
 while [ $result -ne 0 ]
 do
     sleep 1s
     SECONDS=0
-    rm -rf /tmp/.org.chromium.Chromium*
-    echo 3 | sudo tee /proc/sys/vm/drop_caches > /dev/null
-    timeout 1800s bash $(dirname $0)/${1}.sh
+    bash $(dirname $0)/${1}.sh
     result=$?
 
     secs=$SECONDS
     hrs=$(( secs/3600 )); mins=$(( (secs-hrs*3600)/60 )); secs=$(( secs-hrs*3600-mins*60 ))
-    printf 'Time spent: %02d:%02d:%02d\n' $hrs $mins $secs
+    printf 'Time spent: %02d:%02d:%02d (exit %d)\n' $hrs $mins $secs $result
 done
-
-
@@ -1,23 +1,48 @@
 # -*- coding: utf-8 -*-
-import os
 import time
+from collections import defaultdict
 from datetime import datetime
-from random import randint
 
 from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.select import Select
-from selenium.webdriver.support.ui import WebDriverWait
 
+from srt_reservation.browser import BrowserProfile
 from srt_reservation.card import Card
+from srt_reservation.checkout import CheckoutError, fill_payment_form
+from srt_reservation.http_poller import HttpPoller, SessionExpired
+from srt_reservation.introspect import DEFAULT_INTROSPECT_DIR, Introspector, SectionProfiler
+from srt_reservation.locators import (ADULT_NUM, ARR_STN, BOOK_SUCCESS, DPT_DT, DPT_STN, DPT_TM, ELDER_NUM, KID_NUM,
+                                      LOGIN_ID, LOGIN_MENU, LOGIN_PAGE, LOGIN_PSW, LOGIN_SUBMIT, PAY_BUTTON_ID, PAY_LINK,
+                                      REFRESH_BUTTON, RESULT_FORM, RESULT_PAGE, SEARCH_BUTTON, SEARCH_PAGE,
+                                      SMARTPHONE_TAB_SELECTOR, SOLD_OUT, PageShapeError, assert_page, book_link,
+                                      reservation_pay_link, reserve_link)
+from srt_reservation.metrics import Metrics
+from srt_reservation.recorder import FlightRecorder, NullRecorder
+from srt_reservation.procstat import ResourceGauge, browser_pid
+from srt_reservation.scheduler import PollScheduler, load_time_windows
+from srt_reservation.session import DriverSession
 from srt_reservation.slackbot import SlackBot
-from srt_reservation.srt import SRT
-from srt_reservation.train import Train
+from srt_reservation.state import ANNOUNCED, BOOKED, RESERVED, HuntStore, NullStore
+from srt_reservation.startup import resolve_binaries
+from srt_reservation.snapshot import ChangeTracker, read_result_rows
+from srt_reservation.targets import TabPool, load_targets
+from srt_reservation.timetable import TIMETABLE_ROWS, TimetableCache
+from srt_reservation.train_filter import ACCEPT, STOP
+from srt_reservation.waitlist import WaitlistManager, fetch_page, parse_reservation_list
+from srt_reservation.waits import WaitPolicy
 
-IMPLICIT_WAIT_SEC = 60
+# 명시적 대기만 사용. 없는 요소를 찾느라 멈추지 않도록 implicit wait 는 끈다.
+IMPLICIT_WAIT_SEC = 0
+
+LOGIN_PATH = "/cmc/01/selectLoginForm.do"
+SEARCH_PATH = "/hpg/hra/01/selectScheduleList.do"
+RESERVATION_LIST_PATH = "/hpg/hra/02/selectReservationList.do"
+
+# 결제/예약대기 버튼을 누른 뒤 받아줄 alert 최대 개수
+MAX_CHECKOUT_ALERTS = 3
 
 
 def get_now_str():
@@ -25,109 +50,293 @@ def get_now_str():
 
 
 class SRThunter:
-    def __init__(self, cli_args):
-        self.srt = srt = SRT(cli_args.dpt, cli_args.arr, cli_args.dt, cli_args.tm, cli_args.num)
-        srt.set_user_info(cli_args.user, cli_args.psw) \
-            .set_adult(cli_args.adult) \
-            .set_kid(cli_args.kid) \
-            .set_elder(cli_args.elder) \
-            .set_exact_tms(cli_args.exact_times) \
-            .set_want_reserve(cli_args.reserve) \
-            .set_greedy(cli_args.greedy)
+    def __init__(self, cli_args, binaries=None, budget=None, targets=None):
+        self.started_at = time.perf_counter()
+        self.first_results_sec = None
+
+        # 브라우저부터 띄우고, 뜨는 동안 나머지 설정을 읽는다
+        self.binaries = binaries or resolve_binaries(None if cli_args.driver_cache == "None" else cli_args.driver_cache)
+        self.browser = BrowserProfile(lean=cli_args.lean,
+                                      profile_dir=None if cli_args.profile_dir == "None" else cli_args.profile_dir,
+                                      cache_mb=cli_args.cache_mb,
+                                      renderer_mb=cli_args.renderer_mb,
+                                      chrome_path=self.binaries.chrome)
+        self.driver = None
+        self.wait = None
+        self.session = DriverSession(self)
+        self.session.prelaunch()
+        try:
+            self.load_config(cli_args, budget, targets)
+        except Exception:
+            self.session.quit()
+            raise
+
+    def load_config(self, cli_args, budget=None, targets=None):
+        # 검색 목표 목록. 로그인 정보는 모두 같고, self.srt 는 첫 번째 목표
+        self.targets = list(targets) if targets else load_targets(cli_args)
+        self.srt = self.targets[0]
 
         token, channel = cli_args.slack.strip().split(' ')
-        self.bot = SlackBot(token, channel)
-        self.card = Card(cli_args.checkout)
+        self.bot = SlackBot(token, channel, api_url=cli_args.slack_api)
+        self.card = Card(cli_args.checkout, strict=True)
+        self.metrics = Metrics(report_sec=cli_args.metrics_sec,
+                               jsonl_path=None if cli_args.metrics_log == "None" else cli_args.metrics_log,
+                               bot=self.bot if cli_args.metrics_slack else None)
+        self.metrics.add_gauge(ResourceGauge(lambda: browser_pid(self.driver) if self.driver is not None else None,
+                                             lambda: self.metrics.cnt_cycle))
+        self.scheduler = PollScheduler(min_sec=cli_args.poll_min, max_sec=cli_args.poll_max,
+                                       windows=None if cli_args.poll_profile == "None" else load_time_windows(cli_args.poll_profile),
+                                       max_backoff_sec=cli_args.max_backoff, budget=budget)
+        self.metrics.add_gauge(self.scheduler.gauge)
+
+        self.base_url = cli_args.base_url.rstrip("/")
 
         self.cnt_tried = 0  # Timeout 횟수 기록
         self.cnt_refresh = 0  # 새로고침 횟수 기록
         self.success = False
+        self.stop_requested = False  # 외부(벤치마크 등)에서 중단 요청
+
+        self.poller = HttpPoller(LOGIN_PATH) if cli_args.http_poll else None
+        self.store = NullStore() if cli_args.state_file == "None" else HuntStore(cli_args.state_file)
+        self.reset_state = cli_args.reset_state
+        self.timetable = None if cli_args.timetable == "None" else TimetableCache(cli_args.timetable)
+        # 최근 사이클 기록. 에러/느린 사이클일 때만 디스크에 저장
+        self.recorder = NullRecorder() if cli_args.recorder_dir == "None" else \
+            FlightRecorder(cli_args.recorder_dir, max_cycles=cli_args.recorder_cycles, max_mb=cli_args.recorder_mb,
+                           slow_sec=cli_args.slow_cycle_sec)
+
+        self.tabs = TabPool(cli_args.tabs)
+        # 신청한 예약대기가 확정됐는지 예약 내역으로 확인 (--waitlist_poll_sec 마다)
+        self.waitlist = WaitlistManager(cli_args.waitlist_poll_sec)
+        self.metrics.add_gauge(self.waitlist.stats)
+        # 결과 화면 구조 검사. 검색 직후에는 항상, 새로고침 중에는 shape_check_sec 마다
+        self.shape_check_sec = cli_args.shape_check_sec
+        self.shape_checked_at = time.monotonic()
+        self.last_shape_error = None
+        # (검색 목표, "browser"/"http") 별 결과 표 변화 추적
+        self.trackers = defaultdict(ChangeTracker)
+        self.last_booked_at = None
+        self.metrics.add_gauge(self.change_gauge)
+        self.metrics.add_gauge(self.recorder.stats)
+
+        # kill -USR1 상태 출력, kill -USR2 check_result 프로파일 (introspect.py)
+        self.current_target = None
+        self.cycle_started_at = None
+        introspect_dir = DEFAULT_INTROSPECT_DIR if cli_args.introspect_dir == "None" else cli_args.introspect_dir
+        self.profiler = SectionProfiler(introspect_dir, cli_args.profile_sec)
+        if cli_args.introspect_dir != "None":
+            Introspector(self, introspect_dir).install()
+
+        for srt in self.targets:
+            self.prepare_target(srt)
+        if self.timetable is not None:
+            self.metrics.add_gauge(self.timetable.stats)
+
+    def prepare_target(self, srt):
+        srt.init_results()
+        if self.reset_state:
+            self.store.clear(srt)
+        # 이전 실행에서 예약/예약대기한 기차는 다시 시도하지 않는다
+        if self.store.restore(srt) > 0:
+            print(f"{srt.label()} 이전 기록 복원: 예약 {srt.gotcha}건, 예약대기 {sum(srt.reserved.values())}건")
+            if srt.done:
+                print(f"{srt.label()} 이미 예약이 끝난 검색입니다. 처음부터 다시 하려면 --reset_state True")
+        # 저장된 시간표가 있으면 원하는 기차만 보이도록 검색 시간대/확인 범위를 좁힌다
+        if self.timetable is not None and self.timetable.plan(srt):
+            print(f"{srt.label()} 시간표 기준 확인 범위: {srt.row_limit()}개")
+
+    def add_target(self, srt):
+        # 실행 중에 다른 스레드(daemon)에서 같은 계정의 검색 목표를 추가한다
+        self.prepare_target(srt)
+        self.targets.append(srt)
 
     def run(self):
-        self.srt.init_results()
-        while not self.success:
+        # 모든 목표가 끝나면 돌아온다. 목표를 추가한 뒤 다시 호출할 수 있다
+        self.success = False
+        while not self.success and not self.stop_requested:
             try:
                 self.cnt_tried += 1
-                self.run_driver()
-                print("Login")
-                self.login(self.srt.login_id, self.srt.login_pwd)
-                print("Search")
-                self.go_search(self.srt)
-                print("Check")
-                self.check_result(self.srt)
+                # 브라우저는 살아있는 한 재사용, 필요할 때만 재로그인/재실행
+                self.session.ensure()
+                self.hunt()
             except Exception as e:
                 print(e)
-                pass
+                print(self.session.to_string())
+                if isinstance(e, PageShapeError):
+                    self.on_page_shape_error(e)
+                self.recorder.capture(self.driver, "error", e)
+                # 어느 탭이 어떤 화면인지 알 수 없으므로 다음엔 다시 검색
+                self.tabs.invalidate()
+                # 에러가 이어지면 재시도 간격을 늘린다
+                self.scheduler.on_error()
+                if self.cycle_started_at is not None:
+                    # 실패한 사이클도 닫아야 단계별 시간이 다음 사이클로 넘어가지 않는다
+                    self.end_cycle(e)
+                self.scheduler.wait()
+
+    def hunt(self):
+        # 남은 검색 목표를 돌아가며 한 번씩 조회. 요청 간격(scheduler)은 모든 목표가 나눠 쓴다.
+        while not self.stop_requested:
+            active = [srt for srt in self.targets if not srt.done]
+            if len(active) == 0:
+                self.success = True
+                return
+
+            for srt in active:
+                if self.stop_requested or self.session.recycle_requested:
+                    return
+                self.current_target = srt
+                self.cycle_started_at = time.perf_counter()
+                self.recorder.begin(self.metrics.cnt_cycle, srt.label())
+                if self.activate(srt):
+                    with self.profiler:
+                        self.check_result(srt)
+                if self.waitlist.due(self.targets):
+                    self.check_waitlist()
+                self.end_cycle()
+                self.scheduler.wait()
+
+    def end_cycle(self, error=None):
+        # 사이클 전체 시간 (요청 간격 대기 제외). 느린 사이클 판단도 단계 합이 아니라 이것으로 한다
+        wall_sec = time.perf_counter() - self.cycle_started_at
+        self.metrics.record("cycle", wall_sec, in_cycle=False)
+        # 에러로 끝난 사이클은 이미 "error" 로 저장했다
+        if self.recorder.end(self.metrics.take_cycle(), wall_sec, error) and error is None:
+            self.recorder.capture(self.driver, "slow")
+        self.cycle_started_at = None
+        self.profiler.tick()
+        self.scheduler.on_cycle_end()
+        self.metrics.end_cycle()
+
+    def activate(self, srt):
+        # srt 의 최신 결과를 화면에 띄운다. 브라우저 화면을 확인할 필요가 없으면 False
+        handle, loaded = self.tabs.acquire(self.driver, srt)
+        if not loaded:
+            print(f"Search {srt.label()}")
+            self.go_search(srt)
+            if self.learn_timetable(srt):
+                # 시간표를 보고 검색 시간대를 바꿨으면 바로 다시 검색
+                self.go_search(srt)
+            self.tabs.mark_loaded(handle, srt)
+            if self.first_results_sec is None:
+                # 시작부터 첫 조회 결과까지
+                self.first_results_sec = time.perf_counter() - self.started_at
+                self.metrics.record("first_results", self.first_results_sec)
+                print(f"첫 조회 결과까지 {self.first_results_sec:.2f}초")
+            if self.poller is not None:
+                self.poller.sync_from_driver(self.driver, id(srt))
+            return True
+
+        if self.poller is not None and not self.poll_http(srt):
+            # 예약할 행이 보일 때까지는 HTTP 로만 조회
+            return False
+
+        with self.metrics.phase("refresh"):
+            self.refresh_result()
+        return True
+
+    def learn_timetable(self, srt):
+        # 검색 직후 결과 표로 시간표를 갱신하고, 바뀌었으면 계획을 다시 세운다. 검색 시간대가 바뀌면 True
+        if self.timetable is None:
+            return False
+        _, rows = read_result_rows(self.driver, srt.dpt_dt, TIMETABLE_ROWS)
+        if not self.timetable.observe(srt, rows):
+            return False
+        dpt_tm, num = srt.dpt_tm, srt.row_limit()
+        self.timetable.plan(srt)
+        if (srt.dpt_tm, srt.row_limit()) != (dpt_tm, num):
+            print(f"{srt.label()} 시간표 기준 확인 범위: {srt.row_limit()}개")
+        return srt.dpt_tm != dpt_tm
+
+    def change_gauge(self):
+        # Metrics gauge. 바뀐 행/그대로인 행 수
+        total = defaultdict(int)
+        for tracker in self.trackers.values():
+            for name, value in tracker.stats().items():
+                total[name] += value
+        return dict(total)
+
+    def stop(self):
+        self.stop_requested = True
+
+    def close(self):
+        # 브라우저 종료, 남은 Slack 메시지 전송, 기록 DB 닫기
+        self.session.quit()
+        self.bot.close()
+        self.store.close()
+        if self.timetable is not None:
+            self.timetable.close()
+        if self.poller is not None:
+            self.poller.close()
 
     def run_driver(self):
-        chrome_options = Options()
-        chrome_options.binary_location = os.getenv("CHROME_PATH")
-        # chrome_options.add_argument("headless")
-        # chrome_options.add_argument("lang=ko_KR")
-        # chrome_options.add_argument('window-size=1920x1080')
-        # chrome_options.add_argument("disable-gpu")
-        # chrome_options.add_argument(
-        #     "user-agent=Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36")
-        chrome_service = webdriver.ChromeService(executable_path=os.getenv("CHROMEDRIVER_PATH"))
+        # --lean 이면 headless + 리소스 차단 + 디스크 프로필 (browser.py)
+        chrome_options = self.browser.build_options()
+        chrome_service = webdriver.ChromeService(executable_path=self.binaries.chromedriver)
         self.driver = webdriver.Chrome(options=chrome_options, service=chrome_service)
+        self.browser.apply(self.driver)
         self.driver.implicitly_wait(IMPLICIT_WAIT_SEC)
+        self.wait = WaitPolicy(self.driver)
 
     def login(self, login_id, login_psw):
-        self.driver.get('https://etk.srail.co.kr/cmc/01/selectLoginForm.do')
+        self.driver.get(self.base_url + LOGIN_PATH)
+        self.recorder.note_url(self.base_url + LOGIN_PATH)
 
-        self.driver.find_element(By.CSS_SELECTOR, '#srchDvNm01').send_keys(str(login_id))
-        self.driver.find_element(By.ID, 'hmpgPwdCphd01').send_keys(str(login_psw))
-        self.driver.find_element(By.XPATH,
-                                 '//*[@id="login-form"]/fieldset/div[1]/div[1]/div[2]/div/div[2]/input').click()
+        self.wait.element(*LOGIN_ID).send_keys(str(login_id))
+        assert_page(self.driver, "로그인", LOGIN_PAGE)
+        self.driver.find_element(*LOGIN_PSW).send_keys(str(login_psw))
+        self.driver.find_element(*LOGIN_SUBMIT).click()
+        # 로그인 완료 확인
+        self.wait.until(EC.text_to_be_present_in_element(LOGIN_MENU, "환영합니다"), "page")
 
         return self.driver
 
     def check_login(self):
-        menu_text = self.driver.find_element(By.CSS_SELECTOR,
-                                             "#wrap > div.header.header-e > div.global.clear > div").text
-        if "환영합니다" in menu_text:
+        menu = self.wait.find_now(*LOGIN_MENU)
+        if menu is not None and "환영합니다" in menu.text:
             return True
         else:
             return False
 
     def go_search(self, srt):
         # 기차 조회 페이지로 이동
-        self.driver.get('https://etk.srail.kr/hpg/hra/01/selectScheduleList.do')
+        self.driver.get(self.base_url + SEARCH_PATH)
+        self.recorder.note_url(self.base_url + SEARCH_PATH)
 
-        time.sleep(2)
         # 출발지 입력
-        elm_dpt_stn = self.driver.find_element(By.ID, 'dptRsStnCdNm')
+        elm_dpt_stn = self.wait.element(*DPT_STN)
+        assert_page(self.driver, "조회", SEARCH_PAGE)
         elm_dpt_stn.clear()
         elm_dpt_stn.send_keys(srt.dpt_stn)
 
         # 도착지 입력
-        elm_arr_stn = self.driver.find_element(By.ID, 'arvRsStnCdNm')
+        elm_arr_stn = self.driver.find_element(*ARR_STN)
         elm_arr_stn.clear()
         elm_arr_stn.send_keys(srt.arr_stn)
 
         # 출발 날짜 입력
-        elm_dpt_dt = self.driver.find_element(By.ID, "dptDt")
+        elm_dpt_dt = self.driver.find_element(*DPT_DT)
         self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_dpt_dt)
         Select(elm_dpt_dt).select_by_value(srt.dpt_dt)
 
         # 출발 시간 입력
-        elm_dpt_tm = self.driver.find_element(By.ID, "dptTm")
+        elm_dpt_tm = self.driver.find_element(*DPT_TM)
         self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_dpt_tm)
         Select(elm_dpt_tm).select_by_visible_text(srt.dpt_tm)
 
         # 인원 수 입력
         if srt.adult != 1:
-            elm_adult_num = self.driver.find_element(By.NAME, "psgInfoPerPrnb1")
+            elm_adult_num = self.driver.find_element(*ADULT_NUM)
             self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_adult_num)
             Select(elm_adult_num).select_by_visible_text(f"어른(만 13세 이상) {srt.adult}명")
 
         if srt.kid > 0:
-            elm_kid_num = self.driver.find_element(By.NAME, "psgInfoPerPrnb5")
+            elm_kid_num = self.driver.find_element(*KID_NUM)
             self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_kid_num)
             Select(elm_kid_num).select_by_visible_text(f"어린이(만 6~12세) {srt.kid}명")
 
         if srt.elder > 0:
-            elm_elder_num = self.driver.find_element(By.NAME, "psgInfoPerPrnb4")
+            elm_elder_num = self.driver.find_element(*ELDER_NUM)
             self.driver.execute_script("arguments[0].setAttribute('style','display: True;')", elm_elder_num)
             Select(elm_elder_num).select_by_visible_text(f"경로(만 65세 이상) {srt.elder}명")
 
@@ -138,30 +347,33 @@ class SRThunter:
                     f"*예약 시작! ({'자동' if self.card.want_checkout else '수동'} 결제)*\n" \
                     f"열차: {srt.dpt_stn}▶{srt.arr_stn}\n" \
                     f"시간: {datetime.strptime(srt.dpt_dt, '%Y%m%d').strftime('%Y-%m-%d %a')} {srt.dpt_tm}시{'(auto)' if srt.is_dpt_tm_auto_set else ''} 이후\n" \
-                    f"범위: {srt.num_trains_to_check}개{'(auto)' if srt.is_num_auto_set else ''}\n" \
+                    f"범위: {srt.row_limit()}개{'(auto)' if srt.is_num_auto_set or srt.rows_to_check is not None else ''}\n" \
                     f"인원: 성인({srt.adult}명) 어린이({srt.kid}명) 경로({srt.elder}명)\n" \
                     f"대기: {srt.want_reserve}\n" \
                     f"고른 시간: {srt.exact_tms if len(srt.exact_tms) != 0 else '-'}"
-        print(start_msg)
-        self.bot.send_slack_bot_msg(start_msg)
-
-        self.driver.find_element(By.CSS_SELECTOR, "#search_top_tag > input").click()
-
-    def book_ticket(self, standard_seat, i):
-        # standard_seat는 일반석 검색 결과 텍스트
-        if "예약하기" in standard_seat:
+        if not srt.announced:
+            print(start_msg)
+            self.bot.send_slack_bot_msg(start_msg, coalesce=f"start:{srt.label()}")
+            srt.announced = True
+            self.store.record(srt, "", ANNOUNCED)
+
+        self.driver.find_element(*SEARCH_BUTTON).click()
+        self.wait.element(*RESULT_FORM, "refresh")
+        # 결과 표 위치/머리글이 바뀌었으면 행을 찾느라 시간을 쓰지 않고 바로 멈춘다
+        self.check_result_page()
+
+    def book_ticket(self, row):
+        # row.standard_seat는 일반석 검색 결과 텍스트
+        if row.is_bookable():
             # Error handling in case that click does not work
             try:
                 print("예약 가능 클릭")
-                b = self.driver.find_element(By.CSS_SELECTOR,
-                                             f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(7) > a")
+                b = self.driver.find_element(*book_link(row.idx))
                 if "예약하기" in b.text:
                     b.click()
             except Exception as err:
                 print(err)
-                self.driver.find_element(By.CSS_SELECTOR,
-                                         f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(7) > a").send_keys(
-                    Keys.ENTER)
+                self.driver.find_element(*book_link(row.idx)).send_keys(Keys.ENTER)
             finally:
                 pass
 
@@ -173,161 +385,293 @@ class SRThunter:
             # else:
             #     print("잔여석 없음. 다시 검색")
 
-            # Test 후 적용 예정
-            wait = WebDriverWait(self.driver, 10)  # 최대 10초까지 대기
+            # 성공/잔여석 없음 중 먼저 뜨는 쪽을 최대 book_result 초까지 대기
             try:
-                wait.until(EC.presence_of_element_located((By.ID, "isFalseGotoMain")))
+                self.wait.until(EC.any_of(EC.presence_of_element_located(BOOK_SUCCESS),
+                                          EC.presence_of_element_located(SOLD_OUT)),
+                                "book_result")
+            except Exception as e:
+                print("알 수 없는 에러")
+                self.recorder.capture(self.driver, "book_unknown", e)
+                return False
+
+            if self.wait.find_now(*BOOK_SUCCESS) is not None:
                 print("예약 성공")
                 return True
-            except:
-                try:
-                    wait.until(EC.presence_of_element_located((By.CSS_SELECTOR,
-                                                               "#wrap > div.container.container-e > div > div.sub_con_area > div.box2.val_m.tal_c > span")))
-                    print("잔여석 없음")
-                    self.driver.back()  # 뒤로가기
 
-                except:
-                    print("알 수 없는 에러")
-                    return False
+            print("잔여석 없음")
+            self.driver.back()  # 뒤로가기
+            self.wait.element(*RESULT_FORM, "refresh")
+
+    def check_result_page(self):
+        assert_page(self.driver, "조회 결과", RESULT_PAGE, table=True)
+        self.shape_checked_at = time.monotonic()
+        self.last_shape_error = None
+
+    def on_page_shape_error(self, e):
+        # 사이트가 바뀐 경우라 재시도로는 풀리지 않을 수 있다. 같은 내용은 한 번만 알린다
+        self.metrics.incr("page_shape_errors")
+        if str(e) != self.last_shape_error:
+            self.last_shape_error = str(e)
+            self.bot.send_slack_bot_msg(f"{get_now_str()}\n*화면 구조 변경 감지*\n{e}", coalesce="page_shape")
 
     def refresh_result(self):
-        submit = self.driver.find_element(By.XPATH, "//input[@value='조회하기']")
+        start = time.perf_counter()
+        old_form = self.wait.find_now(*RESULT_FORM)
+        submit = self.driver.find_element(*REFRESH_BUTTON)
         self.driver.execute_script("arguments[0].click();", submit)
+        # 이전 결과 표가 사라지고 새 표가 뜰 때까지 대기
+        if old_form is not None:
+            self.wait.until(EC.staleness_of(old_form), "refresh")
+        self.wait.element(*RESULT_FORM, "refresh")
+        self.scheduler.on_response(time.perf_counter() - start)
+        if self.shape_check_sec and time.monotonic() - self.shape_checked_at >= self.shape_check_sec:
+            self.check_result_page()
         self.cnt_refresh += 1
-        print(f"새로고침 {self.cnt_tried}-{self.cnt_refresh}회")
+        waited = self.wait.take_waited()
+        self.metrics.record("wait", waited)
+        print(f"새로고침 {self.cnt_tried}-{self.cnt_refresh}회 (대기 {waited:.2f}s)")
 
         # time.sleep(0.5)
 
-    def reserve_ticket(self, i):
-        self.driver.find_element(By.CSS_SELECTOR,
-                                 f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(8) > a").click()
+    def reserve_ticket(self, row):
+        link = self.driver.find_element(*reserve_link(row.idx))
+        link.click()
+        # 확인 alert 를 받고 신청 결과 화면으로 넘어가야 신청된 것으로 본다
+        if not self.accept_until_stale(link, "page"):
+            raise Exception("예약대기 신청 후 페이지 이동 없음")
         print("예약 대기 완료")
 
-    def get_train(self, dpt_dt, i):
-        # 열차종류
-        train_type = self.driver.find_element(By.CSS_SELECTOR,
-                                              f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(2)").text
-        # 열차번호
-        train_num = self.driver.find_element(By.CSS_SELECTOR,
-                                             f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(3)").text
-        # 출발
-        dpt = self.driver.find_element(By.CSS_SELECTOR,
-                                       f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(4)").text
-        # 도착
-        arr = self.driver.find_element(By.CSS_SELECTOR,
-                                       f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(5)").text
-        return Train(dpt_dt, train_type, train_num, dpt, arr)
-
-    def alert_ok(self, print_trace=True):
+    def accept_until_stale(self, element, action):
+        # element 가 있던 페이지를 벗어날 때까지 뜨는 alert 를 받는다. 벗어나면 True
+        for _ in range(MAX_CHECKOUT_ALERTS):
+            res = self.wait.until(EC.any_of(EC.alert_is_present(), EC.staleness_of(element)), action)
+            if res is True:
+                return True
+            self.recorder.note_alert(res.text)
+            res.accept()
+        return False
+
+    def alert_ok(self, print_trace=True, expect=True):
+        # expect=False 이면 기다리지 않고 떠 있는 alert 만 처리
         try:
-            WebDriverWait(self.driver, 3).until(EC.alert_is_present())
-            alert = self.driver.switch_to.alert
-            alert.send_keys(Keys.ENTER)
-        except:
-            try:
-                time.sleep(2)
-                alert = self.driver.switch_to_alert()
-                alert.accept()
-            except Exception as e:
-                try:
-                    from selenium.webdriver.common.alert import Alert
-                    Alert(self.driver).accept()
-                except:
-                    if print_trace:
-                        print(e)
-                    return False
+            alert = self.wait.alert() if expect else self.wait.alert_now()
+            if alert is None:
+                return False
+            self.recorder.note_alert(alert.text)
+            alert.accept()
+        except Exception as e:
+            if print_trace:
+                print(e)
+            return False
         return True
 
-    def checkout_ticket(self, my_card, cur_train):
-        self.driver.find_element(By.CSS_SELECTOR, f".tal_c > a:nth-child(1)").click()
-
-        # 보안키패드 Off
-        self.driver.find_element(By.CSS_SELECTOR, f"#Tk_stlCrCrdNo14_checkbox").click()
-        self.driver.find_element(By.CSS_SELECTOR, f"#Tk_vanPwd1_checkbox").click()
-        # Card Numbers
-        for i in range(1, 5):
-            cn = self.driver.find_element(By.CSS_SELECTOR, f"#stlCrCrdNo1{i}")
-            cn.send_keys(my_card.card_numbers[i - 1])
+    def checkout_ticket(self, my_card, cur_train, pay_link=PAY_LINK):
+        # 예약 완료 페이지(또는 예약 내역) -> 결제 페이지
+        self.driver.find_element(*pay_link).click()
+        pay_button = self.wait.clickable(By.ID, PAY_BUTTON_ID, "checkout")
 
-        # Valid date
-        Select(self.driver.find_element(By.ID, 'crdVlidTrm1M')).select_by_value(my_card.valid_mon)
-        Select(self.driver.find_element(By.ID, 'crdVlidTrm1Y')).select_by_value(my_card.valid_year)
+        # 보안키패드 Off + 카드 번호/유효기간/비밀번호/인증번호를 한 번에
+        smartphone_selected = fill_payment_form(self.driver, my_card)
 
-        # Password first 2
-        pw = self.driver.find_element(By.CSS_SELECTOR, f"#vanPwd1")
-        pw.send_keys(my_card.pw)
-
-        # 인증번호 (주민등록번호 앞 6자리)
-        bd = self.driver.find_element(By.CSS_SELECTOR, f"#athnVal1")
-        bd.send_keys(my_card.my_number)
-
-        # 스마트폰 발권
-        self.driver.find_element(By.CSS_SELECTOR, f"div.tab.tab3 > ul > li:nth-child(2)").click()
-        self.alert_ok()
+        # 스마트폰 발권. 이미 선택돼 있으면 누르지 않는다 (누르면 확인 alert)
+        if not smartphone_selected:
+            self.driver.find_element(By.CSS_SELECTOR, SMARTPHONE_TAB_SELECTOR).click()
+            self.alert_ok()
 
         # # 결제조건 동의
         # self.driver.find_element(By.CSS_SELECTOR, f"#agreeTmp").click()
 
-        # 결제버튼
-        self.driver.find_element(By.CSS_SELECTOR, f"#requestIssue1").click()
-        self.alert_ok()
+        # 결제버튼. 확인 alert 를 받고 결제 페이지를 벗어날 때까지 기다린다
+        pay_button.click()
+        if not self.accept_until_stale(pay_button, "checkout"):
+            raise CheckoutError("결제 후 페이지 이동 없음")
 
-        self.bot.send_slack_bot_msg(f"{get_now_str()}\n*결제 성공!*\n{cur_train.to_string()}")
+    def is_actionable(self, srt, row):
+        # 이번 결과에서 예약/예약대기를 시도할 행인지
+        key = row.train.hash()
+        if not srt.filter.accepts(row.train):
+            return False
+        if srt.booked[key]:
+            return False
+        if row.is_bookable():
+            return True
+        return srt.want_reserve and not srt.reserved[key] and row.is_reservable()
 
-    def check_result(self, srt):
-        cur_exact_tms_cache = dict()
+    def poll_http(self, srt):
+        # 브라우저를 건드리지 않고 HTTP 로만 조회. 예약할 행이 있으면 True
+        tracker = self.trackers[(id(srt), "http")]
+        start = time.perf_counter()
+        try:
+            with self.metrics.phase("http_poll"):
+                fp, rows = self.poller.poll(srt.dpt_dt, srt.row_limit(), id(srt), tracker.last_fp())
+            self.recorder.note_rows(fp, rows)
+            self.scheduler.on_response(time.perf_counter() - start)
+        except SessionExpired:
+            self.session.invalidate_login()
+            raise
+        self.cnt_refresh += 1
+        print(f"HTTP 조회 {self.cnt_tried}-{self.cnt_refresh}회")
+        if rows is None:
+            tracker.same_table(fp)
+            return False
 
-        while True:
-            # 예상하지 못한 alert 넘기기
+        found = False
+        for row in tracker.diff(fp, rows):
+            if self.is_actionable(srt, row):
+                # 브라우저에서 예약이 실패하면 다음 조회에서 다시 봐야 한다
+                tracker.recheck(row.train.hash())
+                found = True
+        tracker.commit()
+        return found
+
+    def check_result(self, srt):
+        # 현재 화면의 결과 표를 한 번 확인하고 예약/예약대기를 시도한다
+        # 예상하지 못한 alert 넘기기
+        with self.metrics.phase("alert"):
             while True:
                 try:
-                    if not self.alert_ok(print_trace=False): break
+                    if not self.alert_ok(print_trace=False, expect=False): break
+                    # 조회 중 alert 가 뜨면 서버가 거부한 것으로 보고 간격을 늘린다
+                    self.scheduler.on_alert()
                 except:
                     pass
 
-            for i in range(1, srt.num_trains_to_check + 1):
-                try:
-                    standard_seat = self.driver.find_element(By.CSS_SELECTOR,
-                                                             f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(7)").text
-                    reservation = self.driver.find_element(By.CSS_SELECTOR,
-                                                           f"#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr:nth-child({i}) > td:nth-child(8)").text
-                    cur_train = self.get_train(srt.dpt_dt, i)
-
-                except Exception as e:
-                    print(e)
-                    standard_seat = "매진"
-                    reservation = "매진"
-                    continue
-
-                if cur_exact_tms_cache.get(cur_train.dpt_time) is None:
-                    cur_exact_tms_cache[cur_train.dpt_time] = tuple(map(int, cur_train.dpt_time.split(":")))
-                if len(srt.exact_tms) != 0 and cur_train.dpt_time not in srt.exact_tms:
-                    if srt.max_exact_tm < cur_exact_tms_cache[cur_train.dpt_time]: break
+        # 결과 표 전체를 한 번에 읽는다. 지난번과 같은 표면 행은 받지 않는다
+        tracker = self.trackers[(id(srt), "browser")]
+        with self.metrics.phase("parse"):
+            fp, rows = read_result_rows(self.driver, srt.dpt_dt, srt.row_limit(), tracker.last_fp())
+        self.recorder.note_rows(fp, rows)
+        detected_at = time.perf_counter()  # 결제까지 걸린 시간의 기준
+        if rows is None:
+            tracker.same_table(fp)
+            return
+
+        # 상태가 바뀐 행만 판단한다. 같은 결과에서 예약 가능한 행은 순서대로 모두 시도한다
+        on_results = True  # 현재 화면이 결과 표인지 (예약/예약대기 후에는 다른 화면)
+        for row in tracker.diff(fp, rows):
+            cur_train = row.train
+
+            decision = srt.filter.decide(cur_train)
+            if decision != ACCEPT:
+                if decision == STOP: break
+                continue
+
+            if not srt.booked[cur_train.hash()] and row.is_bookable():
+                # 실패하면(잔여석 없음 등) 상태가 그대로여도 다음 새로고침에서 다시 시도
+                tracker.recheck(cur_train.hash())
+                if not on_results:
+                    row = self.return_to_results(srt, row)
+                    on_results = True
+                    if row is None or not row.is_bookable():
+                        continue
+                with self.metrics.phase("book"):
+                    booked = self.book_ticket(row)
+                if booked:
+                    on_results = False
+                    self.on_booked(srt, row, detected_at)
+                    if not srt.greedy or srt.gotcha >= srt.num_trains_to_check:
+                        srt.done = True
+                        print(f"{srt.label()} 예약 종료")
+                        break
                     continue
-
-                if not srt.booked[cur_train.hash()]:
-                    if self.book_ticket(standard_seat, i):
-                        self.bot.send_slack_bot_msg(f"{get_now_str()}\n*{i}번째 순위 예약성공!*\n{cur_train.to_string()}")
-                        srt.booked[cur_train.hash()] = True
-                        srt.gotcha += 1
-                        if self.card.want_checkout:
-                            try:
-                                self.checkout_ticket(self.card, cur_train)
-                            except Exception as e:
-                                self.bot.send_slack_bot_msg(
-                                    f"{get_now_str()}\n*결제중 오류!*\n*처리 요망!*\n{cur_train.to_string()}")
-                                print(e)
-                                exit(1)
-
-                        if not srt.greedy or srt.gotcha == srt.num_trains_to_check:
-                            self.success = True
-                        return
-
-                if srt.want_reserve and not srt.booked[cur_train.hash()] and not srt.reserved[
-                    cur_train.hash()] and "신청하기" in reservation:
-                    self.bot.send_slack_bot_msg(f"*{get_now_str()}{i}번째 순위 예약대기!*\n{cur_train.to_string()}")
-                    srt.reserved[cur_train.hash()] = True
-                    self.reserve_ticket(reservation, i)
-
-            time.sleep(randint(0, 3))
-            self.refresh_result()
+                if booked is False:
+                    # 알 수 없는 화면
+                    on_results = False
+
+            if srt.want_reserve and not srt.booked[cur_train.hash()] and not srt.reserved[
+                cur_train.hash()] and row.is_reservable():
+                if not on_results:
+                    row = self.return_to_results(srt, row)
+                    on_results = True
+                    if row is None or not row.is_reservable():
+                        continue
+                on_results = False
+                self.reserve_ticket(row)
+                self.bot.send_slack_bot_msg(f"*{get_now_str()}{row.idx}번째 순위 예약대기!*\n{cur_train.to_string()}")
+                srt.reserved[cur_train.hash()] = True
+                self.store.record(srt, cur_train.hash(), RESERVED)
+                self.metrics.incr("reserved")
+        # 여기까지 오면 바뀐 행을 모두 처리한 것. 도중에 예외가 나면 다음 새로고침에서 다시 본다
+        tracker.commit()
+
+        if not on_results:
+            # 다음 차례에는 다시 검색
+            self.tabs.mark_unloaded()
+
+    def on_booked(self, srt, row, detected_at):
+        i, cur_train = row.idx, row.train
+        now = time.perf_counter()
+        if self.last_booked_at is not None:
+            # 같은 세션에서 연속 예약 사이 간격
+            self.metrics.record("booking_gap", now - self.last_booked_at)
+        self.last_booked_at = now
+
+        self.metrics.incr("booked")
+        self.bot.send_slack_bot_msg(f"{get_now_str()}\n*{i}번째 순위 예약성공!*\n{cur_train.to_string()}")
+        srt.booked[cur_train.hash()] = True
+        srt.gotcha += 1
+        self.store.record(srt, cur_train.hash(), BOOKED)
+        if self.card.want_checkout:
+            self.pay(cur_train, detected_at)
+
+    def pay(self, cur_train, detected_at, pay_link=PAY_LINK):
+        try:
+            with self.metrics.phase("checkout"):
+                self.checkout_ticket(self.card, cur_train, pay_link)
+            # 좌석을 발견한 결과 표를 읽은 시점부터 결제 완료까지
+            paid_sec = time.perf_counter() - detected_at
+            self.metrics.record("detect_to_paid", paid_sec)
+            self.bot.send_slack_bot_msg(f"{get_now_str()}\n*결제 성공!* ({paid_sec:.2f}초)\n{cur_train.to_string()}")
+        except Exception as e:
+            self.bot.send_slack_bot_msg(
+                f"{get_now_str()}\n*결제중 오류!*\n*처리 요망!*\n{cur_train.to_string()}")
+            print(e)
+            self.recorder.capture(self.driver, "checkout_error", e)
+            exit(1)
+
+    def check_waitlist(self):
+        # 화면은 그대로 두고 예약 내역만 받아서 확정된 예약대기를 찾는다
+        # 부가 기능이므로 실패해도 사이클 에러로 치지 않고 다음 조회 때 다시 한다
+        url = self.base_url + RESERVATION_LIST_PATH
+        self.waitlist.start()
+        try:
+            with self.metrics.phase("waitlist"):
+                final_url, html = fetch_page(self.driver, url)
+        except Exception as e:
+            print(f"예약 내역 조회 실패: {e}")
+            return
+        finally:
+            self.scheduler.on_request()
+        if LOGIN_PATH in final_url:
+            self.session.invalidate_login()
+            print("예약 내역 조회 실패: 로그인 만료")
+            return
+        for srt, row, train in self.waitlist.match(self.targets, parse_reservation_list(html)):
+            self.on_waitlist_confirmed(srt, row, train)
+
+    def on_waitlist_confirmed(self, srt, row, cur_train):
+        detected_at = time.perf_counter()
+        print(f"{srt.label()} 예약대기 확정: {cur_train.to_string()}")
+        self.metrics.incr("booked")
+        self.bot.send_slack_bot_msg(f"{get_now_str()}\n*예약대기 확정!*\n{cur_train.to_string()}")
+        srt.booked[cur_train.hash()] = True
+        srt.gotcha += 1
+        self.store.record(srt, cur_train.hash(), BOOKED)
+        if not srt.greedy or srt.gotcha >= srt.num_trains_to_check:
+            srt.done = True
+            print(f"{srt.label()} 예약 종료")
+        if self.card.want_checkout:
+            # 예약 내역 화면의 그 행에서 결제. 결과 화면은 다음 차례에 다시 검색
+            self.driver.get(self.base_url + RESERVATION_LIST_PATH)
+            self.recorder.note_url(self.base_url + RESERVATION_LIST_PATH)
+            self.tabs.mark_unloaded()
+            self.pay(cur_train, detected_at, reservation_pay_link(row.idx))
+
+    def return_to_results(self, srt, row):
+        # 같은 세션에서 다시 검색해서 결과 표로 돌아온 뒤, 같은 기차의 현재 행을 찾는다
+        with self.metrics.phase("research"):
+            self.go_search(srt)
+            _, rows = read_result_rows(self.driver, srt.dpt_dt, srt.row_limit())
+        key = row.train.hash()
+        return next((r for r in rows if r.train.hash() == key), None)
@@ -0,0 +1,121 @@
+import glob
+import os
+import socket
+
+from selenium.webdriver.chrome.options import Options
+
+from srt_reservation.procstat import user_data_dirs
+
+DEFAULT_PROFILE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "profile")
+
+USER_AGENT = "Mozilla/5.0 (X11; CrOS x86_64 14541.0.0) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36"
+
+# lean 모드에서 요청 자체를 막는 리소스 (이미지/폰트/미디어/외부 분석·광고 스크립트)
+# CSS 는 요소 표시 여부(클릭 가능 여부)에 영향을 주므로 막지 않는다.
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.ogg",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*",
+    "*facebook.net*", "*facebook.com/tr*", "*naver.net/wcslog*", "*wcs.naver.com*",
+    "*kakao.com*", "*criteo*", "*youtube.com*",
+]
+
+
+class ProfileInUse(Exception):
+    pass
+
+
+def lock_owner(profile_dir):
+    # SingletonLock 은 "호스트이름-pid" 를 가리키는 심볼릭 링크. 없거나 형식이 다르면 None
+    try:
+        target = os.readlink(os.path.join(profile_dir, "SingletonLock"))
+    except OSError:
+        return None
+    host, _, pid = target.rpartition("-")
+    return (host, int(pid)) if pid.isdigit() else None
+
+
+def is_profile_running(profile_dir, host, pid):
+    """잠금을 잡은 Chrome 이 아직 이 프로필로 떠 있는지"""
+    if host != socket.gethostname():
+        # 다른 호스트(재시작된 컨테이너 등)가 남긴 잠금은 확인할 수 없으므로 남은 것으로 본다
+        return False
+    if os.path.isdir("/proc"):
+        # pid 가 다른 프로세스에 재사용됐을 수 있으므로 --user-data-dir 까지 확인
+        own = os.path.realpath(profile_dir)
+        return any(os.path.realpath(d) == own for d in user_data_dirs([pid]))
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class BrowserProfile:
+    def __init__(self, lean=False, profile_dir=None, cache_mb=32, renderer_mb=256, chrome_path=None):
+        self.lean = lean
+        self.chrome_path = chrome_path or os.getenv("CHROME_PATH")
+        self.profile_dir = profile_dir or DEFAULT_PROFILE_DIR
+        self.cache_mb = cache_mb
+        self.renderer_mb = renderer_mb
+
+    def build_options(self):
+        chrome_options = Options()
+        if self.chrome_path:
+            chrome_options.binary_location = self.chrome_path
+        if not self.lean:
+            return chrome_options
+
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-gpu")
+        chrome_options.add_argument("--window-size=1280,1024")
+        chrome_options.add_argument("--lang=ko_KR")
+        chrome_options.add_argument(f"--user-agent={USER_AGENT}")
+
+        # 재사용 가능한 디스크 프로필 + 크기 제한 캐시
+        os.makedirs(self.profile_dir, exist_ok=True)
+        self.clear_stale_locks()
+        chrome_options.add_argument(f"--user-data-dir={self.profile_dir}")
+        chrome_options.add_argument(f"--disk-cache-size={self.cache_mb * 1024 * 1024}")
+
+        # 렌더러 메모리/프로세스 제한, 불필요한 백그라운드 작업 끄기
+        chrome_options.add_argument(f"--js-flags=--max-old-space-size={self.renderer_mb}")
+        chrome_options.add_argument("--renderer-process-limit=1")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--disable-default-apps")
+        chrome_options.add_argument("--disable-sync")
+        chrome_options.add_argument("--disable-dev-shm-usage")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.default_content_setting_values.notifications": 2,
+        })
+        return chrome_options
+
+    def clear_stale_locks(self):
+        # 비정상 종료된 Chrome 이 남긴 잠금 파일이 있으면 같은 프로필로 다시 뜨지 못한다.
+        # 다른 프로세스의 Chrome 이 쓰고 있는 프로필이면 지우지 않고 멈춘다 (같이 쓰면 프로필이 깨진다)
+        owner = lock_owner(self.profile_dir)
+        if owner is not None and is_profile_running(self.profile_dir, *owner):
+            raise ProfileInUse(f"다른 Chrome(pid {owner[1]})이 쓰고 있는 프로필입니다. "
+                               f"--profile_dir 를 따로 지정하세요: {self.profile_dir}")
+        for path in glob.glob(os.path.join(self.profile_dir, "Singleton*")):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def apply(self, driver):
+        if not self.lean:
+            return
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
+        except Exception as e:
+            print(f"리소스 차단 설정 실패: {e}")
@@ -2,7 +2,7 @@ import os
 from datetime import datetime
 
 class Card:
-    def __init__(self, card_filename):
+    def __init__(self, card_filename, strict=False):
         self.want_checkout = False
         if card_filename == "None":
             return
@@ -16,13 +16,18 @@ class Card:
                 self.pw = f.readline().strip()
                 self.my_number = f.readline().strip()
             self.validate()
+            self.payment_fields = self.format_fields()
             self.want_checkout = True
-        except:
-            pass
+        except Exception as e:
+            # strict 이면 결제 정보 오류를 조용히 넘기지 않는다
+            if strict:
+                raise Exception(f"카드 정보 오류 ({card_filename}): {e}")
         
     def validate(self):
         if len(self.card_numbers) != 4:
             raise Exception(f"Invalid card numbers. Should be 4 sets but {len(self.card_numbers)}")
+        if not all(n.isdigit() for n in self.card_numbers):
+            raise Exception(f"Card numbers should be number {'-'.join(self.card_numbers)}")
         
         if not 1 <= int(self.valid_mon) <= 12:
             raise Exception(f"Invalid card validate month {self.valid_mon}")
@@ -44,4 +49,13 @@ class Card:
         try:
             int(self.my_number)
         except:
-            raise Exception(f"My number should be number {self.my_number}")
\ No newline at end of file
+            raise Exception(f"My number should be number {self.my_number}")
+
+    def format_fields(self):
+        # 결제 페이지 입력칸 id -> 값. 월/년은 select 의 value 형식(두 자리)으로 맞춘다
+        fields = {f"stlCrCrdNo1{i}": n for i, n in enumerate(self.card_numbers, start=1)}
+        fields["crdVlidTrm1M"] = f"{int(self.valid_mon):02d}"
+        fields["crdVlidTrm1Y"] = f"{int(self.valid_year) % 100:02d}"
+        fields["vanPwd1"] = self.pw
+        fields["athnVal1"] = self.my_number
+        return fields
@@ -0,0 +1,43 @@
+# 결제 페이지 입력. Card.payment_fields 는 시작할 때 한 번 만들어 두고 여기서는 그대로 넣기만 한다.
+
+from srt_reservation.locators import KEYPAD_TOGGLE_IDS, SMARTPHONE_TAB_SELECTOR
+
+# 한 번의 execute_script 로 보안키패드를 끄고 카드 정보를 모두 넣는다.
+# 체크박스는 예전처럼 상태와 관계없이 한 번씩 누르므로 결제 페이지마다 한 번만 실행한다.
+# 못 찾은 칸(또는 select 에 없는 값)과 스마트폰 발권 탭이 이미 선택되어 있는지를 돌려준다.
+FILL_PAYMENT_FORM_JS = """
+var values = arguments[0], toggles = arguments[1];
+var missing = [];
+for (var i = 0; i < toggles.length; i++) {
+    var cb = document.getElementById(toggles[i]);
+    if (cb === null) { missing.push(toggles[i]); continue; }
+    cb.click();
+}
+for (var id in values) {
+    var el = document.getElementById(id);
+    if (el === null) { missing.push(id); continue; }
+    el.value = values[id];
+    if (el.value !== values[id]) { missing.push(id); continue; }
+    ["input", "keyup", "change"].forEach(function (type) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    });
+}
+var tab = document.querySelector(arguments[2]);
+var selected = tab !== null && (/(^|\\s)(on|active|selected)(\\s|$)/.test(tab.className)
+    || tab.getAttribute("aria-selected") === "true");
+return {missing: missing, smartphone: selected};
+"""
+
+
+class CheckoutError(Exception):
+    pass
+
+
+def fill_payment_form(driver, card):
+    """카드 정보를 한 번에 넣는다. 스마트폰 발권 탭이 이미 선택되어 있으면 True"""
+    res = driver.execute_script(FILL_PAYMENT_FORM_JS, card.payment_fields, KEYPAD_TOGGLE_IDS,
+                                SMARTPHONE_TAB_SELECTOR) or {}
+    missing = res.get("missing", [])
+    if missing:
+        raise CheckoutError(f"결제 페이지 입력 실패: {', '.join(missing)}")
+    return bool(res.get("smartphone"))
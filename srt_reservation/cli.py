@@ -0,0 +1,97 @@
+import argparse
+
+from srt_reservation.slackbot import SLACK_API_URL
+from srt_reservation.introspect import DEFAULT_INTROSPECT_DIR, PROFILE_SEC
+from srt_reservation.recorder import DEFAULT_RECORDER_DIR
+from srt_reservation.startup import DEFAULT_DRIVER_CACHE
+from srt_reservation.timetable import DEFAULT_TIMETABLE_FILE
+from srt_reservation.state import DEFAULT_STATE_FILE
+
+
+def str2bool(value):
+    # type=bool 은 "False" 도 True 로 읽으므로 새 플래그는 이것을 쓴다
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes", "y", "on"):
+        return True
+    if text in ("false", "0", "no", "n", "off"):
+        return False
+    raise argparse.ArgumentTypeError(f"true/false 중 하나여야 합니다: {value}")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='')
+
+    parser.add_argument("--user", help="Username", type=str, metavar="1234567890")
+    parser.add_argument("--psw", help="Password", type=str, metavar="abc1234")
+    parser.add_argument("--dpt", help="Departure Station", type=str, metavar="동탄")
+    parser.add_argument("--arr", help="Arrival Station", type=str, metavar="동대구")
+    parser.add_argument("--dt", help="Departure Date", type=str, metavar="20220118")
+    parser.add_argument("--tm", help="Departure Time", type=str, metavar="08, 10, 12, ...", default="00")
+    parser.add_argument("--num", help="num of trains to check", type=int, metavar="2", default=2)
+    parser.add_argument("--adult", help="num of adults", type=int, metavar="1", default=1)
+    parser.add_argument("--kid", help="num of kids", type=int, metavar="2", default=0)
+    parser.add_argument("--elder", help="num of elders", type=int, metavar="2", default=0)
+
+    parser.add_argument("--exact_times", help="Exact Times", type=str, metavar="", default="")
+    parser.add_argument("--time_windows", help="Departure time windows", type=str, metavar="08:00-10:00,18:00-20:00", default="")
+    parser.add_argument("--trains", help="Only these train numbers", type=str, metavar="301,303", default="")
+    parser.add_argument("--exclude_trains", help="Skip these train numbers", type=str, metavar="305", default="")
+    parser.add_argument("--max_dpt_tm", help="Latest departure time", type=str, metavar="12:00", default="")
+    parser.add_argument("--max_arr_tm", help="Latest arrival time", type=str, metavar="14:00", default="")
+    parser.add_argument("--slack", help="token_info channel_info", type=str, metavar="my_token.txt my_channel.txt", default="None None")
+    parser.add_argument("--slack_api", help="Slack chat.postMessage url", type=str, metavar=SLACK_API_URL, default=SLACK_API_URL)
+    parser.add_argument("--checkout", help="checkout_info", type=str, metavar="my_card.txt", default="None")
+    parser.add_argument("--reserve", help="Reserve or not", type=bool, metavar="false", default=False)
+    parser.add_argument("--greedy", help="Greedy or not", type=bool, metavar="false", default=False)
+
+    parser.add_argument("--metrics_sec", help="Metrics summary interval (sec, 0 to disable)", type=int, metavar="60", default=60)
+    parser.add_argument("--metrics_log", help="Metrics JSON-lines file", type=str, metavar="metrics.jsonl", default="None")
+    parser.add_argument("--metrics_slack", help="Send metrics summary to slack", type=str2bool, metavar="false", default=False)
+
+    parser.add_argument("--base_url", help="SRT site base url", type=str, metavar="https://etk.srail.kr", default="https://etk.srail.kr")
+
+    parser.add_argument("--lean", help="Headless, resource-trimmed browser", type=str2bool, metavar="false", default=False)
+    parser.add_argument("--profile_dir", help="Chrome profile dir for lean mode", type=str, metavar="~/.cache/srt_reservation/profile", default="None")
+    parser.add_argument("--cache_mb", help="Disk cache size of lean profile (MB)", type=int, metavar="32", default=32)
+    parser.add_argument("--renderer_mb", help="JS heap cap of renderer (MB)", type=int, metavar="256", default=256)
+
+    parser.add_argument("--http_poll", help="Poll search results over HTTP instead of the browser", type=str2bool, metavar="false", default=False)
+
+    parser.add_argument("--poll_min", help="Min seconds between refreshes", type=float, metavar="0", default=0)
+    parser.add_argument("--poll_max", help="Max seconds between refreshes", type=float, metavar="3", default=3)
+    parser.add_argument("--poll_profile", help="Time-window poll profile json", type=str, metavar="poll_profile.json", default="None")
+    parser.add_argument("--max_backoff", help="Max seconds between refreshes while backing off", type=float, metavar="60", default=60)
+
+    parser.add_argument("--targets", help="Search targets json (list of dpt/arr/dt/tm/... overrides)", type=str, metavar="targets.json", default="None")
+    parser.add_argument("--tabs", help="Max browser tabs shared by targets", type=int, metavar="1", default=1)
+
+    parser.add_argument("--timetable", help="Timetable cache db (None to disable)", type=str, metavar=DEFAULT_TIMETABLE_FILE, default=DEFAULT_TIMETABLE_FILE)
+    parser.add_argument("--state_file", help="Hunt state db (None to disable)", type=str, metavar=DEFAULT_STATE_FILE, default=DEFAULT_STATE_FILE)
+    parser.add_argument("--reset_state", help="Forget saved bookings/waitlists of these targets before starting", type=str2bool, metavar="false", default=False)
+
+    parser.add_argument("--supervise", help="Run under the in-process supervisor", type=str2bool, metavar="false", default=False)
+    parser.add_argument("--max_browser_mb", help="Recycle browser above this RSS (MB, 0 to disable)", type=int, metavar="1500", default=1500)
+    parser.add_argument("--max_growth_mb", help="Recycle browser after this RSS growth (MB, 0 to disable)", type=int, metavar="600", default=600)
+    parser.add_argument("--max_bot_mb", help="Exit for restart above this python RSS (MB, 0 to disable)", type=int, metavar="500", default=500)
+    parser.add_argument("--hang_sec", help="Kill browser when no cycle finishes for this long", type=int, metavar="300", default=300)
+    parser.add_argument("--max_cpu_pct", help="Recycle browser when CPU stays above this", type=float, metavar="95", default=95)
+    parser.add_argument("--check_sec", help="Supervisor check interval", type=int, metavar="10", default=10)
+
+    parser.add_argument("--recorder_dir", help="Flight recorder dump dir (None to disable)", type=str, metavar=DEFAULT_RECORDER_DIR, default=DEFAULT_RECORDER_DIR)
+    parser.add_argument("--recorder_cycles", help="Recent cycles kept in memory", type=int, metavar="200", default=200)
+    parser.add_argument("--recorder_mb", help="Max size of recorder dir (MB)", type=int, metavar="50", default=50)
+    parser.add_argument("--slow_cycle_sec", help="Dump recorder when a cycle takes this long (0 to disable)", type=float, metavar="10", default=10)
+
+    parser.add_argument("--waitlist_poll_sec", help="Check applied waitlists on the reservation list every N seconds (0 to disable)", type=int, metavar="60", default=60)
+    parser.add_argument("--shape_check_sec", help="Re-check result page structure every N seconds (0: only after search)", type=int, metavar="300", default=300)
+
+    parser.add_argument("--introspect_dir", help="Status/profile dump dir for SIGUSR1/SIGUSR2 (None to disable signals)", type=str, metavar=DEFAULT_INTROSPECT_DIR, default=DEFAULT_INTROSPECT_DIR)
+    parser.add_argument("--profile_sec", help="Seconds of check_result profiling per SIGUSR2", type=int, metavar="30", default=PROFILE_SEC)
+
+    parser.add_argument("--driver_cache", help="Resolved chromedriver/Chrome cache (None to disable)", type=str, metavar=DEFAULT_DRIVER_CACHE, default=DEFAULT_DRIVER_CACHE)
+
+    return parser
+
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
@@ -0,0 +1,433 @@
+"""
+여러 검색(hunt)을 한 프로세스에서 정해진 수의 브라우저 worker 로 돌린다.
+검색마다 Chrome 을 하나씩 띄우지 않고, 같은 계정의 검색은 이미 로그인된 worker 의
+SRThunter 에 검색 목표로 추가한다. 전체 요청 수는 --budget_per_min 을 모든 worker 가 나눠 쓴다.
+제어는 UNIX 소켓(JSON 한 줄 요청/응답)으로 한다.
+
+    python -m srt_reservation.daemon serve --mem_limit_mb 4000 --budget_per_min 60
+    python -m srt_reservation.daemon submit --user 1234567890 --psw 000000 --dpt 동탄 --arr 동대구 --dt 20220117 --tm 08
+    python -m srt_reservation.daemon list
+    python -m srt_reservation.daemon cancel 3
+    python -m srt_reservation.daemon status
+    python -m srt_reservation.daemon profile 30
+
+submit 인자는 quickstart.py 와 같다. dpt/arr/dt/tm/num/필터/reserve/greedy 는 검색마다 따로 쓰고,
+브라우저/Slack/결제 설정은 그 계정으로 worker 를 처음 띄운 검색의 값을 쓴다.
+"""
+import argparse
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+from datetime import datetime
+
+from srt_reservation.browser import DEFAULT_PROFILE_DIR
+from srt_reservation.cli import build_parser
+from srt_reservation.introspect import hunter_status
+from srt_reservation.procstat import mem_available_mb
+from srt_reservation.scheduler import RateBudget
+from srt_reservation.startup import DEFAULT_DRIVER_CACHE, check_args, resolve_binaries
+from srt_reservation.targets import load_targets
+
+DEFAULT_SOCKET = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "daemon.sock")
+WORKER_MB = 600  # 브라우저 worker 하나가 쓰는 메모리 추정치 (Chrome 트리 + SRThunter)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+FAILED = "failed"
+
+
+def auto_workers(mem_limit_mb, worker_mb=WORKER_MB, cpu_limit=None):
+    # 메모리 한도 안에 들어가는 브라우저 수와 CPU 수 중 작은 쪽
+    cpu_limit = cpu_limit or os.cpu_count() or 1
+    return max(1, min(mem_limit_mb // worker_mb, cpu_limit))
+
+
+class Job:
+    def __init__(self, no, argv, cli_args, targets):
+        self.no = no
+        self.argv = argv
+        self.cli_args = cli_args
+        self.targets = targets  # SRT 목록. worker 의 SRThunter 가 그대로 사용
+        self.account = cli_args.user
+        self.state = QUEUED
+        self.worker = None
+        self.error = None
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+
+    def refresh(self):
+        if self.state == RUNNING and all(srt.done for srt in self.targets):
+            self.state = DONE
+
+    def to_dict(self):
+        return {
+            "id": self.no,
+            "state": self.state,
+            "worker": self.worker,
+            "account": f"***{self.account[-4:]}",
+            "created_at": self.created_at,
+            "targets": [{"label": srt.label(), "gotcha": srt.gotcha, "done": srt.done} for srt in self.targets],
+            "error": self.error,
+        }
+
+
+class Worker(threading.Thread):
+    """브라우저 하나. 한 번에 한 계정만 로그인하고, 그 계정의 검색 목표를 모두 돌린다."""
+
+    def __init__(self, owner, no):
+        super().__init__(name=f"worker-{no}", daemon=True)
+        self.owner = owner
+        self.no = no
+        self.hunter = None
+        self.account = None
+        self.pending = []  # 아직 시작하지 않은 Job
+        self.jobs = []
+
+    def has_active(self):
+        return self.hunter is not None and any(not srt.done for srt in self.hunter.targets)
+
+    def is_idle(self):
+        return not self.pending and not self.has_active()
+
+    def run(self):
+        while True:
+            jobs = self.owner.take_jobs(self)
+            if jobs is None:
+                break
+            for job in jobs:
+                self.start_job(job)
+            if not self.has_active():
+                continue
+            try:
+                self.hunter.run()
+            except BaseException as e:
+                # 결제 오류의 exit(1) 등. 이 worker 의 검색만 실패 처리하고 브라우저를 새로 띄운다
+                print(f"worker-{self.no} 오류: {e!r}")
+                self.owner.fail_worker(self, e)
+                self.close_hunter()
+
+    def start_job(self, job):
+        try:
+            if self.hunter is not None and self.account != job.account:
+                self.close_hunter()
+            if self.hunter is None:
+                from srt_reservation.SRThunter import SRThunter
+                self.hunter = SRThunter(self.worker_args(job.cli_args), self.owner.binaries, self.owner.budget,
+                                        job.targets)
+                self.account = job.account
+            else:
+                for srt in job.targets:
+                    self.hunter.add_target(srt)
+            self.owner.on_started(self, job)
+        except Exception as e:
+            print(f"worker-{self.no} 검색 시작 실패: {e}")
+            self.owner.on_failed(job, e)
+
+    def worker_args(self, cli_args):
+        # --lean 프로필은 worker 마다 따로 쓴다. 같은 프로필로 Chrome 두 개가 뜨면 프로필이 깨진다
+        args = argparse.Namespace(**vars(cli_args))
+        base = DEFAULT_PROFILE_DIR if cli_args.profile_dir == "None" else cli_args.profile_dir
+        args.profile_dir = os.path.join(base, f"worker-{self.no}")
+        return args
+
+    def close_hunter(self):
+        hunter, self.hunter, self.account = self.hunter, None, None
+        self.jobs = []
+        if hunter is not None:
+            try:
+                hunter.close()
+            except Exception as e:
+                print(e)
+
+    def stop(self):
+        if self.hunter is not None:
+            self.hunter.stop()
+
+
+class HuntDaemon:
+    def __init__(self, workers, budget_per_min, binaries):
+        self.binaries = binaries
+        self.budget = RateBudget(budget_per_min)
+        self.cond = threading.Condition()
+        self.jobs = dict()
+        self.queue = []  # 빈 worker 를 기다리는 Job
+        self.cnt_job = 0
+        self.stopped = False
+        self.workers = [Worker(self, no) for no in range(workers)]
+
+    def start(self):
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def handle(self, req):
+        cmd = req.get("cmd")
+        if cmd == "submit":
+            return self.submit(req.get("argv", []))
+        if cmd == "list":
+            return self.list()
+        if cmd == "cancel":
+            return self.cancel(int(req.get("id", -1)))
+        if cmd == "status":
+            return self.status()
+        if cmd == "profile":
+            return self.profile(int(req.get("sec", 0)))
+        return {"ok": False, "error": f"알 수 없는 명령 {cmd}"}
+
+    def submit(self, argv):
+        try:
+            cli_args = parse_job_args(argv)
+        except ValueError as e:
+            return {"ok": False, "error": str(e)}
+        errors = check_args(cli_args)
+        if errors:
+            return {"ok": False, "error": "\n".join(errors)}
+        targets = load_targets(cli_args)
+        with self.cond:
+            self.cnt_job += 1
+            job = Job(self.cnt_job, argv, cli_args, targets)
+            self.jobs[job.no] = job
+            self.queue.append(job)
+            self.dispatch()
+            return {"ok": True, "job": job.to_dict()}
+
+    def list(self):
+        with self.cond:
+            for job in self.jobs.values():
+                job.refresh()
+            return {"ok": True, "jobs": [job.to_dict() for job in self.jobs.values()],
+                    "workers": [{"no": w.no, "account": None if w.account is None else f"***{w.account[-4:]}",
+                                 "active": w.has_active()} for w in self.workers],
+                    "budget": self.budget.gauge()}
+
+    def cancel(self, no):
+        with self.cond:
+            job = self.jobs.get(no)
+            if job is None:
+                return {"ok": False, "error": f"없는 검색 {no}"}
+            job.refresh()
+            if job.state == QUEUED:
+                self.queue.remove(job)
+            elif job.state == RUNNING:
+                # worker 는 done 인 목표를 더 이상 조회하지 않는다
+                for srt in job.targets:
+                    srt.done = True
+            else:
+                return {"ok": False, "error": f"이미 끝난 검색 {no} ({job.state})"}
+            job.state = CANCELLED
+            self.cond.notify_all()
+            return {"ok": True, "job": job.to_dict()}
+
+    def status(self):
+        # worker 별 SRThunter 상태 (SIGUSR1 출력과 같은 내용)
+        workers = []
+        for worker in self.workers:
+            hunter = worker.hunter
+            workers.append({"no": worker.no, "status": None if hunter is None else hunter_status(hunter)})
+        return {"ok": True, "workers": workers}
+
+    def profile(self, sec):
+        # 실행 중인 모든 worker 의 check_result 를 sec 초 동안 잰다. 파일은 각자 --introspect_dir 에 저장
+        started = []
+        for worker in self.workers:
+            hunter = worker.hunter
+            if hunter is not None:
+                hunter.profiler.request(sec or None)
+                started.append(worker.no)
+        return {"ok": True, "workers": started}
+
+    def dispatch(self):
+        # cond 를 잡은 상태에서 호출. 같은 계정 worker 우선, 없으면 일이 없는 worker
+        for job in list(self.queue):
+            worker = self.pick_worker(job.account)
+            if worker is None:
+                continue
+            self.queue.remove(job)
+            job.worker = worker.no
+            if worker.hunter is not None and worker.account == job.account:
+                # 이미 로그인된 세션에 바로 추가. hunt() 가 다음 차례에 함께 돈다
+                try:
+                    for srt in job.targets:
+                        worker.hunter.add_target(srt)
+                    self.on_started(worker, job)
+                except Exception as e:
+                    self.on_failed(job, e)
+            else:
+                worker.pending.append(job)
+        self.cond.notify_all()
+
+    def pick_worker(self, account):
+        for worker in self.workers:
+            if worker.account == account and (worker.has_active() or worker.pending):
+                return worker
+        for worker in self.workers:
+            if worker.account == account and worker.is_idle():
+                return worker
+        for worker in self.workers:
+            if worker.is_idle() and not any(job.account != account for job in worker.pending):
+                return worker
+        return None
+
+    def take_jobs(self, worker):
+        # worker 스레드에서 호출. 새 Job 이나 남은 목표가 생길 때까지 기다린다
+        with self.cond:
+            while not self.stopped and not worker.pending and not worker.has_active():
+                for job in worker.jobs:
+                    job.refresh()
+                # 일이 끝난 worker 에 대기 중인 다른 계정을 넣는다
+                self.dispatch()
+                if worker.pending or worker.has_active():
+                    break
+                self.cond.wait(1)
+            if self.stopped:
+                return None
+            jobs, worker.pending = worker.pending, []
+            return jobs
+
+    def on_started(self, worker, job):
+        with self.cond:
+            job.state = RUNNING
+            worker.jobs.append(job)
+
+    def on_failed(self, job, error):
+        with self.cond:
+            job.state = FAILED
+            job.error = str(error)
+
+    def fail_worker(self, worker, error):
+        with self.cond:
+            for job in worker.jobs:
+                job.refresh()
+                if job.state == RUNNING:
+                    job.state = FAILED
+                    job.error = repr(error)
+                    for srt in job.targets:
+                        srt.done = True
+
+    def stop(self):
+        with self.cond:
+            self.stopped = True
+            self.cond.notify_all()
+        for worker in self.workers:
+            worker.stop()
+        for worker in self.workers:
+            worker.join(30)
+            worker.close_hunter()
+
+
+def parse_job_args(argv):
+    """검색 요청의 인자. argparse 는 잘못된 인자면 SystemExit 을 던지므로 ValueError 로 바꾼다"""
+    parser = build_parser()
+
+    def error(message):
+        raise ValueError(f"인자 오류: {message}")
+
+    parser.error = error
+    try:
+        return parser.parse_args(argv)
+    except SystemExit:
+        # --help 등
+        raise ValueError(f"인자 오류: 검색을 시작하지 않는 인자 {argv}")
+
+
+class ControlHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            res = self.server.owner.handle(json.loads(self.rfile.readline()))
+        except Exception as e:
+            res = {"ok": False, "error": repr(e)}
+        self.wfile.write((json.dumps(res, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class ControlServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path, owner):
+        self.owner = owner
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        if os.path.exists(path):
+            # 이전 daemon 이 남긴 소켓. 살아있는 daemon 이면 연결된다
+            try:
+                request(path, {"cmd": "list"})
+                raise Exception(f"이미 실행 중인 daemon 이 있습니다. {path}")
+            except OSError:
+                os.remove(path)
+        old_umask = os.umask(0o177)  # 소켓은 본인만 접근
+        try:
+            super().__init__(path, ControlHandler)
+        finally:
+            os.umask(old_umask)
+
+
+def request(path, req):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as s:
+        s.connect(path)
+        s.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
+        data = b""
+        while not data.endswith(b"\n"):
+            chunk = s.recv(65536)
+            if not chunk:
+                break
+            data += chunk
+    return json.loads(data)
+
+
+def serve(args):
+    if args.budget_per_min <= 0:
+        print(f"--budget_per_min 은 0보다 커야 합니다: {args.budget_per_min}")
+        return 2
+    mem_limit_mb = args.mem_limit_mb or int((mem_available_mb() or WORKER_MB) * 0.8)
+    workers = args.workers or auto_workers(mem_limit_mb, args.worker_mb, args.cpu_limit)
+    binaries = resolve_binaries(None if args.driver_cache == "None" else args.driver_cache)
+    owner = HuntDaemon(workers, args.budget_per_min, binaries).start()
+    server = ControlServer(args.socket, owner)
+    print(f"daemon 시작: worker {workers}개 (메모리 한도 {mem_limit_mb}MB), 분당 요청 {args.budget_per_min}회, {args.socket}")
+
+    def shutdown(signum, frame):
+        threading.Thread(target=server.shutdown, daemon=True).start()
+
+    signal.signal(signal.SIGTERM, shutdown)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.remove(args.socket)
+        owner.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='SRT hunt daemon')
+    parser.add_argument("command", choices=["serve", "submit", "list", "cancel", "status", "profile"])
+    parser.add_argument("--socket", help="Control socket path", type=str, default=DEFAULT_SOCKET)
+    parser.add_argument("--workers", help="Browser workers (0: from cpu/memory limits)", type=int, default=0)
+    parser.add_argument("--mem_limit_mb", help="Memory for all workers (0: 80%% of MemAvailable)", type=int, default=0)
+    parser.add_argument("--worker_mb", help="Estimated memory per worker (MB)", type=int, default=WORKER_MB)
+    parser.add_argument("--cpu_limit", help="Max workers by cpu (0: cpu count)", type=int, default=0)
+    parser.add_argument("--budget_per_min", help="Search requests per minute shared by all workers", type=float, default=60)
+    parser.add_argument("--driver_cache", type=str, default=DEFAULT_DRIVER_CACHE)
+    args, rest = parser.parse_known_args()
+
+    if args.command == "serve":
+        sys.exit(serve(args))
+
+    if args.command == "submit":
+        req = {"cmd": "submit", "argv": rest}
+    elif args.command == "cancel":
+        req = {"cmd": "cancel", "id": rest[0] if rest else -1}
+    elif args.command == "status":
+        req = {"cmd": "status"}
+    elif args.command == "profile":
+        req = {"cmd": "profile", "sec": rest[0] if rest else 0}
+    else:
+        req = {"cmd": "list"}
+    res = request(args.socket, req)
+    print(json.dumps(res, ensure_ascii=False, indent=2))
+    sys.exit(0 if res.get("ok") else 1)
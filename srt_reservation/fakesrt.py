@@ -0,0 +1,442 @@
+"""
+벤치마크/소크 테스트용 로컬 SRT 흉내 서버.
+로그인, 조회, 결과 표, 잔여석 없음, 예약 성공(#isFalseGotoMain), 결제, alert 페이지를
+SRThunter 가 쓰는 셀렉터 그대로 재현한다. 좌석이 열리는 시점은 시나리오로 정한다.
+
+    python -m srt_reservation.fakesrt --port 8080 --scenario scenario.json
+"""
+import argparse
+import html
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+LOGIN_PATH = "/cmc/01/selectLoginForm.do"
+LOGIN_SUBMIT_PATH = "/cmc/01/selectLoginInfo.do"
+SEARCH_PATH = "/hpg/hra/01/selectScheduleList.do"
+BOOK_PATH = "/hpg/hra/02/confirmReservationInfo.do"
+WAIT_PATH = "/hpg/hra/02/requestReservationWait.do"
+PAYMENT_PATH = "/hpg/hra/02/requestPayment.do"
+PAID_PATH = "/hpg/hra/02/completePayment.do"
+RESERVATION_LIST_PATH = "/hpg/hra/02/selectReservationList.do"
+STATS_PATH = "/__stats"
+SLACK_PATH = "/api/chat.postMessage"  # SlackBot(api_url=...) 테스트용
+
+SESSION_COOKIE = "JSESSIONID"
+
+DEFAULT_SCENARIO = {
+    "dpt": "수서",
+    "arr": "부산",
+    "num_trains": 10,
+    "first_dpt": "06:00",
+    "interval_min": 30,
+    "duration_min": 150,
+    # open_at: 몇 번째 조회 결과부터 열리는지, open_for: 몇 번의 조회 동안 유지되는지 (0 이면 예약될 때까지)
+    # kind: seat(일반실 예약하기), waitlist(예약대기 신청하기), confirm(신청한 예약대기가 open_at 번째 조회부터 결제대기로 확정)
+    "events": [{"row": 3, "open_at": 5, "open_for": 0, "kind": "seat"}],
+    "alert_every": 0,  # N번째 조회마다 alert 삽입 (0 이면 없음)
+    "session_ttl_sec": 0,  # 로그인 세션 만료 시간 (0 이면 만료 없음)
+}
+
+
+def load_scenario(path=None):
+    scenario = dict(DEFAULT_SCENARIO)
+    if path:
+        with open(path, "r") as f:
+            scenario.update(json.load(f))
+    return scenario
+
+
+def build_trains(scenario):
+    trains = scenario.get("trains")
+    if trains:
+        return trains
+    trains = []
+    first = datetime.strptime(scenario["first_dpt"], "%H:%M")
+    for i in range(scenario["num_trains"]):
+        dpt = first + timedelta(minutes=scenario["interval_min"] * i)
+        arr = dpt + timedelta(minutes=scenario["duration_min"])
+        trains.append({"type": "SRT", "num": str(301 + i * 2), "dpt": dpt.strftime("%H:%M"), "arr": arr.strftime("%H:%M")})
+    return trains
+
+
+class FakeSRTState:
+    def __init__(self, scenario):
+        self.scenario = scenario
+        self.trains = build_trains(scenario)
+        self.lock = threading.Lock()
+        self.sessions = dict()  # session id -> 로그인 시각
+        self.cnt_search = 0
+        self.cnt_login = 0
+        self.cnt_book_try = 0
+        self.cnt_sold_out = 0
+        self.cnt_paid = 0
+        self.cnt_waitlist = 0
+        self.cnt_reservation_list = 0
+        self.booked_rows = set()
+        self.waitlisted_rows = set()
+        self.row_dates = dict()  # row -> 예약/예약대기한 출발 날짜 (예약 내역용)
+        self.first_login_at = None  # 첫 로그인 / 첫 조회 결과 응답 시각 (시작 시간 측정용)
+        self.first_search_at = None
+        self.first_open_served = dict()  # row -> 좌석이 열린 표를 처음 내려준 시각
+        self.book_requested = dict()  # row -> 예약하기 요청 시각
+        self.booked_at = dict()  # row -> 예약 성공 페이지 응답 시각
+        self.paid_at = dict()
+        self.slack_messages = []
+
+    def is_open(self, row, kind, search_no):
+        for ev in self.scenario["events"]:
+            if ev["row"] != row or ev.get("kind", "seat") != kind:
+                continue
+            if search_no < ev["open_at"]:
+                continue
+            if ev.get("open_for", 0) and search_no >= ev["open_at"] + ev["open_for"]:
+                continue
+            if kind == "seat" and row in self.booked_rows:
+                continue
+            if kind == "waitlist" and row in self.waitlisted_rows:
+                continue
+            return True
+        return False
+
+    def confirm_waitlist(self):
+        # 예약대기 확정 이벤트. 확정된 행은 결제대기(booked_rows)로 옮긴다
+        for ev in self.scenario["events"]:
+            row = ev["row"]
+            if ev.get("kind") == "confirm" and row in self.waitlisted_rows and self.cnt_search >= ev["open_at"]:
+                self.waitlisted_rows.discard(row)
+                self.booked_rows.add(row)
+                self.booked_at.setdefault(row, time.time())
+
+    def stats(self):
+        with self.lock:
+            return {
+                "searches": self.cnt_search,
+                "logins": self.cnt_login,
+                "book_tries": self.cnt_book_try,
+                "sold_out": self.cnt_sold_out,
+                "paid": self.cnt_paid,
+                "waitlisted": self.cnt_waitlist,
+                "reservation_lists": self.cnt_reservation_list,
+                "booked_rows": sorted(self.booked_rows),
+                "first_open_served": {str(k): v for k, v in self.first_open_served.items()},
+                "book_requested": {str(k): v for k, v in self.book_requested.items()},
+                "booked_at": {str(k): v for k, v in self.booked_at.items()},
+                "paid_at": {str(k): v for k, v in self.paid_at.items()},
+                "slack_messages": len(self.slack_messages),
+                "first_login_at": self.first_login_at,
+                "first_search_at": self.first_search_at,
+            }
+
+
+def page(body, logged_in, script=""):
+    menu = "<div>홍길동님 환영합니다 <a href='/logout'>로그아웃</a></div>" if logged_in else "<div><a href='%s'>로그인</a></div>" % LOGIN_PATH
+    return f"""<!DOCTYPE html><html lang="ko"><head><meta charset="utf-8"><title>SRT</title></head>
+<body><div id="wrap">
+<div class="header header-e"><div class="global clear">{menu}</div></div>
+<div class="container container-e">{body}</div>
+</div>{script}</body></html>"""
+
+
+def login_form():
+    return f"""<form id="login-form" method="post" action="{LOGIN_SUBMIT_PATH}"><fieldset>
+<div><div>
+  <div></div>
+  <div><div>
+    <div><input id="srchDvNm01" name="srchDvNm01" type="text"><input id="hmpgPwdCphd01" name="hmpgPwdCphd01" type="password"></div>
+    <div><input type="submit" value="확인"></div>
+  </div></div>
+</div></div>
+</fieldset></form>"""
+
+
+def _options(values, selected=None):
+    out = []
+    for value, text in values:
+        sel = " selected" if value == selected else ""
+        out.append(f'<option value="{html.escape(value)}"{sel}>{html.escape(text)}</option>')
+    return "".join(out)
+
+
+def search_form(form):
+    today = datetime.now()
+    dates = [((today + timedelta(days=d)).strftime("%Y%m%d"),) * 2 for d in range(-1, 60)]
+    if form.get("dptDt") and (form["dptDt"], form["dptDt"]) not in dates:
+        dates.append((form["dptDt"], form["dptDt"]))
+    times = [(f"{h:02d}0000", f"{h:02d}") for h in range(0, 24, 2)]
+    adults = [(str(n), f"어른(만 13세 이상) {n}명") for n in range(0, 10)]
+    kids = [(str(n), f"어린이(만 6~12세) {n}명") for n in range(0, 10)]
+    elders = [(str(n), f"경로(만 65세 이상) {n}명") for n in range(0, 10)]
+    return f"""<form id="search-form" method="post" action="{SEARCH_PATH}">
+<input id="dptRsStnCdNm" name="dptRsStnCdNm" type="text" value="{html.escape(form.get('dptRsStnCdNm', ''))}">
+<input id="arvRsStnCdNm" name="arvRsStnCdNm" type="text" value="{html.escape(form.get('arvRsStnCdNm', ''))}">
+<select id="dptDt" name="dptDt" style="display: none;">{_options(dates, form.get('dptDt'))}</select>
+<select id="dptTm" name="dptTm" style="display: none;">{_options(times, form.get('dptTm'))}</select>
+<select name="psgInfoPerPrnb1" style="display: none;">{_options(adults, form.get('psgInfoPerPrnb1', '1'))}</select>
+<select name="psgInfoPerPrnb5" style="display: none;">{_options(kids, form.get('psgInfoPerPrnb5', '0'))}</select>
+<select name="psgInfoPerPrnb4" style="display: none;">{_options(elders, form.get('psgInfoPerPrnb4', '0'))}</select>
+<div id="search_top_tag"><input type="submit" value="조회하기"></div>
+</form>"""
+
+
+def result_table(state, form, search_no):
+    dpt = form.get("dptRsStnCdNm", state.scenario["dpt"])
+    arr = form.get("arvRsStnCdNm", state.scenario["arr"])
+    min_hour = int(form.get("dptTm", "000000")[:2] or 0)
+    dt = form.get("dptDt", "")
+    rows = []
+    now = time.time()
+    for i, train in enumerate(state.trains, start=1):
+        if int(train["dpt"][:2]) < min_hour:
+            continue
+        seat_open = state.is_open(i, "seat", search_no)
+        wait_open = state.is_open(i, "waitlist", search_no)
+        if seat_open and i not in state.first_open_served:
+            state.first_open_served[i] = now
+        seat = f'<a href="{BOOK_PATH}?row={i}&dt={dt}" class="btn_small btn_burgundy_dark val_m wx90">예약하기</a>' if seat_open \
+            else '<span class="btn_small btn_silver val_m wx90">매진</span>'
+        wait = f'<a href="{WAIT_PATH}?row={i}&dt={dt}" class="btn_small btn_emerald val_m wx90">신청하기</a>' if wait_open \
+            else '<span>-</span>'
+        rows.append(f"""<tr><td>{len(rows) + 1}</td><td>{train['type']}</td><td>{train['num']}</td>
+<td><div class="val_m wx90">{html.escape(dpt)}</div><br><em class="time">{train['dpt']}</em></td>
+<td><div class="val_m wx90">{html.escape(arr)}</div><br><em class="time">{train['arr']}</em></td>
+<td><span>매진</span></td><td>{seat}</td><td>{wait}</td><td>-</td></tr>""")
+    return f"""<form id="result-form"><fieldset><div class="tbl_wrap th_thead"><table>
+<thead><tr><th>구분</th><th>열차종류</th><th>열차번호</th><th>출발</th><th>도착</th><th>특실</th><th>일반실</th><th>예약대기</th><th>소요시간</th></tr></thead>
+<tbody>{''.join(rows)}</tbody></table></div></fieldset></form>"""
+
+
+def sold_out_page():
+    return """<div><div class="sub_con_area"><div class="box2 val_m tal_c"><span>잔여석 없음</span></div></div></div>"""
+
+
+def booked_page():
+    return f"""<div><div class="sub_con_area"><div id="isFalseGotoMain"></div><p>예약이 완료되었습니다.</p>
+<div class="tal_c"><a href="{PAYMENT_PATH}">결제하기</a><a href="{SEARCH_PATH}">다시 조회</a></div></div></div>"""
+
+
+def payment_page():
+    months = [(f"{m:02d}", f"{m:02d}") for m in range(1, 13)]
+    year = datetime.now().year % 100
+    years = [(f"{y:02d}", f"{y:02d}") for y in range(year, year + 13)]
+    issue_js = f"alert('결제하시겠습니까?'); setTimeout(function(){{location.href='{PAID_PATH}';}}, 50);"
+    return f"""<div><div class="sub_con_area"><form id="payment-form">
+<input type="checkbox" id="Tk_stlCrCrdNo14_checkbox"><input type="checkbox" id="Tk_vanPwd1_checkbox">
+<input id="stlCrCrdNo11" name="stlCrCrdNo11"><input id="stlCrCrdNo12" name="stlCrCrdNo12">
+<input id="stlCrCrdNo13" name="stlCrCrdNo13"><input id="stlCrCrdNo14" name="stlCrCrdNo14">
+<select id="crdVlidTrm1M" name="crdVlidTrm1M">{_options(months)}</select>
+<select id="crdVlidTrm1Y" name="crdVlidTrm1Y">{_options(years)}</select>
+<input id="vanPwd1" name="vanPwd1"><input id="athnVal1" name="athnVal1">
+<div class="tab tab3"><ul><li><a href="#">카드</a></li><li onclick="alert('스마트폰 발권을 선택하셨습니다.')"><a href="#">스마트폰 발권</a></li></ul></div>
+<input type="button" id="requestIssue1" value="결제 및 발권" onclick="{issue_js}">
+</form></div></div>"""
+
+
+def paid_page():
+    return """<div><div class="sub_con_area"><p id="paymentComplete">결제가 완료되었습니다.</p></div></div>"""
+
+
+def reservation_list_page(state):
+    rows = []
+    for i in sorted(state.booked_rows | state.waitlisted_rows):
+        train = state.trains[i - 1]
+        dt = state.row_dates.get(i, "")
+        dpt_dt = f"{dt[:4]}-{dt[4:6]}-{dt[6:]}" if len(dt) == 8 else dt
+        if i in state.booked_rows:
+            status, pay = "결제대기", f'<a href="{PAYMENT_PATH}?row={i}">결제하기</a>'
+        else:
+            status, pay = "예약대기", "-"
+        rows.append(f"<tr><td>{dpt_dt}</td><td>{train['type']}</td><td>{train['num']}</td>"
+                    f"<td>{html.escape(state.scenario['dpt'])}<br>{train['dpt']}</td>"
+                    f"<td>{html.escape(state.scenario['arr'])}<br>{train['arr']}</td><td>{status}</td><td>{pay}</td></tr>")
+    return f"""<div><div class="sub_con_area"><table id="rsv-list"><tbody>{''.join(rows)}</tbody></table></div></div>"""
+
+
+class FakeSRTHandler(BaseHTTPRequestHandler):
+    state = None  # serve() 에서 지정
+
+    def log_message(self, format, *args):
+        pass
+
+    def _session(self):
+        cookie = self.headers.get("Cookie", "")
+        for part in cookie.split(";"):
+            name, _, value = part.strip().partition("=")
+            if name == SESSION_COOKIE and value in self.state.sessions:
+                ttl = self.state.scenario.get("session_ttl_sec", 0)
+                if ttl and time.time() - self.state.sessions[value] > ttl:
+                    return None
+                return value
+        return None
+
+    def _send(self, body, status=200, headers=None, content_type="text/html; charset=utf-8"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _redirect(self, location, headers=None):
+        headers = dict(headers or {})
+        headers["Location"] = location
+        self._send("", status=302, headers=headers)
+
+    def _form(self):
+        length = int(self.headers.get("Content-Length", 0) or 0)
+        raw = self.rfile.read(length).decode("utf-8") if length else ""
+        return {k: v[-1] for k, v in parse_qs(raw, keep_blank_values=True).items()}
+
+    def do_GET(self):
+        self._route("GET", dict())
+
+    def do_POST(self):
+        self._route("POST", self._form())
+
+    def _route(self, method, form):
+        url = urlparse(self.path)
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        state = self.state
+        sid = self._session()
+
+        if url.path == STATS_PATH:
+            self._send(json.dumps(state.stats(), ensure_ascii=False), content_type="application/json; charset=utf-8")
+            return
+
+        if url.path == SLACK_PATH:
+            with state.lock:
+                state.slack_messages.append(form.get("text", ""))
+            delay = state.scenario.get("slack_delay_sec", 0)
+            if delay:
+                time.sleep(delay)
+            self._send(json.dumps({"ok": True}), content_type="application/json; charset=utf-8")
+            return
+
+        if url.path == LOGIN_PATH:
+            self._send(page(login_form(), sid is not None))
+            return
+
+        if url.path == LOGIN_SUBMIT_PATH:
+            with state.lock:
+                state.cnt_login += 1
+                if state.first_login_at is None:
+                    state.first_login_at = time.time()
+                new_sid = f"fake{state.cnt_login}{int(time.time() * 1000)}"
+                state.sessions[new_sid] = time.time()
+            self._redirect("/main", {"Set-Cookie": f"{SESSION_COOKIE}={new_sid}; Path=/"})
+            return
+
+        if sid is None and url.path != "/main":
+            # 로그인이 풀리면 실제 사이트처럼 로그인 페이지로 보낸다
+            self._redirect(LOGIN_PATH)
+            return
+
+        if url.path == "/main" or url.path == "/":
+            self._send(page("<div class='sub_con_area'>메인</div>", sid is not None))
+            return
+
+        if url.path == SEARCH_PATH:
+            script = ""
+            body = search_form(form)
+            if method == "POST":
+                with state.lock:
+                    state.cnt_search += 1
+                    search_no = state.cnt_search
+                    body += result_table(state, form, search_no)
+                    if state.first_search_at is None:
+                        state.first_search_at = time.time()
+                alert_every = state.scenario.get("alert_every", 0)
+                if alert_every and search_no % alert_every == 0:
+                    script = "<script>alert('잠시 후 다시 시도해 주십시오.');</script>"
+            self._send(page(body, True, script))
+            return
+
+        if url.path == BOOK_PATH:
+            row = int(query.get("row", 0))
+            with state.lock:
+                state.cnt_book_try += 1
+                state.book_requested.setdefault(row, time.time())
+                state.row_dates[row] = query.get("dt", "")
+                if state.is_open(row, "seat", state.cnt_search):
+                    state.booked_rows.add(row)
+                    state.booked_at[row] = time.time()
+                    body = booked_page()
+                else:
+                    state.cnt_sold_out += 1
+                    body = sold_out_page()
+            self._send(page(body, True))
+            return
+
+        if url.path == WAIT_PATH:
+            row = int(query.get("row", 0))
+            with state.lock:
+                state.cnt_waitlist += 1
+                state.waitlisted_rows.add(row)
+                state.row_dates[row] = query.get("dt", "")
+            self._send(page("<div class='sub_con_area'><p>예약대기 신청이 완료되었습니다.</p></div>", True))
+            return
+
+        if url.path == PAYMENT_PATH:
+            self._send(page(payment_page(), True))
+            return
+
+        if url.path == PAID_PATH:
+            with state.lock:
+                state.cnt_paid += 1
+                for row in state.booked_rows:
+                    state.paid_at.setdefault(row, time.time())
+            self._send(page(paid_page(), True))
+            return
+
+        if url.path == RESERVATION_LIST_PATH:
+            with state.lock:
+                state.cnt_reservation_list += 1
+                state.confirm_waitlist()
+                body = reservation_list_page(state)
+            self._send(page(body, True))
+            return
+
+        self._send(page("<p>없는 페이지</p>", sid is not None), status=404)
+
+
+class FakeSRTServer:
+    def __init__(self, scenario=None, host="127.0.0.1", port=0):
+        self.state = FakeSRTState(scenario or load_scenario())
+        handler = type("BoundFakeSRTHandler", (FakeSRTHandler,), {"state": self.state})
+        self.httpd = ThreadingHTTPServer((host, port), handler)
+        self.httpd.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Local SRT stand-in server')
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--scenario", type=str, default=None)
+    args = parser.parse_args()
+
+    server = FakeSRTServer(load_scenario(args.scenario), args.host, args.port)
+    print(f"Fake SRT: {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
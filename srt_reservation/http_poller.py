@@ -0,0 +1,74 @@
+import requests
+from requests.adapters import HTTPAdapter
+
+from srt_reservation.snapshot import has_result_table, read_result_rows_from_html
+
+HTTP_TIMEOUT_SEC = (3, 10)  # (connect, read)
+
+# 조회하기 버튼이 속한 form 의 action 과 입력값을 그대로 가져온다.
+# go_search() 로 한 번 조회한 뒤의 화면에서 읽으므로 사이트 JS 가 채운 hidden 값도 포함된다.
+CAPTURE_SEARCH_FORM_JS = """
+var btn = document.querySelector("#search_top_tag > input") || document.querySelector("input[value='조회하기']");
+var form = btn ? btn.form : null;
+if (!form) return null;
+var fields = [];
+for (var i = 0; i < form.elements.length; i++) {
+    var el = form.elements[i];
+    if (!el.name || el.disabled) continue;
+    if (el.type == "submit" || el.type == "button" || el.type == "image" || el.type == "file") continue;
+    if ((el.type == "checkbox" || el.type == "radio") && !el.checked) continue;
+    fields.push([el.name, el.value]);
+}
+return {action: form.action, method: (form.method || "post").toLowerCase(), fields: fields};
+"""
+
+
+class SessionExpired(Exception):
+    pass
+
+
+class HttpPoller:
+    """
+    브라우저 대신 requests.Session 으로 조회 결과만 가져온다.
+    Selenium 로그인 쿠키와 조회 form 을 복사해서 같은 요청을 보내고,
+    예약 가능한 행이 보일 때만 브라우저 쪽 예약 경로로 넘긴다.
+    """
+
+    def __init__(self, login_path, timeout=HTTP_TIMEOUT_SEC):
+        self.login_path = login_path
+        self.timeout = timeout
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.forms = dict()  # 검색 목표별 조회 form
+        self.cnt_poll = 0
+
+    def sync_from_driver(self, driver, key=None):
+        self.session.cookies.clear()
+        for c in driver.get_cookies():
+            self.session.cookies.set(c["name"], c["value"], domain=c.get("domain"), path=c.get("path", "/"))
+        self.session.headers["User-Agent"] = driver.execute_script("return navigator.userAgent;")
+        self.session.headers["Referer"] = driver.current_url
+
+        form = driver.execute_script(CAPTURE_SEARCH_FORM_JS)
+        if not form:
+            raise Exception("조회 form 을 찾을 수 없습니다.")
+        self.forms[key] = form
+
+    def poll(self, dpt_dt, limit, key=None, last_fp=None):
+        self.cnt_poll += 1
+        form = self.forms[key]
+        if form["method"] == "get":
+            res = self.session.get(form["action"], params=form["fields"], timeout=self.timeout)
+        else:
+            res = self.session.post(form["action"], data=form["fields"], timeout=self.timeout)
+        res.raise_for_status()
+
+        html = res.text
+        if self.login_path in res.url or not has_result_table(html):
+            raise SessionExpired("HTTP 조회 실패: 로그인 만료 또는 결과 표 없음")
+        return read_result_rows_from_html(html, dpt_dt, limit, last_fp)
+
+    def close(self):
+        self.session.close()
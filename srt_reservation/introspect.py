@@ -0,0 +1,166 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import signal
+import threading
+import time
+from datetime import datetime
+
+DEFAULT_INTROSPECT_DIR = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "introspect")
+PROFILE_SEC = 30
+PROFILE_TOP = 40  # 텍스트 요약에 남길 함수 수
+
+
+def _stamp(thread_name=None):
+    stamp = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+    return stamp if thread_name is None else f"{stamp}-{thread_name}"
+
+
+class SectionProfiler:
+    """
+    check_result() 구간만 정해진 시간 동안 cProfile 로 잰다.
+    요청(request)은 어느 스레드에서 해도 되고, 측정은 구간을 실행하는 스레드에서 켜고 끈다.
+    요청이 없을 때 구간마다 드는 비용은 속성 확인 한 번이다.
+    """
+
+    def __init__(self, directory, duration_sec=PROFILE_SEC):
+        self.directory = directory
+        self.duration_sec = duration_sec
+        self.deadline = None
+        self.profile = None
+        self.enabled = False
+        self.cnt_sections = 0
+        self.last_path = None
+
+    def request(self, duration_sec=None):
+        self.deadline = time.monotonic() + (duration_sec or self.duration_sec)
+        print(f"check_result 프로파일 시작 ({duration_sec or self.duration_sec}초)")
+
+    def toggle(self):
+        # 측정 중이면 다음 구간이 끝날 때 저장, 아니면 시작
+        if self.deadline is None:
+            self.request()
+        else:
+            self.deadline = time.monotonic()
+
+    def __enter__(self):
+        if self.deadline is not None:
+            if self.profile is None:
+                self.profile = cProfile.Profile()
+                self.cnt_sections = 0
+            self.profile.enable()
+            self.enabled = True
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.enabled:
+            self.profile.disable()
+            self.enabled = False
+            self.cnt_sections += 1
+            self.tick()
+        return False
+
+    def tick(self):
+        # 사이클이 끝날 때마다 호출. 측정 시간이 지났으면 저장한다
+        if self.deadline is not None and time.monotonic() >= self.deadline and not self.enabled:
+            self.finish()
+
+    def finish(self):
+        profile, self.profile, self.deadline = self.profile, None, None
+        if profile is None:
+            print("check_result 프로파일: 측정한 구간이 없습니다.")
+            return None
+        path = os.path.join(self.directory, f"profile-{_stamp(threading.current_thread().name)}")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            profile.dump_stats(path + ".prof")
+            out = io.StringIO()
+            stats = pstats.Stats(profile, stream=out)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP)
+            with open(path + ".txt", "w") as f:
+                f.write(f"check_result {self.cnt_sections}회\n")
+                f.write(out.getvalue())
+        except Exception as e:
+            print(f"프로파일 저장 실패: {e}")
+            return None
+        self.last_path = path + ".prof"
+        print(f"check_result 프로파일 {self.cnt_sections}회 저장: {self.last_path}")
+        return self.last_path
+
+
+def hunter_status(hunter):
+    """실행 중인 SRThunter 의 현재 상태. 다른 스레드에서 읽기만 한다"""
+    metrics = hunter.metrics
+    phase, phase_sec = metrics.current_phase()
+
+    targets = []
+    for srt in list(hunter.targets):
+        targets.append({"label": srt.label(), "done": srt.done, "gotcha": srt.gotcha,
+                        "dpt_tm": srt.dpt_tm, "num": srt.num_trains_to_check, "rows": srt.row_limit(),
+                        "booked": [k for k, v in list(srt.booked.items()) if v],
+                        "reserved": [k for k, v in list(srt.reserved.items()) if v]})
+
+    current = hunter.current_target
+    return {
+        "time": datetime.now().isoformat(timespec="seconds"),
+        "pid": os.getpid(),
+        "uptime_sec": round(time.perf_counter() - hunter.started_at, 1),
+        "phase": phase,
+        "phase_ms": round(phase_sec * 1000, 1),
+        "target": None if current is None else current.label(),
+        "cycle_ms": None if hunter.cycle_started_at is None else round((time.perf_counter() - hunter.cycle_started_at) * 1000, 1),
+        "last_cycle_ms": {k: round(v * 1000, 1) for k, v in dict(metrics.last_cycle).items()},
+        "cnt_tried": hunter.cnt_tried,
+        "cnt_refresh": hunter.cnt_refresh,
+        "cycles": metrics.cnt_cycle,
+        "counters": dict(metrics.counters),
+        "phases_ms": metrics.phase_percentiles(),
+        "targets": targets,
+        "session": hunter.session.to_string(),
+        "profiling": hunter.profiler.deadline is not None,
+    }
+
+
+class Introspector:
+    """
+    재시작 없이 실행 중인 봇을 들여다본다.
+    SIGUSR1: 현재 단계, 횟수, 예약/예약대기, 사이클 시간을 출력하고 status json 으로 저장
+    SIGUSR2: check_result 프로파일 시작/중단 (profile-*.prof, profile-*.txt)
+
+        kill -USR1 <pid>
+    """
+
+    def __init__(self, hunter, directory):
+        self.hunter = hunter
+        self.directory = directory
+
+    def install(self):
+        # signal 은 메인 스레드에서만 등록할 수 있다 (daemon worker 는 소켓 명령을 쓴다)
+        if threading.current_thread() is not threading.main_thread():
+            return False
+        signal.signal(signal.SIGUSR1, self._on_status)
+        signal.signal(signal.SIGUSR2, self._on_profile)
+        return True
+
+    def _on_status(self, signum, frame):
+        # handler 안에서 print 하면 메인 스레드의 print 와 겹칠 수 있어 스레드로 넘긴다
+        threading.Thread(target=self.dump_status, name="introspect", daemon=True).start()
+
+    def _on_profile(self, signum, frame):
+        threading.Thread(target=self.hunter.profiler.toggle, name="introspect", daemon=True).start()
+
+    def dump_status(self):
+        try:
+            status = hunter_status(self.hunter)
+            text = json.dumps(status, ensure_ascii=False, indent=1)
+            print(text)
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, f"status-{_stamp()}.json")
+            with open(path, "w") as f:
+                f.write(text)
+            return path
+        except Exception as e:
+            print(f"상태 출력 실패: {e}")
+            return None
@@ -0,0 +1,142 @@
+from selenium.webdriver.common.by import By
+
+# SRT 화면에서 찾는 요소를 모두 여기에 둔다. 화면이 바뀌면 이 파일만 고친다.
+# 모두 CSS 로 적어서 같은 문자열로 page shape 검사(querySelector)도 한다.
+
+
+def css(selector):
+    return By.CSS_SELECTOR, selector
+
+
+# 로그인
+LOGIN_ID = css("#srchDvNm01")
+LOGIN_PSW = css("#hmpgPwdCphd01")
+LOGIN_SUBMIT = css("#login-form input[type='submit']")  # 첫 번째 탭(회원번호)의 확인 버튼
+LOGIN_MENU = css("#wrap > div.header.header-e > div.global.clear > div")
+
+# 조회
+DPT_STN = css("#dptRsStnCdNm")
+ARR_STN = css("#arvRsStnCdNm")
+DPT_DT = css("#dptDt")
+DPT_TM = css("#dptTm")
+ADULT_NUM = css("select[name='psgInfoPerPrnb1']")
+KID_NUM = css("select[name='psgInfoPerPrnb5']")
+ELDER_NUM = css("select[name='psgInfoPerPrnb4']")
+SEARCH_BUTTON = css("#search_top_tag > input")
+
+# 조회 결과
+RESULT_FORM = css("#result-form")
+REFRESH_BUTTON = css("input[value='조회하기']")
+RESULT_ROWS_SELECTOR = "#result-form > fieldset > div.tbl_wrap.th_thead > table > tbody > tr"
+RESULT_HEADERS_SELECTOR = "#result-form > fieldset > div.tbl_wrap.th_thead > table > thead th"
+
+# 결과 표의 td 위치 (0-based)
+COL_TRAIN_TYPE = 1
+COL_TRAIN_NUM = 2
+COL_DPT = 3
+COL_ARR = 4
+COL_STANDARD_SEAT = 6
+COL_RESERVATION = 7
+
+# 위치가 바뀌었는지 확인할 머리글 (일부만 맞으면 됨)
+RESULT_HEADERS = {COL_TRAIN_NUM: "열차번호", COL_STANDARD_SEAT: "일반실", COL_RESERVATION: "예약대기"}
+
+# 예약 결과
+BOOK_SUCCESS = css("#isFalseGotoMain")
+SOLD_OUT = css("#wrap > div.container.container-e > div > div.sub_con_area > div.box2.val_m.tal_c > span")
+
+# 예약 내역 (예약대기 확정 확인)
+RSV_LIST_ID = "rsv-list"
+RSV_LIST_ROWS_SELECTOR = "#rsv-list > tbody > tr"
+# 예약 내역 표의 td 위치 (0-based). 출발/도착은 "역 이름 시각"
+RSV_COL_DPT_DT = 0
+RSV_COL_TRAIN_TYPE = 1
+RSV_COL_TRAIN_NUM = 2
+RSV_COL_DPT = 3
+RSV_COL_ARR = 4
+RSV_COL_STATUS = 5
+RSV_COL_PAY = 6
+RSV_CONFIRMED = "결제대기"  # 좌석이 배정되어 결제만 남은 상태
+RSV_WAITING = "예약대기"
+
+# 결제
+PAY_LINK_SELECTOR = ".tal_c > a:nth-child(1)"  # 예약 완료 페이지의 결제하기
+PAY_LINK = css(PAY_LINK_SELECTOR)
+PAY_BUTTON_ID = "requestIssue1"
+SMARTPHONE_TAB_SELECTOR = "div.tab.tab3 > ul > li:nth-child(2)"
+# 보안키패드 토글 체크박스. 누르면 보안키패드가 꺼지고 입력칸에 값을 넣을 수 있다
+KEYPAD_TOGGLE_IDS = ["Tk_stlCrCrdNo14_checkbox", "Tk_vanPwd1_checkbox"]
+
+# 화면별로 반드시 있어야 하는 요소
+LOGIN_PAGE = {"id": LOGIN_ID, "password": LOGIN_PSW, "submit": LOGIN_SUBMIT}
+SEARCH_PAGE = {"dpt": DPT_STN, "arr": ARR_STN, "date": DPT_DT, "time": DPT_TM, "search": SEARCH_BUTTON}
+RESULT_PAGE = {"form": RESULT_FORM, "refresh": REFRESH_BUTTON}
+
+
+def cell_link(row_idx, col):
+    # row_idx 는 tr:nth-child 값 (1부터), col 은 td 위치 (0-based)
+    return css(f"{RESULT_ROWS_SELECTOR}:nth-child({row_idx}) > td:nth-child({col + 1}) > a")
+
+
+# 행마다 f-string 을 새로 만들지 않도록 미리 만들어 둔다
+PRECOMPILED_ROWS = 40
+BOOK_LINKS = tuple(cell_link(i, COL_STANDARD_SEAT) for i in range(1, PRECOMPILED_ROWS + 1))
+RESERVE_LINKS = tuple(cell_link(i, COL_RESERVATION) for i in range(1, PRECOMPILED_ROWS + 1))
+
+
+def book_link(row_idx):
+    return BOOK_LINKS[row_idx - 1] if row_idx <= PRECOMPILED_ROWS else cell_link(row_idx, COL_STANDARD_SEAT)
+
+
+def reserve_link(row_idx):
+    return RESERVE_LINKS[row_idx - 1] if row_idx <= PRECOMPILED_ROWS else cell_link(row_idx, COL_RESERVATION)
+
+
+def reservation_pay_link(row_idx):
+    # 예약 내역 row_idx 번째 행의 결제하기
+    return css(f"{RSV_LIST_ROWS_SELECTOR}:nth-child({row_idx}) > td:nth-child({RSV_COL_PAY + 1}) > a")
+
+
+# 한 번의 execute_script 로 화면 구조를 확인한다. 문제 목록을 돌려준다 (없으면 빈 배열)
+# arguments: {이름: css}, 결과 행 selector(또는 null), 머리글 selector, {td 위치: 머리글 글자}, 행의 최소 td 수
+PAGE_SHAPE_JS = """
+var required = arguments[0], problems = [];
+for (var name in required) {
+    if (document.querySelector(required[name]) === null) problems.push(name + " 없음 (" + required[name] + ")");
+}
+if (arguments[1] !== null && problems.length === 0) {
+    var ths = document.querySelectorAll(arguments[2]);
+    var headers = arguments[3];
+    for (var col in headers) {
+        var th = ths[parseInt(col)];
+        var text = th ? th.innerText.replace(/\\s+/g, "") : null;
+        if (text === null || text.indexOf(headers[col]) < 0)
+            problems.push((parseInt(col) + 1) + "번째 머리글이 '" + headers[col] + "' 이 아님 (" + text + ")");
+    }
+    var rows = document.querySelectorAll(arguments[1]);
+    for (var i = 0; i < Math.min(rows.length, 3); i++) {
+        var n = rows[i].querySelectorAll("td").length;
+        if (n < arguments[4]) problems.push((i + 1) + "번째 행의 칸 수 " + n + " < " + arguments[4]);
+    }
+}
+return problems;
+"""
+
+
+class PageShapeError(Exception):
+    pass
+
+
+def check_page(driver, required, table=False):
+    """화면 구조 문제 목록. table 이면 결과 표의 머리글/칸 수까지 본다"""
+    return driver.execute_script(PAGE_SHAPE_JS, {name: loc[1] for name, loc in required.items()},
+                                 RESULT_ROWS_SELECTOR if table else None, RESULT_HEADERS_SELECTOR,
+                                 {str(col): text for col, text in RESULT_HEADERS.items()},
+                                 max(RESULT_HEADERS) + 1) or []
+
+
+def assert_page(driver, page, required, table=False):
+    # 대기 없이 바로 확인하고, 다르면 무엇이 다른지 모아서 알린다
+    problems = check_page(driver, required, table)
+    if problems:
+        raise PageShapeError(f"{page} 화면 구조가 예상과 다릅니다: " + "; ".join(problems))
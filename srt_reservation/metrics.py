@@ -0,0 +1,154 @@
+import json
+import math
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+
+WINDOW_SIZE = 1000  # 단계별로 보관하는 최근 샘플 수
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    # nearest-rank
+    k = max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[k]
+
+
+class _PhaseTimer:
+    __slots__ = ("metrics", "samples", "name", "start", "outer")
+
+    def __init__(self, metrics, name):
+        self.metrics = metrics
+        self.samples = metrics.samples[name]
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        # 지금 어느 단계인지 (상태 출력용). 단계 안의 단계가 끝나면 바깥 단계로 돌아간다
+        self.outer = self.metrics.current
+        self.metrics.current = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        self.samples.append(elapsed)
+        cycle = self.metrics.cycle
+        cycle[self.name] = cycle.get(self.name, 0.0) + elapsed
+        self.metrics.current = self.outer
+        return False
+
+
+class Metrics:
+    """
+    단계별 소요 시간 기록.
+    기록은 deque append 한 번이라 루프 안에서 써도 부담이 없고,
+    백분위 계산은 report_sec 마다 요약할 때만 한다.
+    """
+
+    def __init__(self, report_sec=60, jsonl_path=None, bot=None, window=WINDOW_SIZE):
+        self.report_sec = report_sec
+        self.jsonl_path = jsonl_path
+        self.bot = bot
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+        self.counters = defaultdict(int)
+        self.gauges = []  # 요약 시점에만 호출되는 dict 반환 함수들 (자원 사용량 등)
+        self.cycle = dict()  # 현재 사이클의 단계별 합계 (flight recorder 용)
+        self.last_cycle = dict()  # 마지막으로 끝난 사이클의 단계별 합계
+        self.current = None  # 진행 중인 _PhaseTimer
+        self.cnt_cycle = 0
+        self.started_at = time.monotonic()
+        self.last_report_at = self.started_at
+        self.last_report_cycle = 0
+
+    def phase(self, name):
+        return _PhaseTimer(self, name)
+
+    def record(self, name, seconds, in_cycle=True):
+        # in_cycle=False 이면 사이클 단계 합계(flight recorder)에는 넣지 않는다
+        self.samples[name].append(seconds)
+        if in_cycle:
+            self.cycle[name] = self.cycle.get(name, 0.0) + seconds
+
+    def take_cycle(self):
+        # 현재 사이클의 단계별 시간을 넘겨주고 비운다
+        self.last_cycle, self.cycle = self.cycle, dict()
+        return self.last_cycle
+
+    def current_phase(self):
+        # (단계 이름, 진행 시간). 단계 밖이면 (None, 0)
+        timer = self.current
+        if timer is None:
+            return None, 0.0
+        return timer.name, time.perf_counter() - timer.start
+
+    def incr(self, name, n=1):
+        self.counters[name] += n
+
+    def add_gauge(self, gauge):
+        self.gauges.append(gauge)
+
+    def end_cycle(self):
+        self.cnt_cycle += 1
+        if self.report_sec and time.monotonic() - self.last_report_at >= self.report_sec:
+            self.report()
+
+    def summary(self):
+        now = time.monotonic()
+        elapsed = now - self.last_report_at
+        cycles = self.cnt_cycle - self.last_report_cycle
+        gauges = {}
+        for gauge in self.gauges:
+            try:
+                gauges.update(gauge())
+            except Exception as e:
+                print(e)
+        return {
+            "time": datetime.now().isoformat(timespec="seconds"),
+            "uptime_sec": round(now - self.started_at, 1),
+            "cycles": self.cnt_cycle,
+            "cycles_per_min": round(cycles / elapsed * 60, 2) if elapsed > 0 else 0.0,
+            "phases_ms": self.phase_percentiles(),
+            "counters": dict(self.counters),
+            "gauges": gauges,
+        }
+
+    def phase_percentiles(self):
+        # 단계별 샘플 수와 백분위(ms). 다른 스레드(상태 출력)에서 불러도 되도록 복사해서 계산한다
+        phases = {}
+        for name, values in list(self.samples.items()):
+            ordered = sorted(values)
+            if not ordered:
+                continue
+            phases[name] = {"n": len(ordered)}
+            for p in PERCENTILES:
+                phases[name][f"p{p}"] = round(percentile(ordered, p) * 1000, 1)
+        return phases
+
+    def to_string(self, summary=None):
+        summary = summary or self.summary()
+        parts = [f"cycles={summary['cycles']} ({summary['cycles_per_min']}/min)"]
+        for name, ph in summary["phases_ms"].items():
+            parts.append(f"{name} p50={ph['p50']} p95={ph['p95']} p99={ph['p99']}ms")
+        for name, value in summary["counters"].items():
+            parts.append(f"{name}={value}")
+        for name, value in summary["gauges"].items():
+            parts.append(f"{name}={value}")
+        return "[metrics] " + " | ".join(parts)
+
+    def report(self):
+        summary = self.summary()
+        line = self.to_string(summary)
+        print(line)
+        if self.jsonl_path:
+            try:
+                with open(self.jsonl_path, "a") as f:
+                    f.write(json.dumps(summary, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(e)
+        if self.bot is not None:
+            self.bot.send_slack_bot_msg(line, coalesce="metrics")
+        self.last_report_at = time.monotonic()
+        self.last_report_cycle = self.cnt_cycle
+        return summary
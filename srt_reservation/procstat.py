@@ -0,0 +1,197 @@
+import os
+import signal
+import time
+
+# /proc 기반 프로세스 자원 사용량 측정 (Linux 전용)
+
+CLK_TCK = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+def _read_stat(pid):
+    with open(f"/proc/{pid}/stat", "r") as f:
+        data = f.read()
+    # comm 에 공백/괄호가 들어갈 수 있으므로 마지막 ')' 뒤부터 자른다
+    fields = data[data.rindex(")") + 2:].split()
+    return fields
+
+
+def children_of(pid):
+    # children 파일은 스레드마다 따로 있다 (그 스레드가 fork 한 자식만).
+    # chromedriver 는 세션 스레드에서 Chrome 을 띄우므로 모든 스레드의 파일을 읽는다
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return []
+    children = []
+    try:
+        for tid in tids:
+            try:
+                with open(f"/proc/{pid}/task/{tid}/children", "r") as f:
+                    children.extend(int(c) for c in f.read().split())
+            except FileNotFoundError:
+                if os.path.isdir(f"/proc/{pid}/task/{tid}"):
+                    raise  # children 파일이 없는 커널
+                # 그 사이에 끝난 스레드
+        return children
+    except (OSError, ValueError):
+        pass
+
+    # children 파일이 없는 커널이면 ppid 로 전체 스캔
+    children = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            if int(_read_stat(entry)[1]) == pid:
+                children.append(int(entry))
+        except (OSError, ValueError, IndexError):
+            continue
+    return children
+
+
+def process_tree(pid):
+    pids = []
+    stack = [pid]
+    while stack:
+        cur = stack.pop()
+        pids.append(cur)
+        stack.extend(children_of(cur))
+    return pids
+
+
+def sample_pid(pid):
+    fields = _read_stat(pid)
+    # man 5 proc: utime(14) stime(15) num_threads(20) rss(24), fields 는 state(3) 부터 시작
+    cpu_sec = (int(fields[11]) + int(fields[12])) / CLK_TCK
+    num_threads = int(fields[17])
+    rss = int(fields[21]) * PAGE_SIZE
+    try:
+        num_fds = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        num_fds = 0
+    return {"rss": rss, "cpu_sec": cpu_sec, "threads": num_threads, "fds": num_fds}
+
+
+def sample_tree(pid, include_root=True):
+    total = {"pids": 0, "rss": 0, "cpu_sec": 0.0, "threads": 0, "fds": 0}
+    for cur in process_tree(pid):
+        if cur == pid and not include_root:
+            continue
+        try:
+            s = sample_pid(cur)
+        except (OSError, ValueError, IndexError):
+            # 측정 중에 종료된 프로세스
+            continue
+        total["pids"] += 1
+        for key, value in s.items():
+            total[key] += value
+    return total
+
+
+def cmdline(pid):
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as f:
+            return [arg.decode("utf-8", "replace") for arg in f.read().split(b"\0") if arg]
+    except OSError:
+        return []
+
+
+def mem_available_mb():
+    # 새로 쓸 수 있는 메모리 (MemAvailable). 읽을 수 없으면 None
+    try:
+        with open("/proc/meminfo", "r") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) // 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def user_data_dirs(pids):
+    # 브라우저가 실제로 쓰는 프로필 디렉터리 (--user-data-dir)
+    dirs = set()
+    for pid in pids:
+        for arg in cmdline(pid):
+            if arg.startswith("--user-data-dir="):
+                dirs.add(arg.split("=", 1)[1])
+    return dirs
+
+
+def kill_pids(pids, sig=signal.SIGKILL):
+    killed = 0
+    for pid in pids:
+        try:
+            os.kill(pid, sig)
+            killed += 1
+        except (ProcessLookupError, PermissionError):
+            pass
+    return killed
+
+
+class ProcessSampler:
+    """pid 트리의 RSS/CPU/스레드/FD 를 재고, 직전 샘플 대비 CPU 사용률을 계산한다."""
+
+    def __init__(self, pid, include_root=True):
+        self.pid = pid
+        self.include_root = include_root
+        self.last_cpu_sec = None
+        self.last_at = None
+
+    def sample(self):
+        now = time.monotonic()
+        s = sample_tree(self.pid, self.include_root)
+        if self.last_at is not None and now > self.last_at:
+            s["cpu_pct"] = round((s["cpu_sec"] - self.last_cpu_sec) / (now - self.last_at) * 100, 1)
+        else:
+            s["cpu_pct"] = 0.0
+        self.last_cpu_sec = s["cpu_sec"]
+        self.last_at = now
+        return s
+
+
+class ResourceGauge:
+    """Metrics gauge. 봇 프로세스와 브라우저 트리의 RSS, 사이클당 CPU 시간을 보고한다."""
+
+    def __init__(self, get_browser_pid, get_cycles):
+        self.get_browser_pid = get_browser_pid
+        self.get_cycles = get_cycles
+        self.last_cpu_sec = None
+        self.last_cycles = 0
+
+    def __call__(self):
+        out = {}
+        cpu_sec = 0.0
+        try:
+            bot = sample_pid(os.getpid())
+            out["bot_rss_mb"] = to_mb(bot["rss"])
+            cpu_sec += bot["cpu_sec"]
+        except (OSError, ValueError, IndexError):
+            return out
+
+        pid = self.get_browser_pid()
+        if pid is not None:
+            browser = sample_tree(pid)
+            out["browser_rss_mb"] = to_mb(browser["rss"])
+            out["browser_procs"] = browser["pids"]
+            cpu_sec += browser["cpu_sec"]
+
+        cycles = self.get_cycles()
+        if self.last_cpu_sec is not None and cycles > self.last_cycles and cpu_sec >= self.last_cpu_sec:
+            out["cpu_ms_per_cycle"] = round((cpu_sec - self.last_cpu_sec) / (cycles - self.last_cycles) * 1000, 1)
+        self.last_cpu_sec = cpu_sec
+        self.last_cycles = cycles
+        return out
+
+
+def browser_pid(driver):
+    # chromedriver 프로세스. Chrome 은 그 자식으로 뜬다.
+    try:
+        return driver.service.process.pid
+    except AttributeError:
+        return None
+
+
+def to_mb(n_bytes):
+    return round(n_bytes / 1024 / 1024, 1)
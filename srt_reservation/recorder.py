@@ -0,0 +1,180 @@
+import json
+import os
+import shutil
+import time
+from collections import deque
+from datetime import datetime
+
+DEFAULT_RECORDER_DIR = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "recorder")
+MIN_CAPTURE_INTERVAL_SEC = 30  # 같은 이유로 연달아 저장하지 않는다
+
+
+class CycleRecord:
+    __slots__ = ("no", "at", "target", "url", "phases", "wall_sec", "fp", "rows", "alerts", "error")
+
+    def __init__(self, no, target, url):
+        self.no = no
+        self.at = time.time()
+        self.target = target
+        self.url = url
+        self.phases = None
+        self.wall_sec = None  # 사이클 전체 시간. 단계는 서로 겹칠 수 있어(refresh 안의 wait 등) 합이 아니라 이것을 쓴다
+        self.fp = None
+        self.rows = None  # 이번 사이클에 읽은 ResultRow 목록 (표가 그대로면 None)
+        self.alerts = None
+        self.error = None  # 예외로 끝난 사이클
+
+    def to_dict(self):
+        rows = None
+        if self.rows is not None:
+            rows = [[r.idx, r.train.train_num, r.train.dpt_time, r.train.arr_time, r.standard_seat, r.reservation]
+                    for r in self.rows]
+        return {"no": self.no, "at": datetime.fromtimestamp(self.at).isoformat(timespec="milliseconds"),
+                "target": self.target, "url": self.url, "fp": self.fp, "alerts": self.alerts, "error": self.error,
+                "wall_ms": None if self.wall_sec is None else round(self.wall_sec * 1000, 1),
+                "phases_ms": {k: round(v * 1000, 1) for k, v in (self.phases or {}).items()},
+                "rows": rows}
+
+
+class FlightRecorder:
+    """
+    최근 사이클을 메모리에만 남겨둔다. (deque, 사이클마다 객체 하나)
+    평소에는 이미 가지고 있는 값(읽은 행, 단계별 시간, 이동한 URL)의 참조만 보관하고,
+    에러나 느린 사이클이 생겼을 때만 문자열로 바꾸고 스크린샷/page_source 를 찍어 디렉터리에 저장한다.
+    디렉터리 전체 크기는 max_mb 를 넘지 않도록 오래된 것부터 지운다.
+    """
+
+    def __init__(self, directory=DEFAULT_RECORDER_DIR, max_cycles=200, max_mb=50, slow_sec=10,
+                 min_interval_sec=MIN_CAPTURE_INTERVAL_SEC):
+        self.directory = directory
+        self.cycles = deque(maxlen=max_cycles)
+        self.max_bytes = max_mb * 1024 * 1024
+        self.slow_sec = slow_sec
+        self.min_interval_sec = min_interval_sec
+        self.current = None
+        self.last_url = None
+        self.last_capture = dict()  # 이유 -> 마지막 저장 시각
+        self.cnt_capture = 0
+
+    def begin(self, no, target):
+        self.current = CycleRecord(no, target, self.last_url)
+
+    def note_url(self, url):
+        self.last_url = url
+        if self.current is not None:
+            self.current.url = url
+
+    def note_rows(self, fp, rows):
+        if self.current is not None:
+            self.current.fp = fp
+            self.current.rows = rows
+
+    def note_alert(self, text):
+        if self.current is not None:
+            if self.current.alerts is None:
+                self.current.alerts = []
+            self.current.alerts.append(text)
+
+    def end(self, phases, wall_sec, error=None):
+        """사이클을 버퍼에 넣는다. 느린 사이클이면 True"""
+        rec, self.current = self.current, None
+        if rec is None:
+            return False
+        rec.phases = phases
+        rec.wall_sec = wall_sec
+        if error is not None:
+            rec.error = repr(error)
+        self.cycles.append(rec)
+        return self.slow_sec > 0 and wall_sec >= self.slow_sec
+
+    def capture(self, driver, reason, error=None):
+        """최근 사이클과 현재 화면을 저장한다. 저장한 디렉터리 (건너뛰면 None)"""
+        now = time.monotonic()
+        if now - self.last_capture.get(reason, -self.min_interval_sec) < self.min_interval_sec:
+            return None
+        self.last_capture[reason] = now
+
+        path = os.path.join(self.directory, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{reason}")
+        try:
+            os.makedirs(path, exist_ok=True)
+            cycles = [rec.to_dict() for rec in self.cycles]
+            if self.current is not None:
+                # 끝나지 못한 사이클 (에러가 난 사이클)
+                cycles.append(self.current.to_dict())
+            info = {"reason": reason, "error": None if error is None else repr(error), "cycles": cycles}
+            if driver is not None:
+                self._capture_page(driver, path, info)
+            with open(os.path.join(path, "cycles.json"), "w") as f:
+                json.dump(info, f, ensure_ascii=False, indent=1)
+        except Exception as e:
+            print(f"기록 저장 실패: {e}")
+            return None
+        self.cnt_capture += 1
+        self.prune()
+        print(f"최근 {len(self.cycles)}개 사이클 기록 저장: {path}")
+        return path
+
+    def _capture_page(self, driver, path, info):
+        # 브라우저가 죽었거나 alert 가 떠 있으면 일부만 저장될 수 있다
+        try:
+            info["current_url"] = driver.current_url
+        except Exception as e:
+            info["current_url"] = repr(e)
+        try:
+            driver.save_screenshot(os.path.join(path, "screenshot.png"))
+        except Exception as e:
+            info["screenshot_error"] = repr(e)
+        try:
+            with open(os.path.join(path, "page.html"), "w") as f:
+                f.write(driver.page_source)
+        except Exception as e:
+            info["page_source_error"] = repr(e)
+
+    def prune(self):
+        # 이름이 시각 순이므로 오래된 것부터 지운다. 방금 저장한 것은 남긴다
+        entries = sorted(os.listdir(self.directory))
+        sizes = {name: _dir_size(os.path.join(self.directory, name)) for name in entries}
+        total = sum(sizes.values())
+        for name in entries[:-1]:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+            total -= sizes[name]
+
+    def stats(self):
+        return {"recorder_captures": self.cnt_capture}
+
+
+def _dir_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class NullRecorder:
+    # --recorder_dir None 일 때
+    def begin(self, no, target):
+        pass
+
+    def note_url(self, url):
+        pass
+
+    def note_rows(self, fp, rows):
+        pass
+
+    def note_alert(self, text):
+        pass
+
+    def end(self, phases, wall_sec, error=None):
+        return False
+
+    def capture(self, driver, reason, error=None):
+        return None
+
+    def stats(self):
+        return {}
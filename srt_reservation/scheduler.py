@@ -0,0 +1,159 @@
+import json
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime
+
+from srt_reservation.train import to_minute
+
+SLOW_RESPONSE_SEC = 3.0  # 이보다 느린 응답이면 서버가 바쁜 것으로 보고 간격을 늘린다
+MAX_BACKOFF_SEC = 60.0
+RATE_WINDOW_SEC = 60.0
+
+
+class TimeWindow:
+    def __init__(self, start, end, min_sec, max_sec):
+        self.start = to_minute(start)
+        self.end = to_minute(end)
+        self.min_sec = min_sec
+        self.max_sec = max_sec
+
+    def contains(self, minute):
+        if self.start <= self.end:
+            return self.start <= minute < self.end
+        # 자정을 넘어가는 구간 ex) 23:00 ~ 06:00
+        return minute >= self.start or minute < self.end
+
+
+def load_time_windows(path):
+    """
+    [{"start": "00:00", "end": "06:00", "min": 5, "max": 10}, ...]
+    앞에 있는 구간이 우선한다.
+    """
+    with open(path, "r") as f:
+        return [TimeWindow(w["start"], w["end"], w["min"], w["max"]) for w in json.load(f)]
+
+
+class PollScheduler:
+    """
+    새로고침 간격 결정.
+    기본은 [min_sec, max_sec] 사이 랜덤, 에러/alert/느린 응답이 이어지면 간격을 지수적으로 늘리고
+    에러/alert/느린 응답이 하나도 없었던 사이클이 끝나면 다시 줄인다. 시간대별로 다른 간격(time window)을 줄 수 있다.
+    """
+
+    def __init__(self, min_sec=0, max_sec=3, windows=None, max_backoff_sec=MAX_BACKOFF_SEC,
+                 slow_sec=SLOW_RESPONSE_SEC, budget=None):
+        self.min_sec = min_sec
+        self.max_sec = max_sec
+        self.windows = windows or []
+        self.max_backoff_sec = max_backoff_sec
+        self.slow_sec = slow_sec
+        self.backoff = 1.0
+        self.cnt_error = 0
+        self.cnt_alert = 0
+        self.cnt_slow = 0
+        self.troubled = False  # 이번 사이클에 에러/alert/느린 응답이 있었는지
+        self.requests = deque()  # 최근 RATE_WINDOW_SEC 동안의 요청 시각
+        self.budget = budget  # 여러 브라우저가 나눠 쓰는 전체 요청 한도 (daemon)
+
+    def bounds(self, now=None):
+        now = now or datetime.now()
+        minute = now.hour * 60 + now.minute
+        for w in self.windows:
+            if w.contains(minute):
+                return w.min_sec, w.max_sec
+        return self.min_sec, self.max_sec
+
+    def next_delay(self):
+        lo, hi = self.bounds()
+        delay = random.uniform(lo, hi)
+        if self.backoff > 1.0:
+            # backoff 중에는 최소 간격에도 배수를 적용
+            delay = min(max(delay, 1.0) * self.backoff, self.max_backoff_sec)
+        return delay
+
+    def wait(self):
+        delay = self.next_delay()
+        if delay > 0:
+            time.sleep(delay)
+        if self.budget is not None:
+            delay += self.budget.acquire()
+        return delay
+
+    def on_request(self):
+        now = time.monotonic()
+        self.requests.append(now)
+        while self.requests and now - self.requests[0] > RATE_WINDOW_SEC:
+            self.requests.popleft()
+
+    def on_response(self, latency):
+        self.on_request()
+        if latency >= self.slow_sec:
+            self.cnt_slow += 1
+            self._increase(1.5)
+
+    def on_error(self):
+        self.cnt_error += 1
+        self._increase(2.0)
+
+    def on_alert(self):
+        self.cnt_alert += 1
+        self._increase(2.0)
+
+    def on_cycle_end(self):
+        # 응답 직후에는 그 응답에 alert/에러가 있는지 아직 모른다. 사이클 전체가 깨끗했을 때만
+        # 절반씩 원래 간격으로 복귀
+        if not self.troubled:
+            self.backoff = max(1.0, self.backoff / 2)
+        self.troubled = False
+
+    def _increase(self, factor):
+        self.troubled = True
+        self.backoff = min(self.backoff * factor, self.max_backoff_sec)
+
+    def rate_per_min(self):
+        now = time.monotonic()
+        while self.requests and now - self.requests[0] > RATE_WINDOW_SEC:
+            self.requests.popleft()
+        return len(self.requests) * 60.0 / RATE_WINDOW_SEC
+
+    def gauge(self):
+        # Metrics gauge
+        return {"req_per_min": round(self.rate_per_min(), 1), "backoff": round(self.backoff, 2),
+                "poll_errors": self.cnt_error, "poll_alerts": self.cnt_alert, "poll_slow": self.cnt_slow}
+
+
+class RateBudget:
+    """
+    여러 worker 가 나눠 쓰는 분당 요청 수 한도 (token bucket).
+    acquire() 는 토큰이 생길 때까지 기다리고 기다린 시간을 돌려준다.
+    """
+
+    def __init__(self, per_min, burst=1):
+        if per_min <= 0:
+            raise ValueError(f"분당 요청 수는 0보다 커야 합니다: {per_min}")
+        self.rate = per_min / 60.0
+        self.capacity = max(1.0, float(burst))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+        self.total_waited = 0.0
+
+    def acquire(self):
+        waited = 0.0
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    self.total_waited += waited
+                    return waited
+                delay = (1.0 - self.tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def gauge(self):
+        return {"budget_per_min": round(self.rate * 60, 1), "budget_waited_sec": round(self.total_waited, 1)}
@@ -0,0 +1,168 @@
+import os
+import shutil
+import tempfile
+import threading
+
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError
+
+
+from srt_reservation.procstat import browser_pid, cmdline, kill_pids, process_tree, user_data_dirs
+
+# Chrome 이 --user-data-dir 없이 뜰 때 만드는 임시 프로필 이름
+TEMP_PROFILE_PREFIXES = (".org.chromium.Chromium.", ".com.google.Chrome.")
+
+# 브라우저/드라이버가 죽었을 때 나는 예외. chromedriver 자체가 죽으면 WebDriverException 이 아니라
+# urllib3 의 MaxRetryError/ProtocolError 나 ConnectionRefusedError 같은 OSError 로 온다
+DEAD_DRIVER_ERRORS = (WebDriverException, HTTPError, ConnectionError, OSError)
+
+
+class DriverSession:
+    """
+    하나의 Chrome 세션을 재사용한다.
+    예외가 나도 브라우저가 살아있으면 그대로 쓰고, 로그인이 풀렸을 때만 재로그인,
+    브라우저가 죽었을 때만 종료 후 재실행한다.
+    """
+
+    def __init__(self, hunter):
+        self.hunter = hunter
+        self.cnt_launch = 0  # 브라우저 실행 횟수
+        self.cnt_relaunch = 0  # 크래시로 인한 재실행 횟수
+        self.cnt_relogin = 0  # 세션 만료로 인한 재로그인 횟수
+        self.cnt_recycle = 0  # supervisor 요청으로 브라우저를 새로 띄운 횟수
+        self.login_invalid = False  # 화면 밖(HTTP 조회 등)에서 로그인 만료를 확인한 경우
+        self.recycle_reason = None  # 다음 ensure() 에서 브라우저를 새로 띄울 이유
+        self.prelauncher = None  # 설정을 읽는 동안 브라우저를 미리 띄우는 스레드
+        self.prelaunch_error = None
+
+    @property
+    def driver(self):
+        return getattr(self.hunter, "driver", None)
+
+    def is_alive(self):
+        if self.driver is None:
+            return False
+        try:
+            # 브라우저/드라이버가 죽었으면 여기서 예외 (DEAD_DRIVER_ERRORS)
+            _ = self.driver.window_handles
+            return True
+        except DEAD_DRIVER_ERRORS:
+            return False
+
+    def request_recycle(self, reason):
+        # 다른 스레드(supervisor)에서 호출. 실제 재실행은 루프가 ensure() 에 올 때 한다
+        self.recycle_reason = reason
+
+    @property
+    def recycle_requested(self):
+        return self.recycle_reason is not None
+
+    def invalidate_login(self):
+        self.login_invalid = True
+
+    def is_logged_in(self):
+        if self.login_invalid:
+            return False
+        try:
+            return self.hunter.check_login()
+        except DEAD_DRIVER_ERRORS:
+            return False
+
+    def ensure(self):
+        """검색 직전에 호출. 세션을 쓸 수 있는 상태로 만든다."""
+        if self.driver is None:
+            self.launch()
+            return
+
+        if self.recycle_requested:
+            print(f"브라우저 재시작: {self.recycle_reason}")
+            self.quit()
+            self.cnt_recycle += 1
+            self.launch()
+            return
+
+        if not self.is_alive():
+            print("브라우저 비정상 종료. 재실행")
+            self.quit()
+            self.cnt_relaunch += 1
+            self.launch()
+            return
+
+        if not self.is_logged_in():
+            print("로그인 만료. 재로그인")
+            self.cnt_relogin += 1
+            self.login()
+
+    def prelaunch(self):
+        # 브라우저 실행은 설정 로딩(Slack, 기록 DB, 검색 목표 등)과 겹쳐서 진행한다
+        def work():
+            try:
+                self.hunter.run_driver()
+            except Exception as e:
+                self.prelaunch_error = e
+
+        self.prelauncher = threading.Thread(target=work, name="prelaunch", daemon=True)
+        self.prelauncher.start()
+
+    def take_prelaunched(self):
+        # 미리 띄운 브라우저가 있으면 기다렸다가 쓴다. 실행 실패는 여기서 다시 raise
+        if self.prelauncher is None:
+            return False
+        self.prelauncher.join()
+        self.prelauncher = None
+        error, self.prelaunch_error = self.prelaunch_error, None
+        if error is not None:
+            raise error
+        return True
+
+    def launch(self):
+        self.recycle_reason = None
+        self.cnt_launch += 1
+        if not self.take_prelaunched():
+            self.hunter.run_driver()
+        self.login()
+
+    def login(self):
+        print("Login")
+        self.login_invalid = False
+        srt = self.hunter.srt
+        self.hunter.login(srt.login_id, srt.login_pwd)
+
+    def quit(self):
+        if self.prelauncher is not None:
+            try:
+                self.take_prelaunched()
+            except Exception as e:
+                print(e)
+        driver = self.driver
+        self.hunter.driver = None
+        if driver is None:
+            return
+
+        pid = browser_pid(driver)
+        pids = process_tree(pid) if pid is not None else []
+        cmdlines = {p: cmdline(p) for p in pids}
+        profiles = user_data_dirs(pids)
+        try:
+            driver.quit()
+        except Exception as e:
+            print(e)
+
+        # quit 이 실패했거나 남은 자식 프로세스, 이 브라우저가 만든 임시 프로필만 정리
+        # (pid 재사용에 대비해 cmdline 이 그대로인 프로세스만)
+        kill_pids([p for p in pids if cmdlines[p] and cmdline(p) == cmdlines[p]])
+        for path in profiles:
+            if os.path.basename(path).startswith(TEMP_PROFILE_PREFIXES) \
+                    and os.path.dirname(os.path.abspath(path)) == tempfile.gettempdir():
+                shutil.rmtree(path, ignore_errors=True)
+
+    def stats(self):
+        return {
+            "launch": self.cnt_launch,
+            "relaunch": self.cnt_relaunch,
+            "relogin": self.cnt_relogin,
+            "recycle": self.cnt_recycle,
+        }
+
+    def to_string(self):
+        return f"브라우저 실행 {self.cnt_launch}회 (재실행 {self.cnt_relaunch}회, 재시작 {self.cnt_recycle}회), 재로그인 {self.cnt_relogin}회"
@@ -1,39 +1,138 @@
+import atexit
 import os
+import threading
+import time
+
 import requests
 
+SLACK_API_URL = "https://slack.com/api/chat.postMessage"
+SLACK_TIMEOUT_SEC = (3, 10)  # (connect, read)
+MAX_RETRY = 4
+RETRY_BASE_SEC = 1.0
+FLUSH_TIMEOUT_SEC = 10
+
+
+def read_slack_file(filename):
+    # 토큰/채널 파일은 패키지 폴더 기준
+    with open(f"{os.path.dirname(os.path.abspath(__file__))}/{filename}", "r") as f:
+        return f.read().strip()
+
+
 class SlackBot:
-    def __init__(self, token_file, channel_file):
+    """
+    메시지는 큐에 넣고 백그라운드 스레드가 보낸다. 예약/결제 흐름은 Slack 응답을 기다리지 않는다.
+    같은 coalesce 키를 가진 메시지가 아직 안 나갔으면 최신 것으로 바꿔치기한다. (시작, 메트릭 요약 등)
+    """
+
+    def __init__(self, token_file, channel_file, api_url=SLACK_API_URL):
         self.want_slack = False
         self.token = token_file
         self.channel = channel_file
+        self.api_url = api_url
         if self.token == "None" or self.channel == "None":
             return
 
         try:
-            token_path = f"{os.path.dirname(os.path.abspath(__file__))}/{token_file}"
-            os.stat(token_path)
-            with open(token_path, "r") as f:
-                self.token = f.read().strip()
-        except:
+            self.token = read_slack_file(token_file)
+        except OSError:
             print("Can't use slack bot. Wrong token path.")
             return
 
         try:
-            channel_path = f"{os.path.dirname(os.path.abspath(__file__))}/{channel_file}"
-            os.stat(channel_path)
-            with open(channel_path, "r") as f:
-                self.channel = f.read().strip()
-        except:
+            self.channel = read_slack_file(channel_file)
+        except OSError:
             print("Can't use slack bot. Wrong channel path.")
             return
-        
+
         self.want_slack = True
+        self.start()
 
+    def start(self):
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = f"Bearer {self.token}"
+        self.pending = []  # [(coalesce 키, 메시지)]
+        self.cond = threading.Condition()
+        self.closed = False
+        self.busy = False
+        self.cnt_sent = 0
+        self.cnt_failed = 0
+        self.cnt_coalesced = 0
+        self.worker = threading.Thread(target=self._work, name="slackbot", daemon=True)
+        self.worker.start()
+        atexit.register(self.close)
 
-    def send_slack_bot_msg(self, msg):
+    def send_slack_bot_msg(self, msg, coalesce=None):
         if not self.want_slack: return
         if self.token == "" or self.channel == "": return
         if msg == "": msg = "Empty msg"
 
-        requests.post("https://slack.com/api/chat.postMessage", headers={"Authorization": f"Bearer {self.token}"}, data={"channel": self.channel, "text": msg})
+        with self.cond:
+            if coalesce is not None:
+                for k, (key, _) in enumerate(self.pending):
+                    if key == coalesce:
+                        self.pending[k] = (coalesce, msg)
+                        self.cnt_coalesced += 1
+                        return
+            self.pending.append((coalesce, msg))
+            self.cond.notify()
+
+    def _work(self):
+        while True:
+            with self.cond:
+                while not self.pending and not self.closed:
+                    self.cond.wait()
+                if not self.pending:
+                    return
+                _, msg = self.pending.pop(0)
+                self.busy = True
+            try:
+                self._post(msg)
+            finally:
+                with self.cond:
+                    self.busy = False
+                    self.cond.notify_all()
+
+    def _post(self, msg):
+        delay = RETRY_BASE_SEC
+        for attempt in range(MAX_RETRY):
+            try:
+                res = self.session.post(self.api_url, data={"channel": self.channel, "text": msg},
+                                        timeout=SLACK_TIMEOUT_SEC)
+                if res.status_code == 429:
+                    delay = float(res.headers.get("Retry-After", delay))
+                elif res.status_code < 500:
+                    body = res.json() if res.headers.get("Content-Type", "").startswith("application/json") else {}
+                    if body.get("ok", True):
+                        self.cnt_sent += 1
+                    else:
+                        # 토큰/채널 오류는 재시도해도 같은 결과
+                        self.cnt_failed += 1
+                        print(f"Slack error: {body.get('error')}")
+                    return
+            except (requests.RequestException, ValueError) as e:
+                print(f"Slack error: {e}")
+            if attempt < MAX_RETRY - 1:
+                time.sleep(delay)
+                delay *= 2
+        self.cnt_failed += 1
+
+    def flush(self, timeout=FLUSH_TIMEOUT_SEC):
+        if not self.want_slack: return True
+        deadline = time.monotonic() + timeout
+        with self.cond:
+            while self.pending or self.busy:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
 
+    def close(self, timeout=FLUSH_TIMEOUT_SEC):
+        # 종료 전에 남은 메시지를 보낸다
+        if not self.want_slack or self.closed: return
+        self.flush(timeout)
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
+        self.worker.join(1)
+        self.session.close()
@@ -0,0 +1,196 @@
+import zlib
+from html.parser import HTMLParser
+
+from srt_reservation.locators import (COL_ARR, COL_DPT, COL_RESERVATION, COL_STANDARD_SEAT, COL_TRAIN_NUM,
+                                      COL_TRAIN_TYPE, RESULT_ROWS_SELECTOR)
+from srt_reservation.train import Train
+
+# 검색 결과 표를 한 번의 execute_script 로 읽어온다. (행마다 td 텍스트 배열)
+# 표 전체의 지문(fp)을 함께 계산하고, arguments[2] 의 이전 지문과 같으면 행은 보내지 않는다.
+READ_RESULT_TABLE_JS = """
+var rows = document.querySelectorAll(arguments[0]);
+var limit = Math.min(rows.length, arguments[1]);
+var out = [];
+var fp = 5381;
+for (var i = 0; i < limit; i++) {
+    var tds = rows[i].querySelectorAll("td");
+    var cells = [];
+    for (var k = 0; k < tds.length; k++) {
+        var text = tds[k].innerText;
+        cells.push(text);
+        for (var c = 0; c < text.length; c++) fp = ((fp * 33) ^ text.charCodeAt(c)) >>> 0;
+        fp = ((fp * 33) ^ 9) >>> 0;
+    }
+    out.push(cells);
+}
+fp = ((fp * 33) ^ limit) >>> 0;
+return {fp: fp, rows: (arguments[2] !== null && fp === arguments[2]) ? null : out};
+"""
+
+
+class ResultRow:
+    def __init__(self, idx, train, standard_seat, reservation):
+        self.idx = idx  # tr:nth-child 값 (1부터 시작)
+        self.train = train
+        self.standard_seat = standard_seat  # 일반석 텍스트
+        self.reservation = reservation  # 예약대기 텍스트
+
+    def is_bookable(self):
+        return "예약하기" in self.standard_seat
+
+    def is_reservable(self):
+        return "신청하기" in self.reservation
+
+
+def rows_from_cells(dpt_dt, table):
+    rows = []
+    for i, cells in enumerate(table, start=1):
+        try:
+            train = Train(dpt_dt, cells[COL_TRAIN_TYPE].strip(), cells[COL_TRAIN_NUM].strip(),
+                          cells[COL_DPT], cells[COL_ARR])
+            rows.append(ResultRow(i, train, cells[COL_STANDARD_SEAT], cells[COL_RESERVATION]))
+        except (IndexError, ValueError) as e:
+            # 칸이 모자라거나 형식이 다른 행은 매진 취급
+            print(f"{i}번째 행 파싱 실패: {e}")
+    return rows
+
+
+def read_result_rows(driver, dpt_dt, limit, last_fp=None):
+    """(지문, 행 목록) 을 돌려준다. 표가 last_fp 와 같으면 행 목록은 None"""
+    res = driver.execute_script(READ_RESULT_TABLE_JS, RESULT_ROWS_SELECTOR, limit, last_fp) or {}
+    table = res.get("rows")
+    return res.get("fp"), None if table is None else rows_from_cells(dpt_dt, table)
+
+
+class ChangeTracker:
+    """
+    새로고침 사이에 좌석/예약대기 상태가 바뀐 행만 골라낸다.
+    표 지문이 같으면 행을 읽지도 않고, 바뀐 표에서도 상태가 그대로인 행은 건너뛴다.
+    예약을 시도했던 행처럼 다음에도 다시 봐야 하는 행은 recheck() 로 표시한다.
+    바뀐 행의 새 상태는 모두 처리한 뒤 commit() 해야 저장된다. 처리 중에 예외가 나면
+    다음 diff() 에서 그 행들을 다시 바뀐 행으로 돌려준다.
+    """
+
+    def __init__(self):
+        self.fp = None
+        self.status = dict()  # train key -> (일반석, 예약대기)
+        self.staged = dict()  # 마지막 diff() 에서 바뀐 행의 새 상태 (commit 전)
+        self.pending = set()  # 상태와 상관없이 다음에 다시 볼 train key
+        self.cnt_table_same = 0
+        self.cnt_changed = 0
+        self.cnt_unchanged = 0
+
+    def last_fp(self):
+        # 다시 볼 행이 있거나 지난번 처리가 끝나지 않았으면 표가 같아도 행을 받아야 한다
+        return None if self.pending or self.staged else self.fp
+
+    def same_table(self, fp):
+        self.fp = fp
+        self.cnt_table_same += 1
+
+    def diff(self, fp, rows):
+        # commit 되지 않은 지난번 행도 다시 본다
+        retry = self.pending | self.staged.keys()
+        self.pending = set()
+        self.staged = dict()
+        self.fp = fp
+        changed = []
+        for row in rows:
+            key = row.train.hash()
+            status = (row.standard_seat, row.reservation)
+            if key in retry or self.status.get(key) != status:
+                changed.append(row)
+                self.staged[key] = status
+        self.cnt_changed += len(changed)
+        self.cnt_unchanged += len(rows) - len(changed)
+        return changed
+
+    def commit(self):
+        # diff() 로 받은 행을 모두 처리했을 때 호출
+        self.status.update(self.staged)
+        self.staged.clear()
+
+    def recheck(self, key):
+        self.pending.add(key)
+
+    def reset(self):
+        self.fp = None
+        self.status.clear()
+        self.staged.clear()
+        self.pending.clear()
+
+    def stats(self):
+        return {"tables_same": self.cnt_table_same, "rows_changed": self.cnt_changed,
+                "rows_unchanged": self.cnt_unchanged}
+
+
+class ResultTableParser(HTMLParser):
+    """page_source/HTTP 응답에서 #result-form 결과 표의 td 텍스트만 뽑는다."""
+
+    BLOCK_TAGS = {"br", "div", "p", "li"}
+
+    def __init__(self, limit):
+        super().__init__(convert_charrefs=True)
+        self.limit = limit
+        self.table = []
+        self.form_depth = 0  # #result-form 안쪽 form 깊이
+        self.in_tbody = False
+        self.row = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "form":
+            if self.form_depth or dict(attrs).get("id") == "result-form":
+                self.form_depth += 1
+            return
+        if not self.form_depth:
+            return
+        if tag == "tbody":
+            self.in_tbody = True
+        elif tag == "tr" and self.in_tbody and len(self.table) < self.limit:
+            self.row = []
+        elif tag == "td" and self.row is not None:
+            self.cell = []
+        elif tag in self.BLOCK_TAGS and self.cell is not None:
+            self.cell.append("\n")
+
+    def handle_endtag(self, tag):
+        if tag == "form" and self.form_depth:
+            self.form_depth -= 1
+        elif tag == "tbody":
+            self.in_tbody = False
+        elif tag == "td" and self.cell is not None:
+            text = "".join(self.cell)
+            self.row.append("\n".join(line.strip() for line in text.split("\n") if line.strip()))
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            self.table.append(self.row)
+            self.row = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def html_table_fp(html):
+    # HTTP 응답에서 결과 표 부분만 지문으로
+    start = html.find("result-form")
+    if start < 0:
+        return None
+    end = html.find("</table>", start)
+    return zlib.crc32(html[start:end if end > 0 else len(html)].encode("utf-8"))
+
+
+def has_result_table(html):
+    return 'id="result-form"' in html or "id='result-form'" in html
+
+
+def read_result_rows_from_html(html, dpt_dt, limit, last_fp=None):
+    """read_result_rows 와 같이 (지문, 행 목록). 표가 last_fp 와 같으면 파싱하지 않는다"""
+    fp = html_table_fp(html)
+    if last_fp is not None and fp == last_fp:
+        return fp, None
+    parser = ResultTableParser(limit)
+    parser.feed(html)
+    parser.close()
+    return fp, rows_from_cells(dpt_dt, parser.table)
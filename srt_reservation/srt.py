@@ -1,8 +1,12 @@
+import hashlib
+import json
 import os
 
 from collections import defaultdict
 from datetime import datetime
 
+from srt_reservation.train import to_minute
+from srt_reservation.train_filter import TrainFilter, parse_time_windows, parse_train_nums
 from srt_reservation.validation import station_list, num_station_list
 
 class SRT:
@@ -18,6 +22,17 @@ class SRT:
 
         self.want_reserve = False
         self.greedy = False
+        self.adult = 1
+        self.kid = 0
+        self.elder = 0
+
+        self.exact_tms = []
+        self.time_windows = []
+        self.allow_train_nums = frozenset()
+        self.deny_train_nums = frozenset()
+        self.max_dpt_minute = None
+        self.max_arr_minute = None
+        self.filter = TrainFilter()
 
         self.dpt_stn = dpt if not str.isdigit(dpt) else num_station_list[int(dpt)]
         if self.dpt_stn not in station_list:
@@ -41,8 +56,16 @@ class SRT:
 
         self.is_num_auto_set = False
         self.is_dpt_tm_auto_set = False
+        self.rows_to_check = None  # 시간표로 정한 결과 표 확인 행 수. None 이면 num_trains_to_check
+        self.timetable_base = None  # 시간표로 바꾸기 전 (dpt_tm, auto 여부)
+        self.digest = None  # 검색 설정 요약 (search_digest)
                
         self.gotcha = 0
+        self.done = False  # 이 검색 목표의 예약이 끝났는지
+        self.announced = False  # 시작 메시지를 보냈는지
+
+    def label(self):
+        return f"{self.dpt_stn}▶{self.arr_stn} {self.dpt_dt} {self.dpt_tm}시"
 
     def set_dpt_tm(self, dpt_tm):
         dpt_tm = str(dpt_tm) if int(dpt_tm) % 2 == 0 else str(int(dpt_tm) - 1)
@@ -53,13 +76,16 @@ class SRT:
         self.booked = defaultdict(lambda: False)
         self.reserved = defaultdict(lambda: False)
 
+    def row_limit(self):
+        # 결과 표에서 확인할 행 수. greedy 예약 개수는 계속 num_trains_to_check 로 센다
+        return self.rows_to_check if self.rows_to_check is not None else self.num_trains_to_check
+
     def set_exact_tms(self, exact_tms):
         self.exact_tms = exact_tms
         if len(self.exact_tms) > 0:
             self.exact_tms = self.exact_tms.split(",")
             self.exact_tms.sort(key = lambda x: tuple(map(int, x.split(":"))))
             self.min_exact_tm = tuple(map(int, self.exact_tms[0].split(":")))
-            self.max_exact_tm = tuple(map(int, self.exact_tms[-1].split(":")))
             if self.num_trains_to_check < 10:
                 self.num_trains_to_check = 10
                 self.is_num_auto_set = True
@@ -68,6 +94,39 @@ class SRT:
                 self.is_dpt_tm_auto_set = True
         return self
 
+    def set_time_windows(self, windows):
+        # "08:00-10:00,18:00-20:00"
+        self.time_windows = parse_time_windows(windows) if windows else []
+        return self
+
+    def set_train_nums(self, allow, deny):
+        # "301,303"
+        self.allow_train_nums = parse_train_nums(allow) if allow else frozenset()
+        self.deny_train_nums = parse_train_nums(deny) if deny else frozenset()
+        return self
+
+    def set_max_tms(self, max_dpt_tm, max_arr_tm):
+        # "12:00" 이후 출발/도착하는 기차 제외
+        self.max_dpt_minute = to_minute(max_dpt_tm) if max_dpt_tm else None
+        self.max_arr_minute = to_minute(max_arr_tm) if max_arr_tm else None
+        return self
+
+    def compile_filter(self):
+        # 설정이 끝난 뒤 한 번만 만든다. 행마다 TrainFilter.decide() 로 판단
+        self.filter = TrainFilter.from_srt(self)
+        self.search_digest()
+        return self
+
+    def search_digest(self):
+        # 시각/필터/범위/인원/예약대기/greedy 설정의 요약. 실행 기록(state.py)의 키로 쓴다.
+        # 시간표(timetable)가 나중에 dpt_tm 을 바꾸므로 설정이 끝났을 때의 값을 계속 쓴다
+        if self.digest is None:
+            config = [self.dpt_tm, self.exact_tms, self.time_windows, sorted(self.allow_train_nums),
+                      sorted(self.deny_train_nums), self.max_dpt_minute, self.max_arr_minute, self.num_trains_to_check,
+                      self.want_reserve, self.greedy, self.adult, self.kid, self.elder]
+            self.digest = hashlib.sha1(json.dumps(config).encode("utf-8")).hexdigest()[:12]
+        return self.digest
+
     def set_want_reserve(self, reserve):
         self.want_reserve = reserve
         return self
@@ -0,0 +1,186 @@
+"""
+실행 전 검사와 드라이버 확인.
+잘못된 설정은 브라우저를 띄우기 전에 한 번에 모아서 알려주고,
+chromedriver/Chrome 경로와 버전은 캐시 파일에 저장해 다음 실행부터는 다시 찾지 않는다.
+selenium 은 여기서 읽지 않는다. (검사가 끝난 뒤 SRThunter 를 import 할 때 읽힌다)
+"""
+import json
+import os
+import re
+import shutil
+import subprocess
+from datetime import datetime
+
+from srt_reservation.card import Card
+from srt_reservation.scheduler import load_time_windows
+from srt_reservation.slackbot import read_slack_file
+from srt_reservation.targets import load_targets
+
+DEFAULT_DRIVER_CACHE = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "driver.json")
+
+CHROME_NAMES = ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome")
+
+
+class StartupError(Exception):
+    pass
+
+
+class DriverBinaries:
+    def __init__(self, chromedriver, chrome=None, chrome_version=None, cached=False):
+        self.chromedriver = chromedriver
+        self.chrome = chrome  # None 이면 chromedriver 가 기본 위치에서 찾는다
+        self.chrome_version = chrome_version
+        self.cached = cached
+
+    def to_string(self):
+        return f"chromedriver {self.chromedriver}, Chrome {self.chrome or '기본'} {self.chrome_version or ''}".strip()
+
+
+def find_chrome():
+    path = os.getenv("CHROME_PATH")
+    if path:
+        return path
+    for name in CHROME_NAMES:
+        path = shutil.which(name)
+        if path:
+            return path
+    return None
+
+
+def chrome_version(chrome):
+    try:
+        out = subprocess.run([chrome, "--version"], capture_output=True, text=True, timeout=10).stdout
+    except (OSError, subprocess.SubprocessError):
+        return None
+    m = re.search(r"\d+(\.\d+)+", out)
+    return m.group(0) if m else None
+
+
+def _mtime(path):
+    if path is None:
+        return None
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return None
+
+
+def _is_executable(path):
+    return path is not None and os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _load_cache(path, chrome):
+    try:
+        with open(path, "r") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return None
+    # 드라이버가 지워졌거나 Chrome 이 업데이트(경로/mtime 변경)됐으면 다시 찾는다
+    if not _is_executable(cache.get("chromedriver")):
+        return None
+    if cache.get("chrome") != chrome or cache.get("chrome_mtime") != _mtime(chrome):
+        return None
+    return DriverBinaries(cache["chromedriver"], chrome, cache.get("chrome_version"), cached=True)
+
+
+def _save_cache(path, binaries):
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"chromedriver": binaries.chromedriver, "chrome": binaries.chrome,
+                   "chrome_version": binaries.chrome_version, "chrome_mtime": _mtime(binaries.chrome),
+                   "resolved_at": datetime.now().isoformat(timespec="seconds")}, f)
+    os.replace(tmp, path)
+
+
+def resolve_binaries(cache_path=DEFAULT_DRIVER_CACHE):
+    """
+    CHROMEDRIVER_PATH 가 있으면 그대로 쓰고, 없으면 캐시 -> webdriver_manager 순서로 찾는다.
+    캐시가 맞으면 Chrome 버전 확인(--version 실행)과 webdriver_manager 조회를 모두 건너뛴다.
+    """
+    chrome = find_chrome()
+    env_driver = os.getenv("CHROMEDRIVER_PATH")
+    if env_driver:
+        if not _is_executable(env_driver):
+            raise StartupError(f"CHROMEDRIVER_PATH 를 실행할 수 없습니다. {env_driver}")
+        return DriverBinaries(env_driver, chrome)
+
+    if cache_path is not None:
+        binaries = _load_cache(cache_path, chrome)
+        if binaries is not None:
+            return binaries
+
+    try:
+        from webdriver_manager.chrome import ChromeDriverManager
+        driver = ChromeDriverManager().install()
+    except Exception as e:
+        raise StartupError(f"chromedriver 를 찾을 수 없습니다. CHROMEDRIVER_PATH 를 지정해주세요. ({e})")
+
+    binaries = DriverBinaries(driver, chrome, chrome_version(chrome) if chrome else None)
+    if cache_path is not None:
+        try:
+            _save_cache(cache_path, binaries)
+        except OSError as e:
+            print(f"드라이버 캐시 저장 실패: {e}")
+    return binaries
+
+
+def check_args(cli_args):
+    errors = []
+    if not cli_args.user:
+        errors.append("--user 가 없습니다.")
+    if not cli_args.psw:
+        errors.append("--psw 가 없습니다.")
+    if cli_args.num < 1:
+        errors.append(f"--num 은 1 이상이어야 합니다. {cli_args.num}")
+    if min(cli_args.adult, cli_args.kid, cli_args.elder) < 0 \
+            or not 1 <= cli_args.adult + cli_args.kid + cli_args.elder <= 9:
+        errors.append("승객 수는 합쳐서 1~9명이어야 합니다.")
+    if cli_args.poll_min < 0 or cli_args.poll_min > cli_args.poll_max:
+        errors.append(f"--poll_min/--poll_max 범위가 잘못 되었습니다. {cli_args.poll_min} ~ {cli_args.poll_max}")
+    if cli_args.tabs < 1:
+        errors.append(f"--tabs 는 1 이상이어야 합니다. {cli_args.tabs}")
+
+    # 역/날짜/시간/필터는 SRT 를 만들면서 검사된다
+    try:
+        load_targets(cli_args)
+    except Exception as e:
+        errors.append(f"검색 목표 오류: {e}")
+
+    if cli_args.poll_profile != "None":
+        try:
+            load_time_windows(cli_args.poll_profile)
+        except Exception as e:
+            errors.append(f"--poll_profile 오류: {e}")
+
+    try:
+        Card(cli_args.checkout, strict=True)
+    except Exception as e:
+        errors.append(str(e))
+
+    errors.extend(check_slack(cli_args.slack))
+    return errors
+
+
+def check_slack(slack):
+    names = slack.strip().split(' ')
+    if len(names) != 2:
+        return [f"--slack 은 '토큰파일 채널파일' 형식이어야 합니다. {slack}"]
+    if "None" in names:
+        return []
+    errors = []
+    for kind, name in zip(("token", "channel"), names):
+        try:
+            if read_slack_file(name) == "":
+                errors.append(f"Slack {kind} 파일이 비어 있습니다. {name}")
+        except OSError:
+            errors.append(f"Slack {kind} 파일을 읽을 수 없습니다. {name}")
+    return errors
+
+
+def validate(cli_args, cache_path=DEFAULT_DRIVER_CACHE):
+    """설정을 모두 검사하고 드라이버를 확인한다. 문제가 있으면 한 번에 StartupError"""
+    errors = check_args(cli_args)
+    if errors:
+        raise StartupError("\n".join(errors))
+    return resolve_binaries(cache_path)
@@ -0,0 +1,90 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+DEFAULT_STATE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "state.sqlite3")
+
+BOOKED = "booked"
+RESERVED = "reserved"
+ANNOUNCED = "announced"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS hunt_events (
+    target TEXT NOT NULL,
+    train TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    at TEXT NOT NULL,
+    PRIMARY KEY (target, train, kind)
+)
+"""
+
+
+def target_key(srt):
+    # Train.hash() 에는 날짜가 없으므로 구간/날짜를 함께 키로 쓴다.
+    # 같은 구간/날짜라도 시각/필터/범위 등 검색 설정이 다르면 다른 검색으로 본다
+    return f"{srt.login_id}|{srt.dpt_stn}|{srt.arr_stn}|{srt.dpt_dt}|{srt.search_digest()}"
+
+
+class HuntStore:
+    """
+    예약/예약대기/시작 알림 기록을 SQLite 에 남긴다.
+    이벤트마다 한 트랜잭션으로 바로 commit 하므로 프로세스가 죽어도 기록은 남고,
+    다시 시작하면 restore() 로 SRT.booked/reserved/gotcha 를 되살린다.
+    """
+
+    def __init__(self, path=DEFAULT_STATE_FILE):
+        self.path = path
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.execute(SCHEMA)
+
+    def restore(self, srt):
+        key = target_key(srt)
+        with self.lock:
+            rows = self.conn.execute("SELECT train, kind FROM hunt_events WHERE target = ?", (key,)).fetchall()
+        for train, kind in rows:
+            if kind == BOOKED:
+                srt.booked[train] = True
+            elif kind == RESERVED:
+                srt.reserved[train] = True
+            elif kind == ANNOUNCED:
+                srt.announced = True
+        srt.gotcha = sum(1 for _, kind in rows if kind == BOOKED)
+        if srt.gotcha > 0 and (not srt.greedy or srt.gotcha >= srt.num_trains_to_check):
+            srt.done = True
+        return len(rows)
+
+    def record(self, srt, train, kind):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO hunt_events (target, train, kind, at) VALUES (?, ?, ?, ?)",
+                                  (target_key(srt), train, kind, datetime.now().isoformat(timespec="seconds")))
+
+    def clear(self, srt):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("DELETE FROM hunt_events WHERE target = ?", (target_key(srt),))
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+
+class NullStore:
+    # --state_file None 일 때
+    def restore(self, srt):
+        return 0
+
+    def record(self, srt, train, kind):
+        pass
+
+    def clear(self, srt):
+        pass
+
+    def close(self):
+        pass
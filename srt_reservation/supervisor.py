@@ -0,0 +1,141 @@
+"""
+SRThunter 를 감시하면서 필요할 때만 브라우저를 새로 띄운다.
+run.sh 의 30분 timeout, drop_caches, /tmp 일괄 삭제 대신 사용한다.
+
+    python -m srt_reservation.supervisor --user ... --dpt ... --max_browser_mb 1500 --hang_sec 300
+"""
+import os
+import sys
+import threading
+import time
+
+from srt_reservation.procstat import ProcessSampler, browser_pid, kill_pids, process_tree, sample_pid, to_mb
+
+EXIT_BOT_MEMORY = 3  # 파이썬 프로세스 자체 메모리 초과. run.sh 가 다시 띄운다
+
+
+class Supervisor:
+    def __init__(self, hunter, max_browser_mb=1500, max_growth_mb=600, max_bot_mb=500, hang_sec=300,
+                 max_cpu_pct=95, cpu_checks=10, check_sec=10):
+        self.hunter = hunter
+        self.max_browser_mb = max_browser_mb
+        self.max_growth_mb = max_growth_mb  # 브라우저 실행 직후 대비 증가량
+        self.max_bot_mb = max_bot_mb
+        self.hang_sec = hang_sec  # 이 시간 동안 사이클이 하나도 안 끝나면 멈춘 것으로 본다
+        self.max_cpu_pct = max_cpu_pct
+        self.cpu_checks = cpu_checks  # CPU 과다가 연속 몇 번이면 재시작할지
+        self.check_sec = check_sec
+
+        self.stopped = threading.Event()
+        self.exit_code = 0
+        self.browser = None  # 현재 브라우저의 ProcessSampler
+        self.baseline_rss = None
+        self.cnt_hot = 0
+        self.last_cycle = -1
+        self.last_progress_at = time.monotonic()
+        self.cnt_recycle_memory = 0
+        self.cnt_recycle_hang = 0
+        self.cnt_recycle_cpu = 0
+
+    def run(self):
+        monitor = threading.Thread(target=self._monitor, name="supervisor", daemon=True)
+        monitor.start()
+        try:
+            self.hunter.run()
+        finally:
+            self.stopped.set()
+            monitor.join(self.check_sec)
+            print(self.to_string())
+        return self.exit_code
+
+    def _monitor(self):
+        while not self.stopped.wait(self.check_sec):
+            try:
+                self.check()
+            except Exception as e:
+                print(f"supervisor: {e}")
+
+    def check(self):
+        now = time.monotonic()
+        cycles = self.hunter.metrics.cnt_cycle
+        if cycles != self.last_cycle:
+            self.last_cycle = cycles
+            self.last_progress_at = now
+
+        bot = sample_pid(os.getpid())
+        if self.max_bot_mb and to_mb(bot["rss"]) > self.max_bot_mb:
+            print(f"supervisor: 봇 메모리 {to_mb(bot['rss'])}MB 초과. 종료 후 재시작 필요")
+            self.exit_code = EXIT_BOT_MEMORY
+            self.hunter.stop()
+            return
+
+        driver = self.hunter.driver
+        pid = browser_pid(driver) if driver is not None else None
+        if pid is None:
+            self.browser = None
+            return
+        if self.browser is None or self.browser.pid != pid:
+            # 새 브라우저. 기준 메모리를 다시 잡는다
+            self.browser = ProcessSampler(pid)
+            self.baseline_rss = None
+            self.cnt_hot = 0
+        s = self.browser.sample()
+        rss_mb = to_mb(s["rss"])
+        if self.baseline_rss is None:
+            self.baseline_rss = rss_mb
+
+        session = self.hunter.session
+        if session.recycle_requested:
+            return
+
+        if now - self.last_progress_at > self.hang_sec:
+            # 루프가 WebDriver 호출에서 멈춰 있으므로 브라우저를 죽여서 예외로 빠져나오게 한다
+            print(f"supervisor: {int(now - self.last_progress_at)}초 동안 진행 없음. 브라우저 종료")
+            self.cnt_recycle_hang += 1
+            session.request_recycle("hang")
+            kill_pids([p for p in process_tree(pid) if p != pid])
+            self.last_progress_at = now
+            return
+
+        if self.max_browser_mb and rss_mb > self.max_browser_mb:
+            self.cnt_recycle_memory += 1
+            session.request_recycle(f"browser rss {rss_mb}MB > {self.max_browser_mb}MB")
+            return
+
+        if self.max_growth_mb and rss_mb - self.baseline_rss > self.max_growth_mb:
+            self.cnt_recycle_memory += 1
+            session.request_recycle(f"browser rss +{round(rss_mb - self.baseline_rss, 1)}MB")
+            return
+
+        self.cnt_hot = self.cnt_hot + 1 if s["cpu_pct"] > self.max_cpu_pct else 0
+        if self.cpu_checks and self.cnt_hot >= self.cpu_checks:
+            self.cnt_recycle_cpu += 1
+            self.cnt_hot = 0
+            session.request_recycle(f"browser cpu {s['cpu_pct']}% x{self.cpu_checks}")
+
+    def to_string(self):
+        return f"supervisor: 메모리 재시작 {self.cnt_recycle_memory}회, 멈춤 재시작 {self.cnt_recycle_hang}회, " \
+               f"CPU 재시작 {self.cnt_recycle_cpu}회"
+
+
+def supervise(cli_args, binaries=None):
+    from srt_reservation.SRThunter import SRThunter
+
+    hunter = SRThunter(cli_args, binaries)
+    supervisor = Supervisor(hunter, max_browser_mb=cli_args.max_browser_mb, max_growth_mb=cli_args.max_growth_mb,
+                            max_bot_mb=cli_args.max_bot_mb, hang_sec=cli_args.hang_sec,
+                            max_cpu_pct=cli_args.max_cpu_pct, check_sec=cli_args.check_sec)
+    return supervisor.run()
+
+
+if __name__ == "__main__":
+    from srt_reservation.cli import parse_args
+    from srt_reservation.startup import StartupError, validate
+
+    args = parse_args()
+    try:
+        binaries = validate(args, None if args.driver_cache == "None" else args.driver_cache)
+    except StartupError as e:
+        print(e)
+        sys.exit(2)
+    sys.exit(supervise(args, binaries))
@@ -0,0 +1,97 @@
+import json
+
+from srt_reservation.srt import SRT
+
+# 검색 목표별로 바꿀 수 있는 항목. 빠진 항목은 커맨드라인 값을 쓴다.
+TARGET_KEYS = ("dpt", "arr", "dt", "tm", "num", "adult", "kid", "elder", "exact_times", "reserve", "greedy",
+               "time_windows", "trains", "exclude_trains", "max_dpt_tm", "max_arr_tm")
+
+
+def build_srt(cli_args, overrides=None):
+    from srt_reservation.cli import str2bool  # cli -> startup -> targets
+
+    a = {key: getattr(cli_args, key) for key in TARGET_KEYS}
+    a.update(overrides or {})
+
+    srt = SRT(str(a["dpt"]), str(a["arr"]), str(a["dt"]), a["tm"], int(a["num"]))
+    srt.set_user_info(cli_args.user, cli_args.psw) \
+        .set_adult(int(a["adult"])) \
+        .set_kid(int(a["kid"])) \
+        .set_elder(int(a["elder"])) \
+        .set_exact_tms(a["exact_times"]) \
+        .set_want_reserve(str2bool(a["reserve"])) \
+        .set_greedy(str2bool(a["greedy"])) \
+        .set_time_windows(a["time_windows"]) \
+        .set_train_nums(str(a["trains"]), str(a["exclude_trains"])) \
+        .set_max_tms(a["max_dpt_tm"], a["max_arr_tm"]) \
+        .compile_filter()
+    return srt
+
+
+def load_targets(cli_args):
+    """
+    --targets 파일이 있으면 목록의 각 항목마다 SRT 를 만든다.
+    [{"dpt": "동탄", "arr": "동대구", "dt": "20220117", "tm": "08"},
+     {"dpt": "동대구", "arr": "동탄", "dt": "20220119", "tm": "18", "exact_times": "18:30"}]
+    """
+    if cli_args.targets == "None":
+        return [build_srt(cli_args)]
+
+    with open(cli_args.targets, "r") as f:
+        entries = json.load(f)
+    if len(entries) == 0:
+        raise Exception(f"검색 목표가 없습니다. {cli_args.targets}")
+    return [build_srt(cli_args, entry) for entry in entries]
+
+
+class TabPool:
+    """
+    한 브라우저 세션 안에서 검색 목표별로 탭을 나눠 쓴다. 탭 수는 max_tabs 로 제한하고,
+    목표가 더 많으면 가장 오래 안 쓴 탭에서 다시 검색한다.
+    """
+
+    def __init__(self, max_tabs=1):
+        self.max_tabs = max(1, max_tabs)
+        self.driver = None
+        self.handles = []
+        self.loaded = dict()  # handle -> 그 탭에 결과가 떠 있는 SRT
+        self.used_at = dict()  # handle -> 마지막 사용 순번
+        self.cnt_use = 0
+
+    def reset(self, driver):
+        self.driver = driver
+        self.handles = [driver.current_window_handle]
+        self.loaded = dict()
+        self.used_at = dict()
+
+    def acquire(self, driver, srt):
+        """srt 를 조회할 탭으로 전환하고 (handle, 이미 결과가 떠 있는지) 를 돌려준다."""
+        if driver is not self.driver:
+            self.reset(driver)
+
+        handle = next((h for h in self.handles if self.loaded.get(h) is srt), None)
+        if handle is None:
+            if len(self.handles) < self.max_tabs:
+                driver.switch_to.new_window("tab")
+                handle = driver.current_window_handle
+                self.handles.append(handle)
+            else:
+                handle = min(self.handles, key=lambda h: self.used_at.get(h, -1))
+
+        if driver.current_window_handle != handle:
+            driver.switch_to.window(handle)
+        self.cnt_use += 1
+        self.used_at[handle] = self.cnt_use
+        return handle, self.loaded.get(handle) is srt
+
+    def current(self):
+        return self.driver.current_window_handle if self.driver is not None else None
+
+    def mark_loaded(self, handle, srt):
+        self.loaded[handle] = srt
+
+    def mark_unloaded(self, handle=None):
+        self.loaded.pop(handle if handle is not None else self.current(), None)
+
+    def invalidate(self):
+        self.loaded = dict()
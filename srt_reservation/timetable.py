@@ -0,0 +1,150 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+
+from srt_reservation.train import Train, to_minute
+from srt_reservation.train_filter import ACCEPT, STOP
+from srt_reservation.validation import station_code
+
+DEFAULT_TIMETABLE_FILE = os.path.join(os.path.expanduser("~"), ".cache", "srt_reservation", "timetable.sqlite3")
+
+# 검색 직후 시간표를 배울 때 읽는 최대 행 수
+TIMETABLE_ROWS = 40
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS timetable (
+    route TEXT NOT NULL,
+    dt TEXT NOT NULL,
+    from_minute INTEGER NOT NULL,
+    trains TEXT NOT NULL,
+    at TEXT NOT NULL,
+    PRIMARY KEY (route, dt)
+)
+"""
+
+
+def route_key(srt):
+    # 역 이름 대신 validation.station_list 의 번호로 (숫자로 입력해도 같은 키)
+    return f"{station_code(srt.dpt_stn)}-{station_code(srt.arr_stn)}"
+
+
+def train_entry(train):
+    return [train.train_type, train.train_num, train.dpt_time, train.arr_time]
+
+
+class TimetableCache:
+    """
+    구간/날짜별 시간표(출발 시각, 열차번호, 도착 시각)를 SQLite 에 남긴다.
+    검색 결과로 배우고, 다음부터는 원하는 기차만 보이도록 가장 늦은 dptTm 과
+    확인할 행 수(rows_to_check)를 정한다. 같은 위치의 기차가 달라지면 시간표를 새로 쓴다.
+    """
+
+    def __init__(self, path=DEFAULT_TIMETABLE_FILE):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(SCHEMA)
+        self.cnt_learned = 0
+        self.cnt_invalidated = 0
+
+    def load(self, srt):
+        with self.lock:
+            row = self.conn.execute("SELECT from_minute, trains FROM timetable WHERE route = ? AND dt = ?",
+                                    (route_key(srt), srt.dpt_dt)).fetchone()
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def save(self, srt, from_minute, trains):
+        with self.lock:
+            with self.conn:
+                self.conn.execute("INSERT OR REPLACE INTO timetable (route, dt, from_minute, trains, at) VALUES (?, ?, ?, ?, ?)",
+                                  (route_key(srt), srt.dpt_dt, from_minute, json.dumps(trains, ensure_ascii=False),
+                                   datetime.now().isoformat(timespec="seconds")))
+
+    def observe(self, srt, rows):
+        """
+        방금 검색한 결과 표(rows)로 시간표를 갱신한다. 저장된 시간표가 바뀌었으면 True
+        rows 는 현재 dptTm 부터의 결과이므로 저장된 시간표의 같은 구간과 비교한다.
+        """
+        if not rows:
+            return False
+        from_minute = int(srt.dpt_tm) * 60
+        seen = [train_entry(row.train) for row in rows]
+        cached = self.load(srt)
+        if cached is None:
+            self.save(srt, from_minute, seen)
+            self.cnt_learned += 1
+            return True
+
+        cached_from, trains = cached
+        # 둘 다 본 시간대에서 같은 위치의 기차를 비교한다
+        lo = max(cached_from, from_minute)
+        seen_lo = [t for t in seen if to_minute(t[2]) >= lo]
+        cached_lo = [t for t in trains if to_minute(t[2]) >= lo]
+        n = min(len(seen_lo), len(cached_lo))
+        if seen_lo[:n] != cached_lo[:n]:
+            print(f"{srt.label()} 시간표 변경 감지")
+            self.save(srt, from_minute, seen)
+            self.cnt_invalidated += 1
+            return True
+
+        # 더 넓게 본 부분만 합친다
+        merged = [t for t in trains if to_minute(t[2]) < from_minute] + seen + cached_lo[len(seen_lo):]
+        merged_from = min(cached_from, from_minute)
+        if merged == trains and merged_from == cached_from:
+            return False
+        self.save(srt, merged_from, merged)
+        self.cnt_learned += 1
+        return True
+
+    def plan(self, srt):
+        """
+        저장된 시간표로 srt 의 dptTm 과 확인할 행 수를 정한다. 시간표가 없거나
+        원하는 기차를 알 수 없으면 처음 설정으로 되돌린다.
+        """
+        if srt.timetable_base is None:
+            srt.timetable_base = (srt.dpt_tm, srt.is_dpt_tm_auto_set)
+        srt.dpt_tm, srt.is_dpt_tm_auto_set = srt.timetable_base
+        srt.rows_to_check = None
+
+        cached = self.load(srt)
+        if cached is None or not srt.filter.has_conditions():
+            return False
+        cached_from, trains = cached
+        base_minute = int(srt.dpt_tm) * 60
+        candidates = [Train(srt.dpt_dt, t[0], t[1], f"{srt.dpt_stn} {t[2]}", f"{srt.arr_stn} {t[3]}")
+                      for t in trains if to_minute(t[2]) >= base_minute]
+        if cached_from > base_minute or len(candidates) == 0:
+            return False
+
+        decisions = [srt.filter.decide(train) for train in candidates]
+        wanted = [train for train, d in zip(candidates, decisions) if d == ACCEPT]
+        if len(wanted) == 0:
+            return False
+
+        # 원하는 첫 기차가 들어가는 가장 늦은 짝수 시각
+        bucket = wanted[0].dpt_minute // 120 * 2
+        visible = [train for train in candidates if train.dpt_minute >= bucket * 60]
+        srt.set_dpt_tm(bucket)
+        srt.is_dpt_tm_auto_set = srt.dpt_tm != srt.timetable_base[0]
+
+        # 시간표 안에서 원하는 기차가 끝났다고 확신할 때만 행 수를 줄인다
+        # (마감 시각을 넘는 기차를 봤거나, 지정한 열차번호를 모두 찾은 경우)
+        found_nums = {train.train_num.lstrip("0") for train in wanted}
+        allow_nums = srt.filter.allow_nums
+        if STOP in decisions or len(allow_nums) > 0 and allow_nums.issubset(found_nums):
+            srt.rows_to_check = visible.index(wanted[-1]) + 1
+        return True
+
+    def stats(self):
+        return {"timetable_learned": self.cnt_learned, "timetable_invalidated": self.cnt_invalidated}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
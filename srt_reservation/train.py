@@ -1,18 +1,40 @@
 from datetime import datetime
+from functools import lru_cache
+
+
+@lru_cache(maxsize=32)
+def parse_dt(dpt_dt):
+    return datetime.strptime(dpt_dt, '%Y%m%d')
+
+
+def to_minute(hhmm):
+    # "08:30" -> 510
+    h, m = hhmm.split(":")
+    return int(h) * 60 + int(m)
+
 
 class Train:
+    __slots__ = ("dpt_dt_str", "train_type", "train_num", "dpt_stn", "dpt_time", "arr_stn", "arr_time",
+                 "dpt_minute", "arr_minute", "hash_value")
+
     def __init__(self, dpt_dt, train_type, train_num, dpt, arr):
-        self.dpt_dt = datetime.strptime(dpt_dt, '%Y%m%d')
+        # 날짜는 문자열로 두고 필요할 때만 datetime 으로 바꾼다 (to_string)
+        self.dpt_dt_str = dpt_dt
         self.train_type = train_type
         self.train_num = train_num
         self.dpt_stn, self.dpt_time = dpt.split()
         self.arr_stn, self.arr_time = arr.split()
+        self.dpt_minute = to_minute(self.dpt_time)
+        self.arr_minute = to_minute(self.arr_time)
 
         self.hash_value = ''.join([self.train_type, self.train_num, self.dpt_stn, self.dpt_time, self.arr_stn, self.arr_time])
 
+    @property
+    def dpt_dt(self):
+        return parse_dt(self.dpt_dt_str)
+
     def hash(self):
         return self.hash_value
     
     def to_string(self):
         return f"{self.dpt_dt.strftime('%Y-%m-%d(%a)')} {self.train_type}({self.train_num})\n{self.dpt_stn} {self.dpt_time} ▶ {self.arr_stn} {self.arr_time}"
-    
\ No newline at end of file
@@ -0,0 +1,81 @@
+from srt_reservation.train import to_minute
+
+ACCEPT = 0
+SKIP = 1
+STOP = 2  # 결과 표는 출발 시간 순이므로 이후 행은 볼 필요 없음
+
+
+def parse_time_windows(text):
+    # "08:00-10:00,18:00-20:00" -> [(480, 600), (1080, 1200)]
+    windows = []
+    for part in text.split(","):
+        part = part.strip()
+        if part == "":
+            continue
+        start, end = part.split("-")
+        windows.append((to_minute(start.strip()), to_minute(end.strip())))
+    return windows
+
+
+def parse_train_nums(text):
+    return frozenset(n.strip().lstrip("0") for n in text.split(",") if n.strip() != "")
+
+
+class TrainFilter:
+    """
+    SRT 설정으로 한 번 만들어 두고 행마다 decide() 만 호출한다.
+    시각은 자정부터의 분(int)으로 비교하고 열차번호는 set 으로 확인한다.
+    """
+    __slots__ = ("exact_minutes", "windows", "allow_nums", "deny_nums", "max_arr_minute", "cutoff_minute")
+
+    def __init__(self, exact_minutes=(), windows=(), allow_nums=(), deny_nums=(), max_dpt_minute=None,
+                 max_arr_minute=None):
+        self.exact_minutes = frozenset(exact_minutes)
+        self.windows = tuple(windows)
+        self.allow_nums = frozenset(allow_nums)
+        self.deny_nums = frozenset(deny_nums)
+        self.max_arr_minute = max_arr_minute
+
+        # 이 시각보다 늦게 출발하는 행이 나오면 멈춘다
+        cutoffs = []
+        if self.exact_minutes:
+            cutoffs.append(max(self.exact_minutes))
+        if self.windows:
+            cutoffs.append(max(end for _, end in self.windows))
+        if max_dpt_minute is not None:
+            cutoffs.append(max_dpt_minute)
+        self.cutoff_minute = min(cutoffs) if cutoffs else None
+
+    @classmethod
+    def from_srt(cls, srt):
+        return cls(exact_minutes=[to_minute(tm) for tm in srt.exact_tms],
+                   windows=srt.time_windows,
+                   allow_nums=srt.allow_train_nums,
+                   deny_nums=srt.deny_train_nums,
+                   max_dpt_minute=srt.max_dpt_minute,
+                   max_arr_minute=srt.max_arr_minute)
+
+    def decide(self, train):
+        minute = train.dpt_minute
+        if self.cutoff_minute is not None and minute > self.cutoff_minute:
+            return STOP
+        if self.exact_minutes and minute not in self.exact_minutes:
+            return SKIP
+        if self.windows and not any(start <= minute <= end for start, end in self.windows):
+            return SKIP
+        if self.allow_nums or self.deny_nums:
+            num = train.train_num.lstrip("0")
+            if self.allow_nums and num not in self.allow_nums:
+                return SKIP
+            if num in self.deny_nums:
+                return SKIP
+        if self.max_arr_minute is not None and train.arr_minute > self.max_arr_minute:
+            return SKIP
+        return ACCEPT
+
+    def has_conditions(self):
+        # 원하는 기차를 시각/열차번호로 좁힐 수 있는지 (timetable 계획에 사용)
+        return bool(self.exact_minutes or self.windows or self.allow_nums) or self.cutoff_minute is not None
+
+    def accepts(self, train):
+        return self.decide(train) == ACCEPT
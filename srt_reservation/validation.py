@@ -38,3 +38,10 @@ num_station_list = {
     15: "나주",
     16: "목포"
 }
+
+
+def station_code(name):
+    # 역 이름(또는 번호)을 station_list 의 번호로. 목록에 없으면 None
+    if str(name).isdigit():
+        return int(name) if int(name) in num_station_list else None
+    return station_list.index(name) if name in station_list else None
@@ -0,0 +1,154 @@
+import time
+from html.parser import HTMLParser
+
+from srt_reservation.locators import (RSV_COL_ARR, RSV_COL_DPT, RSV_COL_DPT_DT, RSV_COL_STATUS, RSV_COL_TRAIN_NUM,
+                                      RSV_COL_TRAIN_TYPE, RSV_CONFIRMED, RSV_LIST_ID, RSV_WAITING)
+from srt_reservation.train import Train
+
+WAITLIST_POLL_SEC = 60
+FETCH_TIMEOUT_MS = 10000
+
+# 현재 화면을 떠나지 않고 같은 세션(쿠키)으로 페이지 html 만 받아온다. (execute_async_script)
+FETCH_PAGE_JS = """
+var done = arguments[arguments.length - 1];
+var ctrl = new AbortController();
+var timer = setTimeout(function () { ctrl.abort(); }, arguments[1]);
+fetch(arguments[0], {credentials: "same-origin", signal: ctrl.signal})
+    .then(function (res) {
+        return res.text().then(function (text) { done({url: res.url, status: res.status, html: text}); });
+    })
+    .catch(function (e) { done({error: String(e)}); })
+    .finally(function () { clearTimeout(timer); });
+"""
+
+
+def fetch_page(driver, url, timeout_ms=FETCH_TIMEOUT_MS):
+    """(최종 url, html). 실패하면 Exception"""
+    res = driver.execute_async_script(FETCH_PAGE_JS, url, timeout_ms) or {}
+    if res.get("error") or res.get("status") != 200:
+        raise Exception(f"{url} 조회 실패: {res.get('error') or res.get('status')}")
+    return res["url"], res["html"]
+
+
+def parse_run_date(text):
+    # "2026-11-01(일)" -> "20261101"
+    digits = "".join(c for c in text if c.isdigit())
+    if len(digits) < 8:
+        raise ValueError(f"승차일자 형식이 다름: {text}")
+    return digits[:8]
+
+
+class ReservationRow:
+    def __init__(self, idx, cells):
+        self.idx = idx  # tr:nth-child 값 (1부터 시작)
+        self.dpt_dt = parse_run_date(cells[RSV_COL_DPT_DT])
+        self.train = Train(self.dpt_dt, cells[RSV_COL_TRAIN_TYPE].strip(), cells[RSV_COL_TRAIN_NUM].strip(),
+                           cells[RSV_COL_DPT], cells[RSV_COL_ARR])
+        self.status = cells[RSV_COL_STATUS].strip()
+
+    def is_confirmed(self):
+        return RSV_CONFIRMED in self.status
+
+    def is_waiting(self):
+        return RSV_WAITING in self.status
+
+
+class ReservationListParser(HTMLParser):
+    """예약 내역 표(#rsv-list)의 td 텍스트만 뽑는다."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.table = []
+        self.depth = 0  # #rsv-list 안쪽 table 깊이
+        self.row = None
+        self.cell = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "table":
+            if self.depth or dict(attrs).get("id") == RSV_LIST_ID:
+                self.depth += 1
+        elif not self.depth:
+            return
+        elif tag == "tr":
+            self.row = []
+        elif tag == "td" and self.row is not None:
+            self.cell = []
+        elif tag == "br" and self.cell is not None:
+            # "수서<br>06:00" -> "수서 06:00"
+            self.cell.append(" ")
+
+    def handle_endtag(self, tag):
+        if tag == "table" and self.depth:
+            self.depth -= 1
+        elif tag == "td" and self.cell is not None:
+            self.row.append(" ".join("".join(self.cell).split()))
+            self.cell = None
+        elif tag == "tr" and self.row is not None:
+            # 머리글(th 만 있는 행)은 건너뛴다
+            if self.row:
+                self.table.append(self.row)
+            self.row = None
+
+    def handle_data(self, data):
+        if self.cell is not None:
+            self.cell.append(data)
+
+
+def parse_reservation_list(html):
+    parser = ReservationListParser()
+    parser.feed(html)
+    parser.close()
+    rows = []
+    for i, cells in enumerate(parser.table, start=1):
+        try:
+            rows.append(ReservationRow(i, cells))
+        except (IndexError, ValueError) as e:
+            print(f"예약 내역 {i}번째 행 파싱 실패: {e}")
+    return rows
+
+
+class WaitlistManager:
+    """
+    신청한 예약대기가 좌석으로 확정됐는지 예약 내역 페이지로 확인한다.
+    확인할 예약대기가 있을 때만 poll_sec 마다 한 번, 현재 화면을 그대로 둔 채 fetch 로 받아온다.
+    """
+
+    def __init__(self, poll_sec=WAITLIST_POLL_SEC):
+        self.poll_sec = poll_sec
+        self.checked_at = time.monotonic()
+        self.cnt_poll = 0
+        self.cnt_confirmed = 0
+
+    def pending(self, targets):
+        # 예약대기만 하고 아직 예약(확정)되지 않은 기차
+        return [(srt, key) for srt in targets if not srt.done
+                for key, reserved in list(srt.reserved.items()) if reserved and not srt.booked.get(key)]
+
+    def due(self, targets):
+        if self.poll_sec <= 0 or time.monotonic() - self.checked_at < self.poll_sec:
+            return False
+        return len(self.pending(targets)) > 0
+
+    def start(self):
+        # 조회 전에 부른다. 조회가 실패해도 poll_sec 동안은 다시 조회하지 않는다
+        self.checked_at = time.monotonic()
+        self.cnt_poll += 1
+
+    def match(self, targets, rows):
+        """확정된 예약대기 [(srt, ReservationRow, Train)]"""
+        confirmed = []
+        used = set()  # 한 행은 한 검색 목표만 확정한다
+        for srt, key in self.pending(targets):
+            for row in rows:
+                # train key 에는 날짜가 없으므로 승차일자도 같아야 같은 기차다
+                if row.idx in used or not row.is_confirmed() or row.dpt_dt != srt.dpt_dt:
+                    continue
+                if row.train.hash() == key:
+                    used.add(row.idx)
+                    confirmed.append((srt, row, row.train))
+                    break
+        self.cnt_confirmed += len(confirmed)
+        return confirmed
+
+    def stats(self):
+        return {"waitlist_polls": self.cnt_poll, "waitlist_confirmed": self.cnt_confirmed}
@@ -0,0 +1,70 @@
+import time
+
+from selenium.common.exceptions import NoAlertPresentException, TimeoutException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 동작별 최대 대기 시간 (초)
+DEFAULT_TIMEOUTS = {
+    "page": 15,  # 페이지 이동 후 첫 요소
+    "refresh": 10,  # 조회하기 후 결과 표 갱신
+    "book_result": 10,  # 예약하기 클릭 후 결과 페이지
+    "alert": 3,  # 반드시 뜨는 alert
+    "checkout": 10,  # 결제 페이지 요소
+}
+
+POLL_FREQUENCY_SEC = 0.1
+
+
+class WaitPolicy:
+    """
+    implicit wait 대신 쓰는 명시적 대기.
+    있을 수도 없을 수도 있는 요소(alert, 결과 행 등)는 기다리지 않고 바로 확인한다.
+    대기에 쓴 시간은 누적해두었다가 take_waited() 로 사이클마다 가져간다.
+    """
+
+    def __init__(self, driver, timeouts=None):
+        self.driver = driver
+        self.timeouts = dict(DEFAULT_TIMEOUTS)
+        if timeouts:
+            self.timeouts.update(timeouts)
+        self.waited = 0.0  # 현재 사이클에서 대기한 시간
+        self.total_waited = 0.0
+
+    def until(self, condition, action):
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self.driver, self.timeouts[action], poll_frequency=POLL_FREQUENCY_SEC).until(condition)
+        finally:
+            self._add(time.perf_counter() - start)
+
+    def element(self, by, value, action="page"):
+        return self.until(EC.presence_of_element_located((by, value)), action)
+
+    def clickable(self, by, value, action="page"):
+        return self.until(EC.element_to_be_clickable((by, value)), action)
+
+    def find_now(self, by, value):
+        # 대기 없이 존재 여부만 확인
+        elements = self.driver.find_elements(by, value)
+        return elements[0] if elements else None
+
+    def alert_now(self):
+        try:
+            return self.driver.switch_to.alert
+        except NoAlertPresentException:
+            return None
+
+    def alert(self, action="alert"):
+        try:
+            return self.until(EC.alert_is_present(), action)
+        except TimeoutException:
+            return None
+
+    def take_waited(self):
+        waited, self.waited = self.waited, 0.0
+        return waited
+
+    def _add(self, elapsed):
+        self.waited += elapsed
+        self.total_waited += elapsed
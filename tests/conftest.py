@@ -0,0 +1,32 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# 메인 스레드가 아닌 스레드에서 자식을 띄우고 pid 를 출력한 뒤 기다리는 프로세스
+# (chromedriver 가 세션 스레드에서 Chrome 을 띄우는 것과 같은 모양)
+THREAD_FORK = """
+import subprocess, sys, threading, time
+def start():
+    child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+    print(child.pid, flush=True)
+    time.sleep(60)
+threading.Thread(target=start, daemon=True).start()
+time.sleep(60)
+"""
+
+
+@pytest.fixture
+def thread_forked():
+    """(부모 Popen, 다른 스레드가 띄운 자식 pid)"""
+    parent = subprocess.Popen([sys.executable, "-c", THREAD_FORK], stdout=subprocess.PIPE, text=True)
+    child = int(parent.stdout.readline())
+    yield parent, child
+    parent.kill()
+    parent.wait()
+    parent.stdout.close()
+    try:
+        os.kill(child, 9)
+    except ProcessLookupError:
+        pass
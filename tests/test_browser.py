@@ -0,0 +1,50 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pytest
+
+from srt_reservation.browser import BrowserProfile, ProfileInUse, lock_owner
+from srt_reservation.procstat import user_data_dirs
+
+
+def make_lock(profile_dir, pid, host=None):
+    os.makedirs(profile_dir, exist_ok=True)
+    os.symlink(f"{host or socket.gethostname()}-{pid}", os.path.join(profile_dir, "SingletonLock"))
+    open(os.path.join(profile_dir, "SingletonCookie"), "w").close()
+
+
+def test_stale_lock_is_removed(tmp_path):
+    profile_dir = str(tmp_path / "profile")
+    # 이 pid 는 살아있지만 이 프로필을 쓰는 Chrome 이 아니다
+    make_lock(profile_dir, os.getpid())
+    assert lock_owner(profile_dir) == (socket.gethostname(), os.getpid())
+    BrowserProfile(lean=True, profile_dir=profile_dir).clear_stale_locks()
+    assert os.listdir(profile_dir) == []
+
+
+def test_lock_of_other_host_is_removed(tmp_path):
+    profile_dir = str(tmp_path / "profile")
+    make_lock(profile_dir, 1, host="old-container")
+    BrowserProfile(lean=True, profile_dir=profile_dir).clear_stale_locks()
+    assert os.listdir(profile_dir) == []
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc 필요")
+def test_live_lock_is_kept(tmp_path):
+    profile_dir = str(tmp_path / "profile")
+    # 같은 프로필로 떠 있는 Chrome 대신 --user-data-dir 인자를 가진 프로세스
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", f"--user-data-dir={profile_dir}"])
+    try:
+        deadline = time.monotonic() + 5
+        while not user_data_dirs([proc.pid]) and time.monotonic() < deadline:
+            time.sleep(0.05)  # exec 가 끝날 때까지
+        make_lock(profile_dir, proc.pid)
+        with pytest.raises(ProfileInUse):
+            BrowserProfile(lean=True, profile_dir=profile_dir).clear_stale_locks()
+        assert sorted(os.listdir(profile_dir)) == ["SingletonCookie", "SingletonLock"]
+    finally:
+        proc.kill()
+        proc.wait()
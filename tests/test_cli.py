@@ -0,0 +1,19 @@
+import pytest
+
+from srt_reservation.cli import parse_args
+
+BASE = ["--user", "1234567890", "--psw", "000000", "--dpt", "수서", "--arr", "부산", "--dt", "20261101"]
+
+
+@pytest.mark.parametrize("flag", ["--lean", "--http_poll", "--metrics_slack", "--supervise"])
+def test_bool_flags(flag):
+    name = flag[2:]
+    assert getattr(parse_args(BASE), name) is False
+    assert getattr(parse_args(BASE + [flag, "True"]), name) is True
+    assert getattr(parse_args(BASE + [flag, "False"]), name) is False
+    assert getattr(parse_args(BASE + [flag, "0"]), name) is False
+
+
+def test_bool_flag_rejects_other_values():
+    with pytest.raises(SystemExit):
+        parse_args(BASE + ["--lean", "maybe"])
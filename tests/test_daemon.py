@@ -0,0 +1,34 @@
+import os
+
+import pytest
+
+from srt_reservation.browser import DEFAULT_PROFILE_DIR
+from srt_reservation.cli import parse_args
+from srt_reservation.daemon import HuntDaemon, Worker, auto_workers
+
+
+def test_workers_get_their_own_profile(tmp_path):
+    cli_args = parse_args(["--lean", "True", "--profile_dir", str(tmp_path)])
+    dirs = {Worker(None, no).worker_args(cli_args).profile_dir for no in range(3)}
+    assert dirs == {os.path.join(str(tmp_path), f"worker-{no}") for no in range(3)}
+    # 검색 요청의 인자는 그대로 둔다
+    assert cli_args.profile_dir == str(tmp_path)
+
+
+def test_default_profile_dir_per_worker():
+    args = Worker(None, 0).worker_args(parse_args([]))
+    assert args.profile_dir == os.path.join(DEFAULT_PROFILE_DIR, "worker-0")
+
+
+def test_auto_workers():
+    assert auto_workers(4000, worker_mb=600, cpu_limit=8) == 6
+    assert auto_workers(4000, worker_mb=600, cpu_limit=2) == 2
+    assert auto_workers(100, worker_mb=600, cpu_limit=2) == 1
+
+
+@pytest.mark.parametrize("argv", [["--num", "many"], ["--no_such_flag"], ["--help"]])
+def test_submit_bad_args_replies_with_error(argv):
+    # argparse 의 SystemExit 으로 데몬 스레드가 끝나지 않고 클라이언트가 오류 응답을 받아야 한다
+    res = HuntDaemon(0, 60, None).handle({"cmd": "submit", "argv": argv})
+    assert res["ok"] is False
+    assert res["error"].startswith("인자 오류")
@@ -0,0 +1,19 @@
+from srt_reservation.metrics import Metrics, percentile
+
+
+def test_percentile_nearest_rank():
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 95) == 95
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) == 0.0
+
+
+def test_phase_percentiles_shared_by_summary():
+    metrics = Metrics(report_sec=0)
+    for ms in range(1, 11):
+        metrics.record("refresh", ms / 1000)
+    metrics.samples["empty"]  # 샘플이 없는 단계는 빠진다
+    phases = metrics.phase_percentiles()
+    assert phases == {"refresh": {"n": 10, "p50": 5.0, "p95": 10.0, "p99": 10.0}}
+    assert metrics.summary()["phases_ms"] == phases
@@ -0,0 +1,23 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from srt_reservation.procstat import children_of, process_tree
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc 필요")
+
+
+def test_children_forked_from_other_threads(thread_forked):
+    parent, child = thread_forked
+    assert child in children_of(parent.pid)
+    assert process_tree(parent.pid) == [parent.pid, child]
+
+
+def test_missing_process_has_no_children():
+    proc = subprocess.Popen([sys.executable, "-c", "pass"])
+    proc.wait()
+    time.sleep(0.05)
+    assert children_of(proc.pid) == []
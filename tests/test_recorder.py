@@ -0,0 +1,49 @@
+import time
+from types import SimpleNamespace
+
+from srt_reservation.introspect import SectionProfiler
+from srt_reservation.metrics import Metrics
+from srt_reservation.recorder import FlightRecorder
+from srt_reservation.scheduler import PollScheduler
+from srt_reservation.SRThunter import SRThunter
+
+
+def test_slow_cycle_uses_wall_time(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), slow_sec=10)
+    # wait 는 refresh 안에서 잰 시간이라 단계 합(12초)은 실제 사이클(7초)보다 길다
+    recorder.begin(0, "target")
+    assert not recorder.end({"refresh": 6.0, "wait": 5.0, "parse": 1.0}, 7.0)
+    recorder.begin(1, "target")
+    assert recorder.end({"refresh": 1.0}, 10.5)
+    assert [rec.wall_sec for rec in recorder.cycles] == [7.0, 10.5]
+
+
+def hunter(tmp_path):
+    return SimpleNamespace(metrics=Metrics(report_sec=0), recorder=FlightRecorder(str(tmp_path), slow_sec=10),
+                           profiler=SectionProfiler(str(tmp_path)), scheduler=PollScheduler(), driver=None,
+                           cycle_started_at=None)
+
+
+def test_failed_cycle_is_closed(tmp_path):
+    h = hunter(tmp_path)
+    h.recorder.begin(0, "target")
+    h.cycle_started_at = time.perf_counter()
+    with h.metrics.phase("book"):
+        pass
+    SRThunter.end_cycle(h, Exception("예약대기 신청 후 페이지 이동 없음"))
+
+    failed = h.recorder.cycles[-1]
+    assert "book" in failed.phases
+    assert "페이지 이동 없음" in failed.error
+    assert h.metrics.cnt_cycle == 1
+    assert h.cycle_started_at is None
+
+    # 실패한 사이클의 단계 시간이 다음 사이클로 넘어가지 않는다
+    h.recorder.begin(1, "target")
+    h.cycle_started_at = time.perf_counter()
+    with h.metrics.phase("refresh"):
+        pass
+    SRThunter.end_cycle(h)
+    assert set(h.recorder.cycles[-1].phases) == {"refresh"}
+    assert h.recorder.cycles[-1].error is None
+    assert len(h.metrics.samples["cycle"]) == 2
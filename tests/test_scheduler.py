@@ -0,0 +1,62 @@
+import pytest
+
+from srt_reservation.scheduler import PollScheduler, RateBudget
+
+
+def cycle(scheduler, latency=0.1, alert=False, error=False):
+    # SRThunter 의 한 사이클: 새로고침 응답 -> 결과 확인(alert/에러) -> 사이클 끝
+    scheduler.on_response(latency)
+    if alert:
+        scheduler.on_alert()
+    if error:
+        scheduler.on_error()
+    scheduler.on_cycle_end()
+
+
+def test_backoff_grows_under_repeated_alerts():
+    scheduler = PollScheduler(max_backoff_sec=60)
+    backoffs = []
+    for _ in range(6):
+        cycle(scheduler, alert=True)
+        backoffs.append(scheduler.backoff)
+    assert backoffs == [2.0, 4.0, 8.0, 16.0, 32.0, 60]
+    assert scheduler.cnt_alert == 6
+
+
+def test_backoff_grows_under_repeated_errors():
+    scheduler = PollScheduler()
+    for _ in range(3):
+        cycle(scheduler, error=True)
+    assert scheduler.backoff == 8.0
+
+
+def test_slow_response_counts_as_trouble():
+    scheduler = PollScheduler(slow_sec=3.0)
+    cycle(scheduler, latency=5.0)
+    assert scheduler.backoff == 1.5
+    assert scheduler.cnt_slow == 1
+
+
+def test_clean_cycles_relax_backoff():
+    scheduler = PollScheduler()
+    for _ in range(3):
+        cycle(scheduler, alert=True)
+    assert scheduler.backoff == 8.0
+    cycle(scheduler)
+    assert scheduler.backoff == 4.0
+    for _ in range(5):
+        cycle(scheduler)
+    assert scheduler.backoff == 1.0
+
+
+def test_next_delay_applies_backoff():
+    scheduler = PollScheduler(min_sec=0, max_sec=0, max_backoff_sec=10)
+    assert scheduler.next_delay() == 0
+    for _ in range(5):
+        cycle(scheduler, alert=True)
+    assert scheduler.next_delay() == 10
+
+
+def test_rate_budget_rejects_zero():
+    with pytest.raises(ValueError):
+        RateBudget(0)
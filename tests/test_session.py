@@ -0,0 +1,57 @@
+from types import SimpleNamespace
+
+import pytest
+from urllib3.exceptions import MaxRetryError, ProtocolError
+
+from srt_reservation.session import DriverSession
+
+
+class DeadDriver:
+    # chromedriver 가 죽은 뒤의 WebDriver. 명령마다 연결 실패
+    def __init__(self, error):
+        self.error = error
+        self.quit_called = False
+
+    @property
+    def window_handles(self):
+        raise self.error
+
+    def quit(self):
+        self.quit_called = True
+        raise self.error
+
+
+class FakeHunter:
+    def __init__(self, driver):
+        self.driver = driver
+        self.srt = SimpleNamespace(login_id="1234567890", login_pwd="000000")
+        self.launched = 0
+        self.logins = 0
+
+    def run_driver(self):
+        self.launched += 1
+        self.driver = SimpleNamespace(window_handles=["main"])
+
+    def login(self, login_id, login_psw):
+        self.logins += 1
+
+    def check_login(self):
+        return True
+
+
+@pytest.mark.parametrize("error", [
+    MaxRetryError(None, "/session/1/window/handles", reason="connection refused"),
+    ProtocolError("Connection aborted."),
+    ConnectionRefusedError(111, "Connection refused"),
+])
+def test_relaunch_when_chromedriver_died(error):
+    dead = DeadDriver(error)
+    hunter = FakeHunter(dead)
+    session = DriverSession(hunter)
+    assert session.is_alive() is False
+
+    session.ensure()
+    assert dead.quit_called
+    assert hunter.launched == 1 and hunter.logins == 1
+    assert session.cnt_relaunch == 1
+    assert session.is_alive()
@@ -0,0 +1,71 @@
+from srt_reservation.fakesrt import FakeSRTState, load_scenario, result_table
+from srt_reservation.snapshot import ChangeTracker, ResultRow, read_result_rows_from_html
+from srt_reservation.train import Train
+
+
+def row(idx, num, dpt_time, standard_seat="매진", reservation="매진"):
+    train = Train("20261101", "SRT", num, f"수서 {dpt_time}", f"부산 {dpt_time[:2]}:59")
+    return ResultRow(idx, train, standard_seat, reservation)
+
+
+def keys(rows):
+    return [r.train.train_num for r in rows]
+
+
+def test_unchanged_rows_are_skipped_after_commit():
+    tracker = ChangeTracker()
+    rows = [row(1, "301", "06:00"), row(2, "303", "07:00")]
+    assert keys(tracker.diff(1, rows)) == ["301", "303"]
+    tracker.commit()
+    assert tracker.last_fp() == 1
+    assert tracker.diff(2, rows) == []
+
+    rows[1] = row(2, "303", "07:00", standard_seat="예약하기")
+    assert keys(tracker.diff(3, rows)) == ["303"]
+
+
+def test_rows_come_back_when_handling_fails():
+    # 301, 303 이 함께 열렸는데 301 예약 중에 예외가 나서 commit 하지 못한 경우
+    tracker = ChangeTracker()
+    tracker.diff(1, [row(1, "301", "06:00"), row(2, "303", "07:00")])
+    tracker.commit()
+    rows = [row(1, "301", "06:00", standard_seat="예약하기"), row(2, "303", "07:00", standard_seat="예약하기")]
+    assert keys(tracker.diff(2, rows)) == ["301", "303"]
+    tracker.recheck(rows[0].train.hash())
+
+    # 표가 그대로여도 행을 다시 받아서 두 행 모두 다시 본다
+    assert tracker.last_fp() is None
+    assert keys(tracker.diff(2, rows)) == ["301", "303"]
+    tracker.commit()
+    assert tracker.diff(2, rows) == []
+
+
+def test_recheck_survives_failed_cycle():
+    tracker = ChangeTracker()
+    rows = [row(1, "301", "06:00", standard_seat="예약하기")]
+    tracker.diff(1, rows)
+    tracker.recheck(rows[0].train.hash())
+    tracker.commit()
+
+    assert keys(tracker.diff(1, rows)) == ["301"]
+    # commit 전에 예외
+    assert keys(tracker.diff(1, rows)) == ["301"]
+    tracker.commit()
+    assert tracker.diff(1, rows) == []
+    assert tracker.last_fp() == 1
+
+
+def test_result_table_parser_reads_fakesrt_table():
+    state = FakeSRTState(load_scenario())
+    html = result_table(state, {"dptDt": "20261101"}, search_no=5)  # 5번째 조회부터 3번째 행이 열린다
+    fp, rows = read_result_rows_from_html(html, "20261101", limit=4)
+    assert [r.idx for r in rows] == [1, 2, 3, 4]
+    third = rows[2]
+    assert (third.train.train_num, third.train.dpt_stn, third.train.dpt_time, third.train.arr_time) == \
+        ("305", "수서", "07:00", "09:30")
+    assert third.is_bookable() and not rows[0].is_bookable()
+    assert not any(r.is_reservable() for r in rows)
+
+    # 같은 표면 파싱하지 않는다
+    assert read_result_rows_from_html(html, "20261101", 4, last_fp=fp) == (fp, None)
+    assert read_result_rows_from_html(result_table(state, {}, search_no=1), "20261101", 4, fp)[1] is not None
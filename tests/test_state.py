@@ -0,0 +1,72 @@
+from srt_reservation.cli import parse_args
+from srt_reservation.state import ANNOUNCED, BOOKED, RESERVED, HuntStore, target_key
+from srt_reservation.targets import build_srt
+
+BASE = ["--user", "1234567890", "--psw", "000000", "--dpt", "수서", "--arr", "부산", "--dt", "20261101", "--tm", "06"]
+
+
+def target(*extra):
+    srt = build_srt(parse_args(BASE + list(extra)))
+    srt.init_results()
+    return srt
+
+
+def test_restore_after_restart(tmp_path):
+    path = str(tmp_path / "state.sqlite3")
+    store = HuntStore(path)
+    srt = target("--greedy", "True")
+    store.record(srt, "", ANNOUNCED)
+    store.record(srt, "SRT301수서06:00부산08:30", BOOKED)
+    store.record(srt, "SRT303수서06:30부산09:00", RESERVED)
+    store.record(srt, "SRT301수서06:00부산08:30", BOOKED)  # 같은 이벤트는 한 번만
+    store.close()
+
+    store = HuntStore(path)
+    restored = target("--greedy", "True")
+    assert store.restore(restored) == 3
+    assert restored.announced
+    assert restored.booked["SRT301수서06:00부산08:30"]
+    assert restored.reserved["SRT303수서06:30부산09:00"]
+    assert restored.gotcha == 1
+    assert not restored.done  # greedy 로 2개까지
+
+    # 날짜가 다른 검색은 따로 기록된다
+    other = target("--greedy", "True", "--dt", "20261102")
+    assert store.restore(other) == 0 and other.gotcha == 0
+    store.close()
+
+
+def test_different_search_config_is_a_different_hunt(tmp_path):
+    # 같은 구간/날짜라도 시각/필터가 다른 새 검색은 이전 예약으로 끝나지 않는다
+    store = HuntStore(str(tmp_path / "state.sqlite3"))
+    store.record(target(), "SRT301수서06:00부산08:30", BOOKED)
+    store.record(target(), "", ANNOUNCED)
+    for extra in (["--tm", "08"], ["--time_windows", "18:00-20:00"], ["--trains", "305"], ["--num", "5"],
+                  ["--reserve", "True"]):
+        srt = target(*extra)
+        assert store.restore(srt) == 0, extra
+        assert not srt.done and not srt.announced
+    assert store.restore(target()) == 2
+    store.close()
+
+
+def test_key_survives_timetable_changes():
+    # 시간표가 검색 시각을 바꿔도 기록 키는 그대로
+    srt = target("--time_windows", "09:00-10:00")
+    key = target_key(srt)
+    srt.set_dpt_tm("08")
+    assert target_key(srt) == key
+
+
+def test_non_greedy_target_is_done_after_booking(tmp_path):
+    store = HuntStore(str(tmp_path / "state.sqlite3"))
+    srt = target()
+    store.record(srt, "SRT301수서06:00부산08:30", BOOKED)
+    restored = target()
+    store.restore(restored)
+    assert restored.done
+
+    store.clear(srt)
+    cleared = target()
+    assert store.restore(cleared) == 0 and not cleared.done
+    store.close()
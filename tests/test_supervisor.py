@@ -0,0 +1,58 @@
+import os
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from srt_reservation.session import DriverSession
+from srt_reservation.supervisor import Supervisor
+
+pytestmark = pytest.mark.skipif(not os.path.isdir("/proc"), reason="/proc 필요")
+
+
+def is_dead(pid):
+    # 죽은 손자는 부모가 거둘 때까지 좀비로 남는다
+    try:
+        with open(f"/proc/{pid}/stat", "r") as f:
+            data = f.read()
+    except FileNotFoundError:
+        return True
+    return data[data.rindex(")") + 2] in "ZX"
+
+
+def hunter_with_driver(pid):
+    hunter = SimpleNamespace(metrics=SimpleNamespace(cnt_cycle=0), stop=lambda: None,
+                             driver=SimpleNamespace(service=SimpleNamespace(process=SimpleNamespace(pid=pid))))
+    hunter.session = DriverSession(hunter)
+    return hunter
+
+
+def test_hang_kills_thread_forked_browser(thread_forked):
+    # chromedriver(부모)가 세션 스레드에서 띄운 Chrome(자식)을 멈춤으로 보고 죽인다
+    parent, child = thread_forked
+    hunter = hunter_with_driver(parent.pid)
+    supervisor = Supervisor(hunter, max_browser_mb=0, max_growth_mb=0, max_bot_mb=0, hang_sec=5)
+    supervisor.last_cycle = 0
+    supervisor.last_progress_at = time.monotonic() - 10
+
+    supervisor.check()
+    assert supervisor.cnt_recycle_hang == 1
+    assert hunter.session.recycle_reason == "hang"
+    deadline = time.monotonic() + 5
+    while not is_dead(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert is_dead(child)
+    # chromedriver 는 남겨서 다음 ensure() 에서 정리한다
+    assert parent.poll() is None
+
+
+def test_no_kill_while_cycles_progress(thread_forked):
+    parent, child = thread_forked
+    hunter = hunter_with_driver(parent.pid)
+    supervisor = Supervisor(hunter, max_browser_mb=0, max_growth_mb=0, max_bot_mb=0, hang_sec=5)
+    supervisor.last_progress_at = time.monotonic() - 10
+    hunter.metrics.cnt_cycle = 3  # 그 사이 사이클이 끝났다
+
+    supervisor.check()
+    assert supervisor.cnt_recycle_hang == 0
+    assert not is_dead(child)
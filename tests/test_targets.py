@@ -0,0 +1,23 @@
+import argparse
+
+import pytest
+
+from srt_reservation.cli import parse_args
+from srt_reservation.targets import build_srt
+
+BASE = ["--user", "1234567890", "--psw", "000000", "--dpt", "수서", "--arr", "부산", "--dt", "20261101", "--tm", "06"]
+
+
+@pytest.mark.parametrize("value, expected", [(True, True), (False, False), ("true", True), ("false", False),
+                                             ("False", False), (0, False), (1, True)])
+def test_target_bool_fields(value, expected):
+    # bool("false") 는 True 이므로 targets 파일의 문자열 값도 true/false 로 읽어야 한다
+    srt = build_srt(parse_args(BASE), {"reserve": value, "greedy": value})
+    assert srt.want_reserve is expected
+    assert srt.greedy is expected
+
+
+@pytest.mark.parametrize("value", ["maybe", None, ""])
+def test_target_bool_fields_reject_unknown(value):
+    with pytest.raises(argparse.ArgumentTypeError):
+        build_srt(parse_args(BASE), {"greedy": value})
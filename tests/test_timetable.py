@@ -0,0 +1,71 @@
+from srt_reservation.snapshot import ResultRow
+from srt_reservation.srt import SRT
+from srt_reservation.timetable import TimetableCache
+from srt_reservation.train import Train
+
+# 06:00 부터 30분 간격 301, 303, ... 10:30 (10대)
+TIMES = ["06:00", "06:30", "07:00", "07:30", "08:00", "08:30", "09:00", "09:30", "10:00", "10:30"]
+
+
+def rows(from_hour=0, nums=None):
+    nums = nums or [str(301 + i * 2) for i in range(len(TIMES))]
+    out = []
+    for num, tm in zip(nums, TIMES):
+        if int(tm[:2]) >= from_hour:
+            train = Train("20261101", "SRT", num, f"수서 {tm}", f"부산 {int(tm[:2]) + 2:02d}{tm[2:]}")
+            out.append(ResultRow(len(out) + 1, train, "매진", "매진"))
+    return out
+
+
+def target(windows="09:00-10:00", dpt_tm="06"):
+    srt = SRT("수서", "부산", "20261101", dpt_tm, 2).set_time_windows(windows).compile_filter()
+    srt.init_results()
+    return srt
+
+
+def test_observe_learns_merges_and_invalidates(tmp_path):
+    cache = TimetableCache(str(tmp_path / "timetable.sqlite3"))
+    srt = target(dpt_tm="08")
+    assert cache.observe(srt, rows(from_hour=8))
+    assert cache.observe(srt, rows(from_hour=8)) is False
+
+    # 더 이른 시간대를 보면 합친다
+    srt.set_dpt_tm("06")
+    assert cache.observe(srt, rows())
+    from_minute, trains = cache.load(srt)
+    assert from_minute == 6 * 60 and len(trains) == len(TIMES)
+
+    # 같은 자리의 기차가 바뀌면 시간표를 새로 쓴다
+    nums = [str(301 + i * 2) for i in range(len(TIMES))]
+    nums[3] = "399"
+    assert cache.observe(srt, rows(nums=nums))
+    assert cache.stats() == {"timetable_learned": 2, "timetable_invalidated": 1}
+    cache.close()
+
+
+def test_plan_narrows_bucket_and_rows(tmp_path):
+    cache = TimetableCache(str(tmp_path / "timetable.sqlite3"))
+    srt = target()
+    assert cache.plan(srt) is False  # 아직 시간표 없음
+    cache.observe(srt, rows())
+
+    assert cache.plan(srt)
+    # 09:00 이 들어가는 가장 늦은 짝수 시각은 08시, 그때부터 08:00 ~ 10:00 다섯 행
+    assert srt.dpt_tm == "08" and srt.is_dpt_tm_auto_set
+    assert srt.row_limit() == 5
+    # greedy 예약 개수는 그대로
+    assert srt.num_trains_to_check == 2 and not srt.is_num_auto_set
+
+    # 처음 설정에서 다시 계산한다
+    assert cache.plan(srt)
+    assert (srt.dpt_tm, srt.row_limit(), srt.num_trains_to_check) == ("08", 5, 2)
+    cache.close()
+
+
+def test_plan_keeps_settings_without_conditions(tmp_path):
+    cache = TimetableCache(str(tmp_path / "timetable.sqlite3"))
+    srt = target(windows="")
+    cache.observe(srt, rows())
+    assert cache.plan(srt) is False
+    assert (srt.dpt_tm, srt.row_limit()) == ("06", 2)
+    cache.close()
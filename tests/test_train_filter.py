@@ -0,0 +1,67 @@
+from srt_reservation.srt import SRT
+from srt_reservation.train import Train
+from srt_reservation.train_filter import ACCEPT, SKIP, STOP, TrainFilter, parse_time_windows, parse_train_nums
+
+
+def train(num, dpt_time, arr_time="23:00"):
+    return Train("20261101", "SRT", num, f"수서 {dpt_time}", f"부산 {arr_time}")
+
+
+def test_parse_time_windows():
+    assert parse_time_windows("08:00-10:00, 18:00 - 20:30,") == [(480, 600), (1080, 1230)]
+    assert parse_time_windows("") == []
+
+
+def test_parse_train_nums_strips_leading_zeros():
+    assert parse_train_nums("0301, 303,,") == frozenset({"301", "303"})
+
+
+def test_no_conditions_accepts_everything():
+    f = TrainFilter()
+    assert f.decide(train("301", "23:59")) == ACCEPT
+    assert not f.has_conditions()
+
+
+def test_windows_and_cutoff():
+    f = TrainFilter(windows=parse_time_windows("08:00-09:00,12:00-13:00"))
+    assert f.cutoff_minute == 13 * 60
+    assert f.decide(train("301", "07:59")) == SKIP
+    assert f.decide(train("303", "08:00")) == ACCEPT
+    assert f.decide(train("305", "09:00")) == ACCEPT  # 끝 시각 포함
+    assert f.decide(train("307", "10:00")) == SKIP
+    assert f.decide(train("309", "13:00")) == ACCEPT
+    assert f.decide(train("311", "13:01")) == STOP
+
+
+def test_exact_minutes_and_max_dpt_take_earliest_cutoff():
+    f = TrainFilter(exact_minutes=[480, 600], max_dpt_minute=540)
+    assert f.cutoff_minute == 540
+    assert f.decide(train("301", "08:00")) == ACCEPT
+    assert f.decide(train("303", "08:30")) == SKIP
+    assert f.decide(train("305", "10:00")) == STOP
+
+
+def test_allow_and_deny_numbers():
+    f = TrainFilter(allow_nums=parse_train_nums("301,0303"), deny_nums=parse_train_nums("303"))
+    # 결과 표의 열차번호가 0 으로 시작해도 같은 기차
+    assert f.decide(train("0301", "08:00")) == ACCEPT
+    assert f.decide(train("303", "08:00")) == SKIP
+    assert f.decide(train("305", "08:00")) == SKIP
+    assert f.has_conditions()
+
+
+def test_max_arrival():
+    f = TrainFilter(max_arr_minute=600)
+    assert f.decide(train("301", "08:00", "10:00")) == ACCEPT
+    assert f.decide(train("303", "08:00", "10:01")) == SKIP
+    # 도착 시각만으로는 멈추지 않는다
+    assert f.cutoff_minute is None
+
+
+def test_from_srt():
+    srt = SRT("수서", "부산", "20261101", "08", 2).set_exact_tms("")
+    srt.set_time_windows("08:00-10:00").set_train_nums("", "0305").set_max_tms("", "12:00").compile_filter()
+    assert srt.filter.decide(train("301", "08:00", "11:00")) == ACCEPT
+    assert srt.filter.decide(train("305", "08:30", "11:00")) == SKIP
+    assert srt.filter.decide(train("307", "09:00", "12:30")) == SKIP
+    assert srt.filter.decide(train("309", "10:30", "12:00")) == STOP
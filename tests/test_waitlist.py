@@ -0,0 +1,76 @@
+from srt_reservation.srt import SRT
+from srt_reservation.waitlist import WaitlistManager, parse_reservation_list
+
+RESERVATION_LIST = """<div><table id="rsv-list"><thead><tr><th>승차일자</th><th>열차번호</th></tr></thead><tbody>
+<tr><td>2026-11-01(일)</td><td>SRT</td><td>301</td><td>수서<br>06:00</td><td>부산<br>08:30</td><td>결제대기</td><td><a href="#">결제하기</a></td></tr>
+<tr><td>2026-11-02(월)</td><td>SRT</td><td>301</td><td>수서<br>06:00</td><td>부산<br>08:30</td><td>예약대기</td><td>-</td></tr>
+<tr><td>-</td><td>SRT</td></tr>
+</tbody></table></div>"""
+
+
+def target(dt):
+    srt = SRT("수서", "부산", dt, "06", 2).set_want_reserve(True)
+    srt.init_results()
+    return srt
+
+
+def test_parse_reservation_list():
+    rows = parse_reservation_list(RESERVATION_LIST)
+    # 칸이 모자란 행은 버린다
+    assert [row.idx for row in rows] == [1, 2]
+    first = rows[0]
+    assert first.dpt_dt == "20261101"
+    assert (first.train.train_num, first.train.dpt_stn, first.train.dpt_time, first.train.arr_time) == \
+        ("301", "수서", "06:00", "08:30")
+    assert first.is_confirmed() and not first.is_waiting()
+    assert rows[1].is_waiting() and not rows[1].is_confirmed()
+
+
+def test_match_only_confirms_same_date():
+    # 두 날짜 모두 301 06:00 을 예약대기했고, 11월 1일 것만 결제대기가 됐다
+    rows = parse_reservation_list(RESERVATION_LIST)
+    first, second = target("20261101"), target("20261102")
+    for srt in (first, second):
+        srt.reserved[rows[0].train.hash()] = True
+
+    manager = WaitlistManager(poll_sec=60)
+    manager.start()
+    confirmed = manager.match([first, second], rows)
+    assert [(srt, row.idx) for srt, row, _ in confirmed] == [(first, 1)]
+    assert manager.stats() == {"waitlist_polls": 1, "waitlist_confirmed": 1}
+
+
+def test_one_row_confirms_one_target():
+    rows = parse_reservation_list(RESERVATION_LIST)
+    targets = [target("20261101"), target("20261101")]
+    for srt in targets:
+        srt.reserved[rows[0].train.hash()] = True
+    assert len(WaitlistManager().match(targets, rows)) == 1
+
+
+class BrokenDriver:
+    def execute_async_script(self, script, *args):
+        return {"error": "TypeError: Failed to fetch"}
+
+
+def test_failed_fetch_waits_for_next_poll():
+    from types import SimpleNamespace
+
+    from srt_reservation.SRThunter import SRThunter
+    from srt_reservation.metrics import Metrics
+
+    srt = target("20261101")
+    srt.reserved["301"] = True
+    manager = WaitlistManager(poll_sec=60)
+    manager.checked_at -= 60
+    requests = []
+    hunter = SimpleNamespace(base_url="https://example.invalid", driver=BrokenDriver(), metrics=Metrics(),
+                             waitlist=manager, targets=[srt],
+                             scheduler=SimpleNamespace(on_request=lambda: requests.append(1)))
+    assert manager.due(hunter.targets)
+
+    # 실패는 여기서 로그만 남기고, 실패한 조회도 한 번으로 쳐서 poll_sec 동안은 다시 하지 않는다
+    SRThunter.check_waitlist(hunter)
+    assert requests == [1]
+    assert manager.stats()["waitlist_polls"] == 1
+    assert not manager.due(hunter.targets)